@@ -0,0 +1,143 @@
+"""
+Compares the chunk voxel layouts on the access patterns of the engine:
+terrain generation, meshing (face and AO neighbors) and player collision.
+
+Each layout is described by its per-axis offset tables (see `srcs/voxel_layout.py`),
+which are passed to the kernels as arguments so both layouts run in the same process.
+Besides wall-clock time, the number of distinct 64-byte cache lines touched per
+neighborhood is reported, which does not depend on the machine.
+
+Usage (from the repository root):
+    python -m benchmarks.voxel_layout
+"""
+
+from time import perf_counter
+from numba import njit
+from numpy import ndarray, zeros
+from numpy.random import default_rng
+
+from settings import CHUNK_SIZE, CHUNK_VOLUME
+from srcs.voxel_layout import get_layout_tables
+
+CACHE_LINE_SIZE = 64  # bytes, voxels are uint8
+REPEATS = 5
+
+LAYOUTS = (("linear", 0), ("brick", 4), ("brick", 8))
+
+
+@njit
+def index(tx: ndarray, ty: ndarray, tz: ndarray, x: int, y: int, z: int) -> int:
+    return tx[x] + ty[y] + tz[z]
+
+
+@njit
+def generation(voxels: ndarray, tx: ndarray, ty: ndarray, tz: ndarray) -> int:
+    """Column-major writes, in the loop order of `Chunk.generate_terrain`."""
+    for x in range(CHUNK_SIZE):
+        for z in range(CHUNK_SIZE):
+            height = 8 + (x * 7 + z * 13) % (CHUNK_SIZE - 8)
+            for y in range(height):
+                voxels[index(tx, ty, tz, x, y, z)] = 1 + (y & 7)
+    return 0
+
+
+@njit
+def meshing(voxels: ndarray, tx: ndarray, ty: ndarray, tz: ndarray) -> int:
+    """Reads the 3x3x3 neighborhood of every inner solid voxel, like faces and AO do."""
+    total = 0
+    for x in range(1, CHUNK_SIZE - 1):
+        for y in range(1, CHUNK_SIZE - 1):
+            for z in range(1, CHUNK_SIZE - 1):
+                if not voxels[index(tx, ty, tz, x, y, z)]:
+                    continue
+                for dx in range(-1, 2):
+                    for dy in range(-1, 2):
+                        for dz in range(-1, 2):
+                            total += voxels[index(tx, ty, tz, x + dx, y + dy, z + dz)]
+    return total
+
+
+@njit
+def collision(
+    voxels: ndarray, tx: ndarray, ty: ndarray, tz: ndarray, boxes: ndarray
+) -> int:
+    """Scans the voxels overlapped by player-sized boxes (2 x 3 x 2 voxels)."""
+    hits = 0
+    for n in range(boxes.shape[0]):
+        bx, by, bz = boxes[n, 0], boxes[n, 1], boxes[n, 2]
+        for i in range(bx, bx + 2):
+            for j in range(by, by + 3):
+                for k in range(bz, bz + 2):
+                    if voxels[index(tx, ty, tz, i, j, k)]:
+                        hits += 1
+    return hits
+
+
+@njit
+def neighborhood_cache_lines(
+    tx: ndarray, ty: ndarray, tz: ndarray, size_x: int, size_y: int, size_z: int
+) -> float:
+    """Average number of distinct cache lines touched by a box of voxels."""
+    lines = zeros(size_x * size_y * size_z, dtype="int64")
+    total = 0
+    count = 0
+    for x in range(CHUNK_SIZE - size_x + 1):
+        for y in range(CHUNK_SIZE - size_y + 1):
+            for z in range(CHUNK_SIZE - size_z + 1):
+                n = 0
+                for i in range(size_x):
+                    for j in range(size_y):
+                        for k in range(size_z):
+                            lines[n] = (
+                                index(tx, ty, tz, x + i, y + j, z + k)
+                                // CACHE_LINE_SIZE
+                            )
+                            n += 1
+                lines.sort()
+                distinct = 1
+                for m in range(1, n):
+                    if lines[m] != lines[m - 1]:
+                        distinct += 1
+                total += distinct
+                count += 1
+    return total / count
+
+
+def best_time(function, *args) -> float:
+    """Returns the best of REPEATS runs in milliseconds (the first call compiles)."""
+    function(*args)
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = perf_counter()
+        function(*args)
+        best = min(best, perf_counter() - start)
+    return best * 1000.0
+
+
+def main() -> None:
+    rng = default_rng(16)
+    boxes = rng.integers(0, CHUNK_SIZE - 3, size=(100_000, 3))
+
+    print(
+        f"{'layout':<10} {'generation':>12} {'meshing':>10} {'collision':>10}"
+        f" {'lines/3x3x3':>12} {'lines/player':>13}"
+    )
+    for layout, brick_size in LAYOUTS:
+        tables = get_layout_tables(layout, brick_size)
+        voxels = zeros(CHUNK_VOLUME, dtype="uint8")
+
+        generation_ms = best_time(generation, voxels, *tables)
+        meshing_ms = best_time(meshing, voxels, *tables)
+        collision_ms = best_time(collision, voxels, *tables, boxes)
+
+        name = layout if layout == "linear" else f"brick {brick_size}³"
+        print(
+            f"{name:<10} {generation_ms:>10.2f}ms {meshing_ms:>8.2f}ms"
+            f" {collision_ms:>8.2f}ms"
+            f" {neighborhood_cache_lines(*tables, 3, 3, 3):>12.2f}"
+            f" {neighborhood_cache_lines(*tables, 2, 3, 2):>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
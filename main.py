@@ -1,6 +1,9 @@
-from srcs.engine import Engine
+from logging import INFO, basicConfig
 
+from srcs.engine import Engine
 
 if __name__ == "__main__":
+    # Shows the decisions of the quality governor
+    basicConfig(level=INFO, format="%(asctime)s %(name)s: %(message)s")
     engine = Engine()
     engine.run()
@@ -1,7 +1,20 @@
+from re import fullmatch
 from numpy import array
 from moderngl import VertexArray
 
 
+def get_vertex_size(vbo_format: str) -> int:
+    """
+    Returns the size in bytes of one vertex of a buffer format.
+    e.g. "1u4" -> 4, "2f2 3f2" -> 10 (per-instance "/i" suffixes are ignored)
+    """
+    size = 0
+    for fmt in vbo_format.split("/")[0].split():
+        count, _, width = fullmatch(r"(\d*)([fiux])(\d?)", fmt).groups()
+        size += int(count or 1) * int(width or 4)
+    return size
+
+
 class BaseMesh:
     def __init__(self) -> None:
         self.context = None
@@ -11,6 +24,8 @@ class BaseMesh:
         )
         self.attrs: tuple[str, ...] = None  # e.g. ("in_position", "in_color")
         self.vao = None
+        self.vbo = None
+        self.vertex_count = 0  # The pooled VBO may be larger than the vertex data
 
     # This method is expected to be overridden by subclasses to return the mesh's vertex data
     def get_vertex_data(self) -> array: ...
@@ -19,21 +34,38 @@ class BaseMesh:
         """
         Creates and returns a Vertex Array Object (VAO) for rendering the mesh.
         This binds the vertex buffer to the appropriate shader attributes.
+
+        The mesh owns the VBO and VAO: calling this again releases the previous ones,
+        the VBO going back to the GPU resource pool for reuse.
         """
+        resources = self.game.gpu_resources
+        self.release()
+
         # Get the mesh's vertex data (defined in subclass)
         vertex_data = self.get_vertex_data()
-        # Create a Vertex Buffer Object (VBO) from the vertex data
-        vbo = self.context.buffer(vertex_data)
+        self.vertex_count = vertex_data.nbytes // get_vertex_size(self.vbo_format)
+        # Get a Vertex Buffer Object (VBO) from the pool and upload the vertex data
+        self.vbo = resources.create_buffer(vertex_data)
         # Create and return the VAO, which links the VBO to the shader inputs
-        return self.context.vertex_array(
+        return resources.create_vertex_array(
             self.shader,  # shader program to use
-            [(vbo, self.vbo_format, *self.attrs)],  # VBO format and attribute mapping
+            [(self.vbo, self.vbo_format, *self.attrs)],  # VBO format and attribute mapping
             skip_errors=True,  # skip errors if attributes don't match exactly
         )
 
+    def release(self) -> None:
+        """Releases the mesh's VAO and gives its VBO back to the pool."""
+        resources = self.game.gpu_resources
+        if self.vao is not None:
+            resources.release_vertex_array(self.vao)
+            self.vao = None
+        if self.vbo is not None:
+            resources.release_buffer(self.vbo)
+            self.vbo = None
+
     def render(self) -> None:
         """
         Renders the mesh by issuing a draw call using its VAO.
         IMPORTANT: Assumes `self.vao` has already been created and set up.
         """
-        self.vao.render()
+        self.vao.render(vertices=self.vertex_count)
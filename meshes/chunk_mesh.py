@@ -1,33 +1,121 @@
 from typing import TYPE_CHECKING
+from numpy import ndarray
 
 from meshes.base_mesh import BaseMesh
 from meshes.chunk_mesh_builder import build_chunk_mesh
+from meshes.lod_mesh_builder import build_lod_mesh, downsample_voxels, update_cell
+from meshes.mesher_stats import create_stats
+from settings import CHUNK_SIZE
+from srcs.level_of_detail import LOD_LEVELS, get_lod_factor
 
 if TYPE_CHECKING:
     from objects.chunk import Chunk
 
 
 class ChunkMesh(BaseMesh):
+    """
+    The meshes of a chunk, one per level of detail. Their vertices live in the
+    world's shared chunk mesh arena instead of a vertex buffer and vertex array of
+    their own.
+
+    Each level is built the first time the chunk is drawn at it. The downsampled
+    grids of the levels are kept, so that an edit only updates the cells holding
+    the edited voxel; the meshes of the levels whose grid changed are built again
+    the next time they are drawn.
+    """
+
     def __init__(self, chunk: "Chunk") -> None:
         super().__init__()
         self.game = chunk.game
         self.chunk = chunk
         self.context = self.game.context
         self.shader = self.game.shader.chunk
+        self.arena = chunk.world.mesh_arena
 
-        self.vbo_format = "1u4"
+        self.vbo_format = self.arena.vbo_format
         self.format_size = sum(int(fmt[:1]) for fmt in self.vbo_format.split())
-        self.attrs = ("packed_data",)
-        self.vao = self.get_vao()
+        self.attrs = self.arena.attrs
+        self.stats = create_stats()  # Mesher statistics of the last build
+
+        # Range of the arena holding the vertices of each level
+        self.allocations = [None] * LOD_LEVELS
+        self.is_built = [False] * LOD_LEVELS  # Up to date with the voxels
+        self.grids: list[ndarray] = [None] * LOD_LEVELS  # Downsampled voxels
+        # The face connectivity of the chunk is older than its voxels
+        self.is_connectivity_stale = True
+
+    def build(self, level: int) -> None:
+        """Builds the vertex data of a level and writes it into the arena."""
+        # The face connectivity used by cave culling is refreshed with the first
+        # mesh built since the voxels changed, not once per level
+        if self.is_connectivity_stale:
+            self.chunk.update_connectivity()
+            self.is_connectivity_stale = False
+        if level == 0:
+            vertex_data = self.get_vertex_data()
+        else:
+            vertex_data = self.get_lod_vertex_data(level)
+        self.allocations[level] = self.arena.upload(
+            self.allocations[level], vertex_data
+        )
+        self.is_built[level] = True
 
     def rebuild(self) -> None:
-        self.vao = self.get_vao()
+        """Builds the full resolution mesh again, if it was built before."""
+        if self.is_built[0]:
+            self.build(0)
+
+    def update_voxel(self, position: tuple) -> None:
+        """
+        Updates the downsampled grids after a voxel of the chunk changed.
+        The meshes of the levels don't depend on the neighbor chunks.
+        """
+        self.is_connectivity_stale = True
+        for level in range(1, LOD_LEVELS):
+            grid = self.grids[level]
+            if grid is not None and update_cell(
+                self.chunk.voxels, grid, get_lod_factor(level), position
+            ):
+                self.is_built[level] = False
+
+    def get_built_level(self, level: int) -> int:
+        """
+        Returns the built level nearest to a level, the finer one first,
+        or -1 if no level was built yet.
+        """
+        for offset in range(LOD_LEVELS):
+            for candidate in (level - offset, level + offset):
+                if 0 <= candidate < LOD_LEVELS and self.is_built[candidate]:
+                    return candidate
+        return -1
+
+    def release(self) -> None:
+        """Gives the ranges of the arena back."""
+        for level, allocation in enumerate(self.allocations):
+            self.arena.free(allocation)
+            self.allocations[level] = None
+            self.is_built[level] = False
+
+    def render(self, level: int) -> None:
+        # Vertex positions of the levels are in cells of the downsampled grid
+        self.game.shader.chunk_variants["lod_scale"] = float(get_lod_factor(level))
+        self.arena.render(self.allocations[level])
 
     def get_vertex_data(self):
+        self.stats = create_stats()
         mesh = build_chunk_mesh(
             self.chunk.voxels,
             self.format_size,
             self.chunk.position,
             self.chunk.world.voxels,
+            self.chunk.bounds,
+            self.stats,
         )
+        self.chunk.world.mesher_stats.add(self.stats)
         return mesh
+
+    def get_lod_vertex_data(self, level: int) -> ndarray:
+        factor = get_lod_factor(level)
+        if self.grids[level] is None:
+            self.grids[level] = downsample_voxels(self.chunk.voxels, factor)
+        return build_lod_mesh(self.grids[level], CHUNK_SIZE // factor)
@@ -0,0 +1,258 @@
+from typing import TYPE_CHECKING
+from moderngl import Buffer, Program, VertexArray
+from numpy import ndarray
+
+from meshes.base_mesh import get_vertex_size
+from settings import CHUNK_ARENA_PAGE_SIZE
+
+if TYPE_CHECKING:
+    from srcs.gpu_resources import GPUResources
+
+
+class ArenaAllocation:
+    """
+    A range of vertices inside one page of the arena.
+    Owned by a single mesh, and only valid until it is freed.
+    """
+
+    def __init__(self, page: "ArenaPage", first: int, vertices: int) -> None:
+        self.page = page
+        self.first = first  # Index of the first vertex in the page
+        self.vertices = vertices  # Number of vertices
+
+
+class ArenaPage:
+    """
+    One large vertex buffer with its vertex array, split into allocations.
+
+    Free space is kept as a sorted list of [first, vertices] blocks,
+    adjacent blocks are merged when an allocation is freed.
+    """
+
+    def __init__(self, arena: "ChunkMeshArena", capacity: int) -> None:
+        self.arena = arena
+        self.capacity = capacity  # In vertices
+        self.buffer: Buffer = arena.resources.acquire_buffer(
+            capacity * arena.vertex_size
+        )
+        self.vao: VertexArray = arena.create_vao(self.buffer)
+
+        self.free_blocks: list[list[int]] = [[0, capacity]]
+        self.allocations: set[ArenaAllocation] = set()
+        self.used = 0  # Vertices held by allocations
+
+    def allocate(self, vertices: int) -> ArenaAllocation:
+        """
+        Takes the first free block large enough (first fit).
+
+        Returns:
+            ArenaAllocation: The new allocation, or None if no block is large enough
+        """
+        for i, (first, size) in enumerate(self.free_blocks):
+            if size < vertices:
+                continue
+
+            if size == vertices:
+                del self.free_blocks[i]
+            else:
+                self.free_blocks[i] = [first + vertices, size - vertices]
+
+            allocation = ArenaAllocation(self, first, vertices)
+            self.allocations.add(allocation)
+            self.used += vertices
+            return allocation
+        return None
+
+    def free(self, allocation: ArenaAllocation) -> None:
+        """Gives the allocation's range back to the free list, merging neighbors."""
+        self.allocations.remove(allocation)
+        self.used -= allocation.vertices
+
+        first, end = allocation.first, allocation.first + allocation.vertices
+
+        # Find where the block goes to keep the list sorted
+        i = 0
+        while i < len(self.free_blocks) and self.free_blocks[i][0] < first:
+            i += 1
+
+        # Merge with the previous block if they touch
+        if i > 0 and sum(self.free_blocks[i - 1]) == first:
+            i -= 1
+            first = self.free_blocks[i][0]
+            del self.free_blocks[i]
+
+        # Merge with the next block if they touch
+        if i < len(self.free_blocks) and self.free_blocks[i][0] == end:
+            end += self.free_blocks[i][1]
+            del self.free_blocks[i]
+
+        self.free_blocks.insert(i, [first, end - first])
+
+    def shrink(self, allocation: ArenaAllocation, vertices: int) -> None:
+        """Keeps the first `vertices` vertices of an allocation and frees the rest."""
+        tail = ArenaAllocation(
+            self, allocation.first + vertices, allocation.vertices - vertices
+        )
+        allocation.vertices = vertices
+        self.allocations.add(tail)
+        self.free(tail)
+
+    def compact(self) -> None:
+        """
+        Moves every allocation to the start of a new buffer, on the GPU,
+        leaving a single free block at the end of the page.
+        """
+        context = self.arena.context
+        vertex_size = self.arena.vertex_size
+        buffer = self.arena.resources.acquire_buffer(self.capacity * vertex_size)
+
+        first = 0
+        for allocation in sorted(self.allocations, key=lambda a: a.first):
+            context.copy_buffer(
+                buffer,
+                self.buffer,
+                size=allocation.vertices * vertex_size,
+                read_offset=allocation.first * vertex_size,
+                write_offset=first * vertex_size,
+            )
+            allocation.first = first
+            first += allocation.vertices
+
+        self.release()
+        self.buffer = buffer
+        self.vao = self.arena.create_vao(self.buffer)
+        self.free_blocks = (
+            [[first, self.capacity - first]] if first < self.capacity else []
+        )
+
+    def release(self) -> None:
+        """Releases the GPU objects of the page."""
+        self.arena.resources.release_vertex_array(self.vao)
+        self.arena.resources.release_buffer(self.buffer)
+
+
+class ChunkMeshArena:
+    """
+    Stores the vertices of every chunk mesh in a few large vertex buffers (pages),
+    all drawn through the page's single vertex array with `first`/`vertices` offsets.
+
+    Uploading a chunk mesh becomes a write into memory allocated once, instead of
+    a new buffer and vertex array per mesh (and per rebuild).
+    """
+
+    def __init__(
+        self,
+        resources: "GPUResources",
+        shader: Program,
+        vbo_format: str = "1u4",
+        attrs: tuple[str, ...] = ("packed_data",),
+        page_size: int = CHUNK_ARENA_PAGE_SIZE,
+    ) -> None:
+        self.resources = resources
+        self.context = resources.context
+        self.shader = shader
+        self.vbo_format = vbo_format
+        self.attrs = attrs
+
+        self.vertex_size = get_vertex_size(vbo_format)
+        self.page_capacity = page_size // self.vertex_size  # In vertices
+        self.pages: list[ArenaPage] = []
+
+    def create_vao(self, buffer: Buffer) -> VertexArray:
+        return self.resources.create_vertex_array(
+            self.shader,
+            [(buffer, self.vbo_format, *self.attrs)],
+            skip_errors=True,
+        )
+
+    def set_shader(self, shader: Program) -> None:
+        """Draws the pages with another program, reading the same vertex format."""
+        self.shader = shader
+        for page in self.pages:
+            self.resources.release_vertex_array(page.vao)
+            page.vao = self.create_vao(page.buffer)
+
+    def allocate(self, vertices: int) -> ArenaAllocation:
+        """
+        Reserves room for `vertices` vertices.
+
+        The first page with a large enough free block is used. When the pages are
+        too fragmented, a page with enough free space in total is compacted first.
+        A new page is only created when no page has enough free space.
+
+        Args:
+            vertices (int): Number of vertices to reserve
+
+        Returns:
+            ArenaAllocation: The allocation, or None for an empty mesh
+        """
+        if vertices <= 0:
+            return None
+
+        for page in self.pages:
+            allocation = page.allocate(vertices)
+            if allocation is not None:
+                return allocation
+
+        for page in self.pages:
+            if page.capacity - page.used >= vertices:
+                page.compact()
+                return page.allocate(vertices)
+
+        page = ArenaPage(self, max(self.page_capacity, vertices))
+        self.pages.append(page)
+        return page.allocate(vertices)
+
+    def free(self, allocation: ArenaAllocation) -> None:
+        if allocation is not None:
+            allocation.page.free(allocation)
+
+    def write(self, allocation: ArenaAllocation, vertex_data: ndarray) -> None:
+        """Uploads the vertex data into the allocation's range of its page."""
+        if allocation is not None:
+            allocation.page.buffer.write(
+                vertex_data, offset=allocation.first * self.vertex_size
+            )
+
+    def upload(
+        self, allocation: ArenaAllocation, vertex_data: ndarray
+    ) -> ArenaAllocation:
+        """
+        Replaces the content of an allocation with new vertex data,
+        moving it if the new data does not fit in place.
+
+        Args:
+            allocation (ArenaAllocation): Current allocation (or None)
+            vertex_data (ndarray): The new vertex data
+
+        Returns:
+            ArenaAllocation: The allocation now holding the vertex data
+        """
+        vertices = len(vertex_data) * vertex_data.itemsize // self.vertex_size
+
+        if allocation is not None and 0 < vertices <= allocation.vertices:
+            # The new data fits in place, give back the unused tail
+            if vertices < allocation.vertices:
+                allocation.page.shrink(allocation, vertices)
+        else:
+            self.free(allocation)
+            allocation = self.allocate(vertices)
+
+        self.write(allocation, vertex_data)
+        return allocation
+
+    def render(self, allocation: ArenaAllocation) -> None:
+        """Draws the vertices of an allocation."""
+        if allocation is not None:
+            allocation.page.vao.render(
+                first=allocation.first, vertices=allocation.vertices
+            )
+
+    def get_usage(self) -> tuple[int, int]:
+        """
+        Returns:
+            tuple: Bytes held by allocations and bytes reserved by all pages
+        """
+        used = sum(page.used for page in self.pages) * self.vertex_size
+        reserved = sum(page.capacity for page in self.pages) * self.vertex_size
+        return used, reserved
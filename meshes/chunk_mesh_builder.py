@@ -2,20 +2,33 @@ from numba import njit, uint8
 from glm import vec3
 from numpy import empty, ndarray
 
+from meshes.mesher_stats import (
+    AO_FLIPS,
+    BYTES_OUTPUT,
+    FACES,
+    NEIGHBOR_LOOKUPS,
+    SOLID_VOXELS,
+    VOXELS_VISITED,
+)
 from settings import (
-    CHUNK_AREA,
     CHUNK_SIZE,
     CHUNK_VOLUME,
+    MESHER_STATS,
     WORLD_AREA,
     WORLD_DEPTH,
     WORLD_HEIGHT,
     WORLD_WIDTH,
 )
+from srcs.voxel_layout import get_index
 
 
 @njit
 def get_ao(
-    local_position: vec3, world_position: vec3, world_voxels: ndarray, plane: str
+    local_position: vec3,
+    world_position: vec3,
+    world_voxels: ndarray,
+    plane: str,
+    stats: ndarray,
 ) -> tuple:
     """
     Calculates the ambient occlusion (AO) values for a voxel based on its local and world positions.
@@ -30,6 +43,7 @@ def get_ao(
         world_position (vec3): 3D position of the voxel in the world
         world_voxels (ndarray): 3D array of voxel data for the entire world
         plane (str): The plane of the face ("X", "Y", or "Z")
+        stats (ndarray): Mesher statistics of the chunk being built
 
     Returns:
         tuple: Four values representing the ambient occlusion for each corner of the face.
@@ -40,46 +54,60 @@ def get_ao(
     # Determine which set of adjacent voxels to check based on the face's orientation (plane)
     if plane == "Y":
         # AO on horizontal (top/bottom) face — we scan around the XZ plane
-        a = is_void((x, y, z - 1), (wx, wy, wz - 1), world_voxels)  # Behind
-        b = is_void((x - 1, y, z - 1), (wx - 1, wy, wz - 1), world_voxels)  # Back-left
-        c = is_void((x - 1, y, z), (wx - 1, wy, wz), world_voxels)  # Left
-        d = is_void((x - 1, y, z + 1), (wx - 1, wy, wz + 1), world_voxels)  # Front-left
-        e = is_void((x, y, z + 1), (wx, wy, wz + 1), world_voxels)  # Front
+        a = is_void((x, y, z - 1), (wx, wy, wz - 1), world_voxels, stats)  # Behind
+        b = is_void(
+            (x - 1, y, z - 1), (wx - 1, wy, wz - 1), world_voxels, stats
+        )  # Back-left
+        c = is_void((x - 1, y, z), (wx - 1, wy, wz), world_voxels, stats)  # Left
+        d = is_void(
+            (x - 1, y, z + 1), (wx - 1, wy, wz + 1), world_voxels, stats
+        )  # Front-left
+        e = is_void((x, y, z + 1), (wx, wy, wz + 1), world_voxels, stats)  # Front
         f = is_void(
-            (x + 1, y, z + 1), (wx + 1, wy, wz + 1), world_voxels
+            (x + 1, y, z + 1), (wx + 1, wy, wz + 1), world_voxels, stats
         )  # Front-right
-        g = is_void((x + 1, y, z), (wx + 1, wy, wz), world_voxels)  # Right
-        h = is_void((x + 1, y, z - 1), (wx + 1, wy, wz - 1), world_voxels)  # Back-right
+        g = is_void((x + 1, y, z), (wx + 1, wy, wz), world_voxels, stats)  # Right
+        h = is_void(
+            (x + 1, y, z - 1), (wx + 1, wy, wz - 1), world_voxels, stats
+        )  # Back-right
 
     elif plane == "X":
         # AO on vertical X face — we scan around the YZ plane
-        a = is_void((x, y, z - 1), (wx, wy, wz - 1), world_voxels)  # Behind
+        a = is_void((x, y, z - 1), (wx, wy, wz - 1), world_voxels, stats)  # Behind
         b = is_void(
-            (x, y - 1, z - 1), (wx, wy - 1, wz - 1), world_voxels
+            (x, y - 1, z - 1), (wx, wy - 1, wz - 1), world_voxels, stats
         )  # Bottom-back
-        c = is_void((x, y - 1, z), (wx, wy - 1, wz), world_voxels)  # Bottom
+        c = is_void((x, y - 1, z), (wx, wy - 1, wz), world_voxels, stats)  # Bottom
         d = is_void(
-            (x, y - 1, z + 1), (wx, wy - 1, wz + 1), world_voxels
+            (x, y - 1, z + 1), (wx, wy - 1, wz + 1), world_voxels, stats
         )  # Bottom-front
-        e = is_void((x, y, z + 1), (wx, wy, wz + 1), world_voxels)  # Front
-        f = is_void((x, y + 1, z + 1), (wx, wy + 1, wz + 1), world_voxels)  # Top-front
-        g = is_void((x, y + 1, z), (wx, wy + 1, wz), world_voxels)  # Top
-        h = is_void((x, y + 1, z - 1), (wx, wy + 1, wz - 1), world_voxels)  # Top-back
+        e = is_void((x, y, z + 1), (wx, wy, wz + 1), world_voxels, stats)  # Front
+        f = is_void(
+            (x, y + 1, z + 1), (wx, wy + 1, wz + 1), world_voxels, stats
+        )  # Top-front
+        g = is_void((x, y + 1, z), (wx, wy + 1, wz), world_voxels, stats)  # Top
+        h = is_void(
+            (x, y + 1, z - 1), (wx, wy + 1, wz - 1), world_voxels, stats
+        )  # Top-back
 
     elif plane == "Z":
         # AO on vertical Z face — we scan around the XY plane
-        a = is_void((x - 1, y, z), (wx - 1, wy, wz), world_voxels)  # Left
+        a = is_void((x - 1, y, z), (wx - 1, wy, wz), world_voxels, stats)  # Left
         b = is_void(
-            (x - 1, y - 1, z), (wx - 1, wy - 1, wz), world_voxels
+            (x - 1, y - 1, z), (wx - 1, wy - 1, wz), world_voxels, stats
         )  # Bottom-left
-        c = is_void((x, y - 1, z), (wx, wy - 1, wz), world_voxels)  # Bottom
+        c = is_void((x, y - 1, z), (wx, wy - 1, wz), world_voxels, stats)  # Bottom
         d = is_void(
-            (x + 1, y - 1, z), (wx + 1, wy - 1, wz), world_voxels
+            (x + 1, y - 1, z), (wx + 1, wy - 1, wz), world_voxels, stats
         )  # Bottom-right
-        e = is_void((x + 1, y, z), (wx + 1, wy, wz), world_voxels)  # Right
-        f = is_void((x + 1, y + 1, z), (wx + 1, wy + 1, wz), world_voxels)  # Top-right
-        g = is_void((x, y + 1, z), (wx, wy + 1, wz), world_voxels)  # Top
-        h = is_void((x - 1, y + 1, z), (wx - 1, wy + 1, wz), world_voxels)  # Top-left
+        e = is_void((x + 1, y, z), (wx + 1, wy, wz), world_voxels, stats)  # Right
+        f = is_void(
+            (x + 1, y + 1, z), (wx + 1, wy + 1, wz), world_voxels, stats
+        )  # Top-right
+        g = is_void((x, y + 1, z), (wx, wy + 1, wz), world_voxels, stats)  # Top
+        h = is_void(
+            (x - 1, y + 1, z), (wx - 1, wy + 1, wz), world_voxels, stats
+        )  # Top-left
 
     # FINALLY we have how much ambient occlusion should be applied
     return (a + b + c), (g + h + a), (e + f + g), (c + d + e)
@@ -163,7 +191,10 @@ def get_chunk_index(world_voxel_position: vec3) -> int:
 
 @njit
 def is_void(
-    local_voxel_position: vec3, world_voxel_position: vec3, world_voxels: ndarray
+    local_voxel_position: vec3,
+    world_voxel_position: vec3,
+    world_voxels: ndarray,
+    stats: ndarray,
 ) -> bool:
     """
     Checks if the voxel at the given world position is empty (or "air")
@@ -172,21 +203,24 @@ def is_void(
         local_voxel_position (vec3): 3D position of the voxel in the chunk
         world_voxel_position (vec3): 3D position of the voxel in the world
         world_voxels (ndarray): 3D array of voxel data for the entire world
+        stats (ndarray): Mesher statistics of the chunk being built
 
     Returns:
         bool: True if the voxel is empty, False otherwise
     """
+    x, y, z = local_voxel_position
+    if MESHER_STATS:
+        if not (0 <= x < CHUNK_SIZE and 0 <= y < CHUNK_SIZE and 0 <= z < CHUNK_SIZE):
+            stats[NEIGHBOR_LOOKUPS] += 1  # The neighbor lives in another chunk
+
     chunk_index = get_chunk_index(world_voxel_position)
     if chunk_index == -1:
         return False  # Out of bounds
 
     chunk_voxels = world_voxels[chunk_index]
-    x, y, z = local_voxel_position
 
     # Check if the voxel is out of bounds
-    return not chunk_voxels[
-        x % CHUNK_SIZE + z % CHUNK_SIZE * CHUNK_SIZE + y % CHUNK_SIZE * CHUNK_AREA
-    ]
+    return not chunk_voxels[get_index(x % CHUNK_SIZE, y % CHUNK_SIZE, z % CHUNK_SIZE)]
 
 
 @njit
@@ -207,12 +241,30 @@ def add_data(vertex_data: ndarray, index: int, *vertices: tuple) -> int:
     return index
 
 
+@njit
+def count_face(stats: ndarray, face_id: int, flip_id: bool) -> None:
+    """
+    Accounts for an emitted face in the mesher statistics (only with MESHER_STATS).
+
+    Args:
+        stats (ndarray): Mesher statistics of the chunk being built
+        face_id (int): Face index (0-5)
+        flip_id (bool): Whether the face was flipped because of its AO
+    """
+    if MESHER_STATS:
+        stats[FACES + face_id] += 1
+        if flip_id:
+            stats[AO_FLIPS] += 1
+
+
 @njit
 def build_chunk_mesh(
     chunk_voxels: ndarray,
     format_size: int,
     chunk_position: tuple,
     world_voxels: ndarray,
+    bounds: tuple,
+    stats: ndarray,
 ) -> ndarray:
     """
     Builds vertex data for a chunk mesh.
@@ -225,6 +277,9 @@ def build_chunk_mesh(
         format_size (int): size of the vertex format
         chunk_position (tuple): position of the chunk in the world
         world_voxels (ndarray): 3D array of voxel data for the entire world
+        bounds (tuple): min (x, y, z) and max (x, y, z) positions of the chunk's
+            solid voxels, only this box is scanned
+        stats (ndarray): Mesher statistics, filled when MESHER_STATS is enabled
 
     Returns:
         ndarray: vertex data for the chunk mesh
@@ -236,13 +291,22 @@ def build_chunk_mesh(
     vertex_data = empty(CHUNK_VOLUME * 18 * format_size, dtype="uint32")
     index = 0
 
-    for x in range(CHUNK_SIZE):
-        for y in range(CHUNK_SIZE):
-            for z in range(CHUNK_SIZE):
-                voxel_id = chunk_voxels[x + CHUNK_SIZE * z + CHUNK_AREA * y]
+    # Voxels outside the bounds are all air, they cannot have faces
+    (min_x, min_y, min_z), (max_x, max_y, max_z) = bounds
+
+    for x in range(min_x, max_x + 1):
+        for y in range(min_y, max_y + 1):
+            for z in range(min_z, max_z + 1):
+                if MESHER_STATS:
+                    stats[VOXELS_VISITED] += 1
+
+                voxel_id = chunk_voxels[get_index(x, y, z)]
                 if not voxel_id:
                     continue  # Skip empty voxels
 
+                if MESHER_STATS:
+                    stats[SOLID_VOXELS] += 1
+
                 # Calculate the world position of the voxel
                 cx, cy, cz = chunk_position
                 wx = x + cx * CHUNK_SIZE
@@ -256,9 +320,12 @@ def build_chunk_mesh(
                 # we flip the face if the AO is higher on the opposite side
 
                 # Top face (+y)
-                if is_void((x, y + 1, z), (wx, wy + 1, wz), world_voxels):
-                    ao = get_ao((x, y + 1, z), (wx, wy + 1, wz), world_voxels, "Y")
+                if is_void((x, y + 1, z), (wx, wy + 1, wz), world_voxels, stats):
+                    ao = get_ao(
+                        (x, y + 1, z), (wx, wy + 1, wz), world_voxels, "Y", stats
+                    )
                     flip_id = ao[1] + ao[3] > ao[0] + ao[2]
+                    count_face(stats, 0, flip_id)
 
                     v0 = pack_data(x, y + 1, z, voxel_id, 0, ao[0], flip_id)
                     v1 = pack_data(x + 1, y + 1, z, voxel_id, 0, ao[1], flip_id)
@@ -271,9 +338,12 @@ def build_chunk_mesh(
                         index = add_data(vertex_data, index, v0, v3, v2, v0, v2, v1)
 
                 # Bottom face (-y)
-                if is_void((x, y - 1, z), (wx, wy - 1, wz), world_voxels):
-                    ao = get_ao((x, y - 1, z), (wx, wy - 1, wz), world_voxels, "Y")
+                if is_void((x, y - 1, z), (wx, wy - 1, wz), world_voxels, stats):
+                    ao = get_ao(
+                        (x, y - 1, z), (wx, wy - 1, wz), world_voxels, "Y", stats
+                    )
                     flip_id = ao[1] + ao[3] > ao[0] + ao[2]
+                    count_face(stats, 1, flip_id)
 
                     v0 = pack_data(x, y, z, voxel_id, 1, ao[0], flip_id)
                     v1 = pack_data(x + 1, y, z, voxel_id, 1, ao[1], flip_id)
@@ -286,9 +356,12 @@ def build_chunk_mesh(
                         index = add_data(vertex_data, index, v0, v2, v3, v0, v1, v2)
 
                 # Right face (+x)
-                if is_void((x + 1, y, z), (wx + 1, wy, wz), world_voxels):
-                    ao = get_ao((x + 1, y, z), (wx + 1, wy, wz), world_voxels, "X")
+                if is_void((x + 1, y, z), (wx + 1, wy, wz), world_voxels, stats):
+                    ao = get_ao(
+                        (x + 1, y, z), (wx + 1, wy, wz), world_voxels, "X", stats
+                    )
                     flip_id = ao[1] + ao[3] > ao[0] + ao[2]
+                    count_face(stats, 2, flip_id)
 
                     v0 = pack_data(x + 1, y, z, voxel_id, 2, ao[0], flip_id)
                     v1 = pack_data(x + 1, y + 1, z, voxel_id, 2, ao[1], flip_id)
@@ -301,9 +374,12 @@ def build_chunk_mesh(
                         index = add_data(vertex_data, index, v0, v1, v2, v0, v2, v3)
 
                 # Left face (-x)
-                if is_void((x - 1, y, z), (wx - 1, wy, wz), world_voxels):
-                    ao = get_ao((x - 1, y, z), (wx - 1, wy, wz), world_voxels, "X")
+                if is_void((x - 1, y, z), (wx - 1, wy, wz), world_voxels, stats):
+                    ao = get_ao(
+                        (x - 1, y, z), (wx - 1, wy, wz), world_voxels, "X", stats
+                    )
                     flip_id = ao[1] + ao[3] > ao[0] + ao[2]
+                    count_face(stats, 3, flip_id)
 
                     v0 = pack_data(x, y, z, voxel_id, 3, ao[0], flip_id)
                     v1 = pack_data(x, y + 1, z, voxel_id, 3, ao[1], flip_id)
@@ -316,9 +392,12 @@ def build_chunk_mesh(
                         index = add_data(vertex_data, index, v0, v2, v1, v0, v3, v2)
 
                 # Back face (-z)
-                if is_void((x, y, z - 1), (wx, wy, wz - 1), world_voxels):
-                    ao = get_ao((x, y, z - 1), (wx, wy, wz - 1), world_voxels, "Z")
+                if is_void((x, y, z - 1), (wx, wy, wz - 1), world_voxels, stats):
+                    ao = get_ao(
+                        (x, y, z - 1), (wx, wy, wz - 1), world_voxels, "Z", stats
+                    )
                     flip_id = ao[1] + ao[3] > ao[0] + ao[2]
+                    count_face(stats, 4, flip_id)
 
                     v0 = pack_data(x, y, z, voxel_id, 4, ao[0], flip_id)
                     v1 = pack_data(x, y + 1, z, voxel_id, 4, ao[1], flip_id)
@@ -331,9 +410,12 @@ def build_chunk_mesh(
                         index = add_data(vertex_data, index, v0, v1, v2, v0, v2, v3)
 
                 # Front face (+z)
-                if is_void((x, y, z + 1), (wx, wy, wz + 1), world_voxels):
-                    ao = get_ao((x, y, z + 1), (wx, wy, wz + 1), world_voxels, "Z")
+                if is_void((x, y, z + 1), (wx, wy, wz + 1), world_voxels, stats):
+                    ao = get_ao(
+                        (x, y, z + 1), (wx, wy, wz + 1), world_voxels, "Z", stats
+                    )
                     flip_id = ao[1] + ao[3] > ao[0] + ao[2]
+                    count_face(stats, 5, flip_id)
 
                     v0 = pack_data(x, y, z + 1, voxel_id, 5, ao[0], flip_id)
                     v1 = pack_data(x, y + 1, z + 1, voxel_id, 5, ao[1], flip_id)
@@ -345,5 +427,8 @@ def build_chunk_mesh(
                     else:
                         index = add_data(vertex_data, index, v0, v2, v1, v0, v3, v2)
 
+    if MESHER_STATS:
+        stats[BYTES_OUTPUT] += index * vertex_data.itemsize
+
     # Return only the portion of the vertex data array that was filled
     return vertex_data[: index + 1]
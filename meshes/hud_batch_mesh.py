@@ -0,0 +1,103 @@
+from typing import TYPE_CHECKING
+from glm import vec4
+from numpy import array, empty, ndarray
+
+from meshes.base_mesh import BaseMesh
+
+if TYPE_CHECKING:
+    from srcs.engine import Engine
+    from srcs.glyph_atlas import TextLayout
+
+
+# Corners of the two triangles of a quad, as fractions of its size
+QUAD_CORNERS = array(((0, 0), (1, 0), (1, 1), (0, 0), (1, 1), (0, 1)), dtype="f4")
+
+WHITE = (1.0, 1.0, 1.0, 1.0)
+FULL_UV = (0.0, 0.0, 1.0, 1.0)
+
+
+class HUDBatchMesh(BaseMesh):
+    """
+    All the 2D quads of the HUD in one vertex buffer, drawn with a single call.
+
+    The quads are collected again every frame, in drawing order, but the vertex data
+    is only rebuilt and uploaded when they differ from the ones of the last upload
+    (e.g. another slot was selected, or the text changed).
+    """
+
+    def __init__(self, game: "Engine") -> None:
+        super().__init__()
+
+        self.game = game
+        self.context = self.game.context
+        self.shader = self.game.shader.hud
+
+        self.vbo_format = "2f 2f 4f 1f"
+        self.attrs = ("in_position", "in_texture_coords", "in_color", "in_use_texture")
+
+        self.quads: list[tuple] = []  # Quads collected this frame
+        self.uploaded_quads: list[tuple] = None  # Quads in the vertex buffer
+
+    def add_quad(
+        self,
+        x: float,
+        y: float,
+        w: float,
+        h: float,
+        color: vec4 = None,
+        use_text: bool = False,
+        uv: tuple = FULL_UV,
+    ) -> None:
+        """
+        Adds a quad to the batch. Quads are drawn in the order they were added.
+
+        Args:
+            x (float): X position in screen space
+            y (float): Y position in screen space
+            w (float): Width of the quad
+            h (float): Height of the quad
+            color (vec4, optional): Color of the quad. Defaults to white if None.
+            use_text (bool, optional): If True, samples the text texture instead.
+            uv (tuple, optional): (u0, v0, u1, v1) of the texture over the quad.
+        """
+        color = tuple(color) if color is not None else WHITE
+        self.quads.append((x, y, w, h, *uv, *color, float(use_text)))
+
+    def add_text(self, layout: "TextLayout", x: float, y: float) -> None:
+        """Adds the glyph quads of a text, its box's bottom-left corner at (x, y)."""
+        for gx, gy, w, h, uv in layout.quads:
+            self.quads.append((x + gx, y + gy, w, h, *uv, *WHITE, 1.0))
+
+    def get_vertex_data(self) -> ndarray:
+        # (x, y, w, h, u0, v0, u1, v1, r, g, b, a, use_texture) of each quad
+        quads = array(self.quads, dtype="f4")[:, None, :]
+        u, v = QUAD_CORNERS[:, 0], QUAD_CORNERS[:, 1]
+
+        vertices = empty((len(self.quads), len(QUAD_CORNERS), 9), dtype="f4")
+        vertices[..., 0] = quads[..., 0] + u * quads[..., 2]
+        vertices[..., 1] = quads[..., 1] + v * quads[..., 3]
+        vertices[..., 2] = quads[..., 4] + u * (quads[..., 6] - quads[..., 4])
+        vertices[..., 3] = quads[..., 5] + v * (quads[..., 7] - quads[..., 5])
+        vertices[..., 4:] = quads[..., 8:]
+        return vertices.reshape(-1, 9)
+
+    def upload(self) -> None:
+        """Writes the quads into the vertex buffer, replacing it only if too small."""
+        vertex_data = self.get_vertex_data()
+        if self.vbo is None or vertex_data.nbytes > self.vbo.size:
+            # Releases the previous vertex array, the buffer goes back to the pool
+            self.vao = self.get_vao()
+            return
+        self.vbo.write(vertex_data)
+        self.vertex_count = len(vertex_data)
+
+    def render(self) -> None:
+        """Draws the quads collected since the last call, then clears them."""
+        if self.quads != self.uploaded_quads:
+            if self.quads:
+                self.upload()
+            self.uploaded_quads = self.quads
+
+        if self.quads:
+            super().render()
+        self.quads = []
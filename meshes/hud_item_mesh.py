@@ -1,7 +1,9 @@
 from typing import TYPE_CHECKING
-from numpy import array, hstack, ndarray, zeros
+from glm import mat4, rotate, scale, translate, vec3
+from moderngl import VertexArray
+from numpy import frombuffer, ndarray, zeros
 
-from meshes.base_mesh import BaseMesh
+from meshes.base_mesh import BaseMesh, get_vertex_size
 from meshes.chunk_mesh_builder import pack_data
 
 if TYPE_CHECKING:
@@ -9,17 +11,102 @@ if TYPE_CHECKING:
 
 
 class HUDItemMesh(BaseMesh):
-    def __init__(self, game: "Engine") -> None:
+    """
+    The cubes of the inventory items, all drawn with one instanced call.
+
+    The cube's vertices are packed once, without a block id. Each instance (an
+    inventory slot) supplies the block id and its transform in the HUD, so a cube is
+    never rebuilt when an item changes. The instance buffer is only written again
+    when the items or their slots change.
+    """
+
+    def __init__(self, game: "Engine", max_items: int) -> None:
         super().__init__()
 
         self.game = game
         self.context = self.game.context
-        self.shader = self.game.shader.chunk
+        self.shader = self.game.shader.hud_item
 
         self.vbo_format = "1u4"
         self.attrs = ("packed_data",)
-        self.voxel_id = 0
-        self.vao = None
+        self.voxel_id = 0  # Left out of the packed vertices, set per instance
+
+        # Per-instance transform and block id
+        self.instance_format = "16f 1u4/i"
+        self.instance_attrs = ("in_model", "in_voxel_id")
+        self.max_items = max_items
+        self.instance_vbo = None
+        self.instances: bytes = None  # Content of the instance buffer
+        self.instance_count = 0
+
+        self.vao = self.get_vao()
+
+    def get_vao(self) -> VertexArray:
+        """Creates the VAO of the cube vertices and of the per-instance attributes."""
+        resources = self.game.gpu_resources
+        self.release()
+
+        vertex_data = self.get_vertex_data()
+        self.vertex_count = len(vertex_data)
+        self.vbo = resources.create_buffer(vertex_data)
+        self.instance_vbo = resources.acquire_buffer(
+            self.max_items * get_vertex_size(self.instance_format)
+        )
+        self.instances = None
+        return resources.create_vertex_array(
+            self.shader,
+            [
+                (self.vbo, self.vbo_format, *self.attrs),
+                (self.instance_vbo, self.instance_format, *self.instance_attrs),
+            ],
+            skip_errors=True,
+        )
+
+    def release(self) -> None:
+        super().release()
+        if self.instance_vbo is not None:
+            self.game.gpu_resources.release_buffer(self.instance_vbo)
+            self.instance_vbo = None
+
+    @staticmethod
+    def get_model_matrix(x: float, y: float, w: float, h: float) -> mat4:
+        """Returns the transform of a cube drawn in a slot of the HUD."""
+        # Create a model matrix to position and scale the cube
+        model = mat4(1.0)
+        # Translate to center of the slot
+        model = translate(model, vec3(x + w / 2, y + h / 2, 0))
+        # Scale to fit within the slot (slightly smaller than the slot size)
+        scale_factor = min(w, h) * 0.8  # 80% of the slot size
+        model = scale(model, vec3(scale_factor, scale_factor, scale_factor))
+        # Apply a slight rotation for 3D effect
+        model = rotate(model, 0.5, vec3(1, 0, 0))  # Rotate around X-axis
+        model = rotate(model, 0.8, vec3(0, 1, 0))  # Rotate around Y-axis
+        # Center the cube (since vertices are 0 to 1)
+        return translate(model, vec3(-0.5, -0.5, -0.5))
+
+    def set_items(self, items: list[tuple]) -> None:
+        """
+        Sets the items to draw, uploading them only if they changed.
+
+        Args:
+            items (list[tuple]): (x, y, w, h, voxel_id) of each item, x and y being
+                the slot's position in screen space and w and h its size
+        """
+        data = zeros(len(items), dtype=[("model", "f4", 16), ("voxel_id", "u4")])
+        for i, (x, y, w, h, voxel_id) in enumerate(items):
+            model = self.get_model_matrix(x, y, w, h)
+            data[i]["model"] = frombuffer(model.to_bytes(), dtype="f4")
+            data[i]["voxel_id"] = voxel_id
+
+        instances = data.tobytes()
+        if instances != self.instances:
+            self.instance_vbo.write(instances)
+            self.instances = instances
+        self.instance_count = len(items)
+
+    def render(self) -> None:
+        if self.instance_count:
+            self.vao.render(vertices=self.vertex_count, instances=self.instance_count)
 
     def get_vertex_data(self) -> ndarray:
         # Define a cube with vertices scaled to [0, 1] range
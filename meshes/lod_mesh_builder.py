@@ -0,0 +1,170 @@
+from numba import njit
+from numpy import empty, ndarray, zeros
+
+from meshes.chunk_mesh_builder import add_data, pack_data
+from settings import CHUNK_SIZE
+from srcs.voxel_layout import get_index
+
+
+@njit
+def get_cell_id(voxels: ndarray, x0: int, y0: int, z0: int, factor: int) -> int:
+    """
+    Returns the id of a cell of a downsampled grid: the id of the first solid voxel
+    of its block, scanning from the top layer down (the surface of the terrain), or
+    0 if the whole block is air.
+
+    Args:
+        voxels (ndarray): Voxels of the chunk
+        x0 (int): Local X of the block's first voxel
+        y0 (int): Local Y of the block's first voxel
+        z0 (int): Local Z of the block's first voxel
+        factor (int): Edge of the block, in voxels
+    """
+    for y in range(y0 + factor - 1, y0 - 1, -1):
+        for x in range(x0, x0 + factor):
+            for z in range(z0, z0 + factor):
+                voxel_id = voxels[get_index(x, y, z)]
+                if voxel_id:
+                    return voxel_id
+    return 0
+
+
+@njit
+def downsample_voxels(voxels: ndarray, factor: int) -> ndarray:
+    """
+    Downsamples the voxels of a chunk into a grid of blocks of factor³ voxels.
+    A cell is solid as soon as one voxel of its block is: the coarse terrain covers
+    the fine one, so that no gap opens between chunks drawn at different levels.
+
+    Args:
+        voxels (ndarray): Voxels of the chunk
+        factor (int): Edge of a block, in voxels (it must divide CHUNK_SIZE)
+
+    Returns:
+        ndarray: Cell ids, indexed by `x + size * z + size * size * y`
+    """
+    size = CHUNK_SIZE // factor
+    grid = zeros(size * size * size, dtype="uint8")
+    for x in range(size):
+        for y in range(size):
+            for z in range(size):
+                grid[x + size * z + size * size * y] = get_cell_id(
+                    voxels, x * factor, y * factor, z * factor, factor
+                )
+    return grid
+
+
+@njit
+def update_cell(voxels: ndarray, grid: ndarray, factor: int, position: tuple) -> bool:
+    """
+    Updates the cell of a downsampled grid holding an edited voxel.
+
+    Args:
+        voxels (ndarray): Voxels of the chunk, already edited
+        grid (ndarray): Downsampled grid of the chunk
+        factor (int): Edge of a block of the grid, in voxels
+        position (tuple): Local position of the edited voxel
+
+    Returns:
+        bool: True if the cell changed
+    """
+    size = CHUNK_SIZE // factor
+    x, y, z = position[0] // factor, position[1] // factor, position[2] // factor
+    cell_id = get_cell_id(voxels, x * factor, y * factor, z * factor, factor)
+
+    index = x + size * z + size * size * y
+    if grid[index] == cell_id:
+        return False
+    grid[index] = cell_id
+    return True
+
+
+@njit
+def is_cell_void(grid: ndarray, size: int, x: int, y: int, z: int) -> bool:
+    """
+    Checks if a cell of a downsampled grid is air. Cells outside the chunk count as
+    air: the faces on the chunk's sides are always kept, as skirts hiding the seams
+    with neighbors drawn at another level.
+    """
+    if not (0 <= x < size and 0 <= y < size and 0 <= z < size):
+        return True
+    return not grid[x + size * z + size * size * y]
+
+
+@njit
+def build_lod_mesh(grid: ndarray, size: int) -> ndarray:
+    """
+    Builds the vertex data of a downsampled grid, in the packed format of the chunk
+    mesh with the positions in cells (scaled back by the shader's `lod_scale`).
+    Faces get no ambient occlusion, and so are never flipped.
+
+    Args:
+        grid (ndarray): Downsampled grid of the chunk
+        size (int): Number of cells on each side of the grid
+
+    Returns:
+        ndarray: vertex data for the chunk mesh
+    """
+    # At most 6 faces of 6 vertices per cell
+    vertex_data = empty(size * size * size * 36, dtype="uint32")
+    index = 0
+    ao = 3  # Brightest
+
+    for x in range(size):
+        for y in range(size):
+            for z in range(size):
+                voxel_id = grid[x + size * z + size * size * y]
+                if not voxel_id:
+                    continue
+
+                # Same vertex order as the unflipped faces of `build_chunk_mesh`
+
+                # Top face (+y)
+                if is_cell_void(grid, size, x, y + 1, z):
+                    v0 = pack_data(x, y + 1, z, voxel_id, 0, ao, 0)
+                    v1 = pack_data(x + 1, y + 1, z, voxel_id, 0, ao, 0)
+                    v2 = pack_data(x + 1, y + 1, z + 1, voxel_id, 0, ao, 0)
+                    v3 = pack_data(x, y + 1, z + 1, voxel_id, 0, ao, 0)
+                    index = add_data(vertex_data, index, v0, v3, v2, v0, v2, v1)
+
+                # Bottom face (-y)
+                if is_cell_void(grid, size, x, y - 1, z):
+                    v0 = pack_data(x, y, z, voxel_id, 1, ao, 0)
+                    v1 = pack_data(x + 1, y, z, voxel_id, 1, ao, 0)
+                    v2 = pack_data(x + 1, y, z + 1, voxel_id, 1, ao, 0)
+                    v3 = pack_data(x, y, z + 1, voxel_id, 1, ao, 0)
+                    index = add_data(vertex_data, index, v0, v2, v3, v0, v1, v2)
+
+                # Right face (+x)
+                if is_cell_void(grid, size, x + 1, y, z):
+                    v0 = pack_data(x + 1, y, z, voxel_id, 2, ao, 0)
+                    v1 = pack_data(x + 1, y + 1, z, voxel_id, 2, ao, 0)
+                    v2 = pack_data(x + 1, y + 1, z + 1, voxel_id, 2, ao, 0)
+                    v3 = pack_data(x + 1, y, z + 1, voxel_id, 2, ao, 0)
+                    index = add_data(vertex_data, index, v0, v1, v2, v0, v2, v3)
+
+                # Left face (-x)
+                if is_cell_void(grid, size, x - 1, y, z):
+                    v0 = pack_data(x, y, z, voxel_id, 3, ao, 0)
+                    v1 = pack_data(x, y + 1, z, voxel_id, 3, ao, 0)
+                    v2 = pack_data(x, y + 1, z + 1, voxel_id, 3, ao, 0)
+                    v3 = pack_data(x, y, z + 1, voxel_id, 3, ao, 0)
+                    index = add_data(vertex_data, index, v0, v2, v1, v0, v3, v2)
+
+                # Back face (-z)
+                if is_cell_void(grid, size, x, y, z - 1):
+                    v0 = pack_data(x, y, z, voxel_id, 4, ao, 0)
+                    v1 = pack_data(x, y + 1, z, voxel_id, 4, ao, 0)
+                    v2 = pack_data(x + 1, y + 1, z, voxel_id, 4, ao, 0)
+                    v3 = pack_data(x + 1, y, z, voxel_id, 4, ao, 0)
+                    index = add_data(vertex_data, index, v0, v1, v2, v0, v2, v3)
+
+                # Front face (+z)
+                if is_cell_void(grid, size, x, y, z + 1):
+                    v0 = pack_data(x, y, z + 1, voxel_id, 5, ao, 0)
+                    v1 = pack_data(x, y + 1, z + 1, voxel_id, 5, ao, 0)
+                    v2 = pack_data(x + 1, y + 1, z + 1, voxel_id, 5, ao, 0)
+                    v3 = pack_data(x + 1, y, z + 1, voxel_id, 5, ao, 0)
+                    index = add_data(vertex_data, index, v0, v2, v1, v0, v3, v2)
+
+    return vertex_data[:index]
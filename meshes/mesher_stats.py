@@ -0,0 +1,113 @@
+from typing import TYPE_CHECKING, Iterable
+from numpy import ndarray, zeros
+
+if TYPE_CHECKING:
+    from objects.chunk import Chunk
+
+
+# Slots of the statistics array filled by `build_chunk_mesh`
+VOXELS_VISITED = 0
+SOLID_VOXELS = 1
+FACES = 2  # 6 slots, one per face_id (top, bottom, right, left, back, front)
+AO_FLIPS = 8
+NEIGHBOR_LOOKUPS = 9  # Neighbor samples that fall outside the chunk
+BYTES_OUTPUT = 10
+STATS_SIZE = 11
+
+STAT_NAMES = (
+    "voxels_visited",
+    "solid_voxels",
+    "faces_top",
+    "faces_bottom",
+    "faces_right",
+    "faces_left",
+    "faces_back",
+    "faces_front",
+    "ao_flips",
+    "neighbor_lookups",
+    "bytes_output",
+)
+
+
+def create_stats() -> ndarray:
+    """Returns an empty statistics array for one `build_chunk_mesh` call."""
+    return zeros(STATS_SIZE, dtype="int64")
+
+
+def stats_to_dict(stats: ndarray) -> dict[str, int]:
+    """
+    Converts a statistics array to a dictionary keyed by `STAT_NAMES`,
+    with an extra "faces" entry summing the faces of all directions.
+    """
+    result = {name: int(value) for name, value in zip(STAT_NAMES, stats)}
+    result["faces"] = int(stats[FACES : FACES + 6].sum())
+    return result
+
+
+class MesherStats:
+    """
+    Aggregates the mesher statistics of the chunks meshed each frame and since startup.
+    Per-chunk statistics are kept by each `ChunkMesh` in its `stats` array.
+    """
+
+    def __init__(self) -> None:
+        self.frame = create_stats()  # Frame being accumulated
+        self.last_frame = create_stats()  # Last completed frame
+        self.total = create_stats()
+
+        self.frame_chunks = 0
+        self.last_frame_chunks = 0
+        self.total_chunks = 0
+
+    def add(self, stats: ndarray) -> None:
+        """Accounts for one chunk mesh build."""
+        self.frame += stats
+        self.total += stats
+        self.frame_chunks += 1
+        self.total_chunks += 1
+
+    def end_frame(self) -> None:
+        """Publishes the current frame's statistics and starts a new frame."""
+        self.last_frame[:] = self.frame
+        self.last_frame_chunks = self.frame_chunks
+        self.frame[:] = 0
+        self.frame_chunks = 0
+
+    def get_frame_stats(self) -> dict[str, int]:
+        """Statistics of the chunks meshed during the last completed frame."""
+        return {"chunks": self.last_frame_chunks, **stats_to_dict(self.last_frame)}
+
+    def get_total_stats(self) -> dict[str, int]:
+        """Statistics of every chunk meshed since startup."""
+        return {"chunks": self.total_chunks, **stats_to_dict(self.total)}
+
+    @staticmethod
+    def get_chunk_stats(chunk: "Chunk") -> dict[str, int]:
+        """Statistics of the last mesh build of a chunk (empty if it has no mesh)."""
+        if chunk.mesh is None:
+            return {}
+        return stats_to_dict(chunk.mesh.stats)
+
+    @staticmethod
+    def get_most_expensive_chunks(
+        chunks: Iterable["Chunk"], count: int = 10, stat: str = "bytes_output"
+    ) -> list[tuple["Chunk", int]]:
+        """
+        Ranks the meshed chunks by one statistic.
+
+        Args:
+            chunks (Iterable[Chunk]): Chunks to rank
+            count (int): Number of chunks to return
+            stat (str): Name of the statistic, one of `STAT_NAMES`
+
+        Returns:
+            list: (chunk, value) pairs, most expensive first
+        """
+        slot = STAT_NAMES.index(stat)
+        ranked = [
+            (chunk, int(chunk.mesh.stats[slot]))
+            for chunk in chunks
+            if chunk.mesh is not None
+        ]
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:count]
@@ -0,0 +1,51 @@
+from typing import TYPE_CHECKING
+from numpy import array, ndarray
+
+from meshes.base_mesh import BaseMesh
+
+if TYPE_CHECKING:
+    from srcs.engine import Engine
+
+
+class OcclusionBoxMesh(BaseMesh):
+    """A unit cube drawn as the bounding box of chunks in occlusion queries."""
+
+    def __init__(self, game: "Engine") -> None:
+        super().__init__()
+
+        self.game = game
+        self.context = self.game.context
+        self.shader = self.game.shader.occlusion_box
+
+        self.vbo_format = "3f"
+        self.attrs = ("in_position",)
+        self.vao = self.get_vao()
+
+    def get_vertex_data(self) -> ndarray:
+        vertices = [
+            (0, 0, 1),
+            (1, 0, 1),
+            (1, 1, 1),
+            (0, 1, 1),
+            (0, 1, 0),
+            (0, 0, 0),
+            (1, 0, 0),
+            (1, 1, 0),
+        ]
+        indices = [
+            (0, 2, 3),
+            (0, 1, 2),
+            (1, 7, 2),
+            (1, 6, 7),
+            (6, 5, 4),
+            (4, 7, 6),
+            (3, 4, 5),
+            (3, 5, 0),
+            (3, 7, 4),
+            (3, 2, 7),
+            (0, 6, 1),
+            (0, 5, 6),
+        ]
+        return array(
+            [vertices[i] for triangle in indices for i in triangle], dtype="f4"
+        )
@@ -1,30 +1,149 @@
 from typing import TYPE_CHECKING
-from numpy import hstack, ndarray, array
+from numba import njit
+from numpy import empty, ndarray, zeros
 
-from meshes.base_mesh import BaseMesh
+from meshes.chunk_mesh_arena import ArenaAllocation, ChunkMeshArena
+from settings import CHUNK_AREA, CHUNK_SIZE, WORLD_AREA, WORLD_HEIGHT, WORLD_WIDTH
+from srcs.voxel_layout import get_index
 
 if TYPE_CHECKING:
-    from main import Engine
+    from srcs.engine import Engine
 
 
-class WaterMesh(BaseMesh):
-    def __init__(self, game: "Engine") -> None:
-        super().__init__()
+# Corners of the two triangles of a quad on the XZ plane, as (x, z) fractions of it
+QUAD_CORNERS = ((0, 0), (1, 1), (1, 0), (0, 0), (0, 1), (1, 1))
 
+# Size (in bytes) of each vertex buffer of the water arena, an open sea column is a
+# single rectangle of 24 bytes
+WATER_ARENA_PAGE_SIZE = 1024 * 1024
+
+
+@njit
+def get_column_heights(world_voxels: ndarray, heights: ndarray, x: int, z: int) -> None:
+    """
+    Finds the height of the terrain in each voxel column of a chunk column, from
+    its current voxels: one above its top solid voxel, or 0 if it has none.
+
+    Args:
+        world_voxels (ndarray): Voxels of every chunk of the world
+        heights (ndarray): (z, x) array receiving the height of each voxel column
+        x (int): X position of the chunk column, in chunks
+        z (int): Z position of the chunk column, in chunks
+    """
+    for lz in range(CHUNK_SIZE):
+        for lx in range(CHUNK_SIZE):
+            heights[lz, lx] = 0
+            for y in range(WORLD_HEIGHT * CHUNK_SIZE - 1, -1, -1):
+                cy, ly = y // CHUNK_SIZE, y % CHUNK_SIZE
+                chunk_index = x + WORLD_WIDTH * z + WORLD_AREA * cy
+                if world_voxels[chunk_index, get_index(lx, ly, lz)]:
+                    heights[lz, lx] = y + 1
+                    break
+
+
+@njit
+def get_water_quads(heights: ndarray, water_line: float, cx: int, cz: int) -> ndarray:
+    """
+    Greedy meshing of the water surface of a chunk column: the columns whose terrain
+    is below the water line are merged into as few rectangles as possible.
+
+    Args:
+        heights (ndarray): (z, x) terrain height of each voxel column of the chunk
+        water_line (float): Height of the water surface
+        cx (int): World X of the chunk's first voxel
+        cz (int): World Z of the chunk's first voxel
+
+    Returns:
+        ndarray: (x, z) world position of each vertex, 6 per rectangle
+    """
+    is_water = zeros((CHUNK_SIZE, CHUNK_SIZE), dtype="bool")
+    for z in range(CHUNK_SIZE):
+        for x in range(CHUNK_SIZE):
+            is_water[z, x] = heights[z, x] < water_line
+
+    # At most one rectangle per voxel column
+    vertices = empty((CHUNK_AREA * len(QUAD_CORNERS), 2), dtype="uint16")
+    count = 0
+
+    for z in range(CHUNK_SIZE):
+        x = 0
+        while x < CHUNK_SIZE:
+            if not is_water[z, x]:
+                x += 1
+                continue
+
+            # Grow along X, then along Z while the whole row is water
+            width = 1
+            while x + width < CHUNK_SIZE and is_water[z, x + width]:
+                width += 1
+            depth = 1
+            while z + depth < CHUNK_SIZE:
+                row_is_water = True
+                for i in range(width):
+                    if not is_water[z + depth, x + i]:
+                        row_is_water = False
+                        break
+                if not row_is_water:
+                    break
+                depth += 1
+
+            for dz in range(depth):
+                for dx in range(width):
+                    is_water[z + dz, x + dx] = False
+
+            for corner_x, corner_z in QUAD_CORNERS:
+                vertices[count, 0] = cx + x + corner_x * width
+                vertices[count, 1] = cz + z + corner_z * depth
+                count += 1
+            x += width
+
+    return vertices[:count]
+
+
+class WaterMesh:
+    """
+    The water surface of every chunk column, each in its own range of a chunk mesh
+    arena. Only the ranges of the visible columns are drawn, the ranges that follow
+    each other in the arena with a single call.
+    """
+
+    def __init__(self, game: "Engine", columns: int) -> None:
         self.game = game
-        self.context = self.game.context
         self.shader = self.game.shader.water
+        self.arena = ChunkMeshArena(
+            self.game.gpu_resources,
+            self.shader,
+            vbo_format="2u2",
+            attrs=("in_position",),
+            page_size=WATER_ARENA_PAGE_SIZE,
+        )
 
-        self.vbo_format = "2u1 3u1"
-        self.attrs = ("in_texture_coords", "in_position")
-        self.vao = self.get_vao()
+        # Range of the arena holding the surface of each column (None if dry)
+        self.allocations: list[ArenaAllocation] = [None] * columns
 
-    def get_vertex_data(self) -> ndarray:
-        vertices = array(
-            [(0, 0, 0), (1, 0, 1), (1, 0, 0), (0, 0, 0), (0, 0, 1), (1, 0, 1)],
-            dtype="uint8",
+    def set_column(self, column: int, vertex_data: ndarray) -> None:
+        self.allocations[column] = self.arena.upload(
+            self.allocations[column], vertex_data
         )
-        texture_coords = array(
-            [(0, 0), (1, 1), (1, 0), (0, 0), (0, 1), (1, 1)], dtype="uint8"
+
+    def render(self, columns: ndarray) -> None:
+        """
+        Args:
+            columns (ndarray): Indices of the columns to draw
+        """
+        allocations = [self.allocations[column] for column in columns]
+        allocations = sorted(
+            (a for a in allocations if a is not None),
+            key=lambda a: (id(a.page), a.first),
         )
-        return hstack([texture_coords, vertices])
+
+        # Ranges that follow each other in the same page are merged: [page, first, end]
+        ranges = []
+        for a in allocations:
+            if ranges and ranges[-1][0] is a.page and ranges[-1][2] == a.first:
+                ranges[-1][2] += a.vertices
+            else:
+                ranges.append([a.page, a.first, a.first + a.vertices])
+
+        for page, first, end in ranges:
+            page.vao.render(first=first, vertices=end - first)
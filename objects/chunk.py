@@ -1,10 +1,12 @@
 from typing import TYPE_CHECKING
-from glm import ivec3, mat4, vec3, translate
-from numpy import ndarray, zeros, any
+from glm import ivec3, vec3
+from numpy import ndarray, zeros
 from numba import njit
 
 from meshes.chunk_mesh import ChunkMesh
-from settings import CHUNK_SIZE, CHUNK_VOLUME
+from settings import CHUNK_SIZE, CHUNK_VOLUME, WORLD_AREA, WORLD_WIDTH
+from srcs.cave_culling import get_face_connectivity
+from srcs.chunk_table import CHUNK_EMPTY, CHUNK_MESHED, CHUNK_UNIFORM
 from srcs.terrain_generation import get_height, set_voxel_id
 
 
@@ -17,49 +19,111 @@ class Chunk:
         self.game = world.game
         self.world = world
         self.position = position
-        self.matrix_model = self.get_model_matrix()
         self.voxels: ndarray = None
-        self.mesh: ChunkMesh = None
-        self.is_empty = True
-
-        self.center = (vec3(self.position) + 0.5) * CHUNK_SIZE
-        self.is_on_frustum = self.game.player.frustum.is_on_frustum
-
-    def get_model_matrix(self) -> ndarray:
-        return translate(mat4(), vec3(self.position) * CHUNK_SIZE)
-
-    def set_uniform(self) -> None:
-        self.mesh.shader["matrix_model"].write(self.matrix_model)
+        self.mesh: ChunkMesh = None  # Built lazily, the first time the chunk is seen
+        self.is_mesh_queued = False
+        self.queued_level = 0  # Level of detail to build once out of the queue
+
+        # Index of the chunk in `World.chunks` and in the world's chunk table
+        x, y, z = position
+        self.index = x + WORLD_WIDTH * z + WORLD_AREA * y
+        self.table = world.table
+
+        self.table.set_origin(self.index, vec3(self.position) * CHUNK_SIZE)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.table.has_flag(self.index, CHUNK_EMPTY)
+
+    @is_empty.setter
+    def is_empty(self, value: bool) -> None:
+        self.table.set_flag(self.index, CHUNK_EMPTY, value)
+
+    @property
+    def bounds(self) -> tuple:
+        """Min and max local positions of the solid voxels (both inclusive)."""
+        return self.table.get_bounds(self.index)
+
+    def use_origin(self) -> None:
+        # Binds the chunk's slot of the origin table, no uniform is written
+        self.game.shader.chunk_origins.use(self.index)
+
+    def build_mesh(self, level: int) -> None:
+        """Builds the chunk's mesh for a level of detail."""
+        if self.mesh is None:
+            self.mesh = ChunkMesh(self)
+        self.mesh.build(level)
+        self.table.set_flag(self.index, CHUNK_MESHED, True)
+
+    def update_connectivity(self) -> None:
+        """Flood fills the chunk's air to find which of its faces are connected."""
+        if self.table.has_flag(self.index, CHUNK_UNIFORM):
+            # Only air (all faces connected) or no air at all (none connected)
+            self.table.reset_connectivity(self.index)
+            return
+        self.table.connectivity[self.index] = get_face_connectivity(self.voxels)
 
-    def build_mesh(self) -> None:
-        self.mesh = ChunkMesh(self)
+    def rebuild_mesh(self) -> None:
+        # A chunk that was never seen has no mesh yet; it will be built
+        # from the up-to-date voxels once it becomes visible
+        if self.mesh is not None:
+            self.mesh.rebuild()
 
     def render(self) -> None:
-        if self.is_empty or not self.is_on_frustum(self):
-            return
-        self.set_uniform()
-        self.mesh.render()
-
-    def build_voxels(self) -> ndarray:
+        # Culling and the choice of the level of detail are done by the world
+        # for all chunks at once
+        level = self.world.level_of_detail.levels[self.index]
+        if self.mesh is None or not self.mesh.is_built[level]:
+            self.world.queue_mesh_build(self, level)
+            # Until the level is built by the world's queue, the nearest level
+            # already built is drawn instead (nothing for a new chunk)
+            level = self.mesh.get_built_level(level) if self.mesh else -1
+            if level == -1:
+                return
+        self.use_origin()
+        self.mesh.render(level)
+
+    def build_voxels(self, heights: ndarray) -> ndarray:
+        """
+        Generates the voxels of the chunk.
+
+        Args:
+            heights (ndarray): (z, x) array receiving the terrain height
+                of each voxel column of the chunk
+        """
         voxels = zeros(CHUNK_VOLUME, dtype="uint8")
 
         cx, cy, cz = ivec3(self.position) * CHUNK_SIZE
 
-        self.generate_terrain(voxels, cx, cy, cz)
+        self.generate_terrain(voxels, heights, cx, cy, cz)
 
-        if any(voxels):
-            self.is_empty = False
+        # Solid count, bounds and solid layers, used to skip empty space
+        self.table.set_summary(self.index, voxels)
 
         return voxels
 
+    def set_voxel(self, voxel_index: int, local_position: tuple, voxel_id: int) -> None:
+        """
+        Changes a voxel of the chunk and updates the chunk's summary in the table,
+        and its downsampled grids. The mesh is not rebuilt.
+        """
+        old_id = self.voxels[voxel_index]
+        self.voxels[voxel_index] = voxel_id
+        self.table.set_voxel(self.index, self.voxels, local_position, old_id, voxel_id)
+        if self.mesh is not None:
+            self.mesh.update_voxel(tuple(local_position))
+
     @staticmethod
     @njit
-    def generate_terrain(voxels: ndarray, cx: int, cy: int, cz: int) -> None:
+    def generate_terrain(
+        voxels: ndarray, heights: ndarray, cx: int, cy: int, cz: int
+    ) -> None:
         for x in range(CHUNK_SIZE):
             wx = cx + x
             for z in range(CHUNK_SIZE):
                 wz = cz + z
                 world_height = get_height(wx, wz)
+                heights[z, x] = world_height
                 local_height = min(world_height - cy, CHUNK_SIZE)
 
                 for y in range(local_height):
@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING
 
 from meshes.cloud_mesh import CloudMesh
 from objects.texturing import CLOUD_COLOR
+from settings import FAR
 
 if TYPE_CHECKING:
     from srcs.engine import Engine
@@ -19,16 +20,22 @@ class Clouds:
         # Create the cloud mesh object, responsible for generating and rendering cloud geometry
         self.mesh = CloudMesh(game)
 
+        # Half size of the cloud square, lowered by the quality governor
+        self.distance = FAR  # Up to the far clipping plane
+
     def update(self) -> None:
         """
         Update the cloud shader with the current game time.
         This allows clouds to animate or shift over time.
         """
-        self.mesh.shader["unit_time"] = self.game.time
-        self.mesh.shader["cloud_color"] = CLOUD_COLOR
+        shader = self.game.shader.get_state(self.mesh.shader)
+        shader["unit_time"] = self.game.time
+        shader["cloud_color"] = CLOUD_COLOR
+        shader["cloud_distance"] = self.distance
 
     def render(self) -> None:
         """
         Render the clouds by calling the mesh's render function.
         """
+        self.game.shader.texture_units.use(self.mesh.coverage, location=4)
         self.mesh.render()
@@ -1,8 +1,10 @@
 from typing import TYPE_CHECKING
 from glm import vec4
 
+from meshes.hud_batch_mesh import HUDBatchMesh
 from meshes.hud_item_mesh import HUDItemMesh
-from settings import GO_THROUGH
+from srcs.glyph_atlas import TextLayout
+from settings import GO_THROUGH, MESHER_STATS
 
 if TYPE_CHECKING:
     from srcs.engine import Engine
@@ -13,27 +15,53 @@ class HUD:
     def __init__(self, game: "Engine", player: "Player") -> None:
         self.game = game
         self.player = player
-        self.hud_item_mesh = HUDItemMesh(game)
+        self.hud_item_mesh = HUDItemMesh(game, max_items=len(game.inventory.slots))
+        self.quad_batch = HUDBatchMesh(game)
+        self.text_layout = TextLayout(game.textures.glyph_atlas)
 
     def debug(self) -> str:
         """Returns a debug string with player position and chunk information."""
         fps = self.game.clock.get_fps()
         player_pos = self.player.position
         textures_enabled = "on" if self.game.textures_enabled else "off"
-        shading_mode = self.game.shading_mode
+        shading_mode = self.game.get_shading_mode()
         go_through = "on" if GO_THROUGH else "off"
-        return (
+        gpu = self.game.gpu_resources.get_stats()
+        text = (
             f"FPS: {fps:.0f}\n"
+            f"resolution: {self.game.framebuffer.scale * 100:.0f}%\n"
             f"pos: {int(player_pos.x)}, {int(player_pos.y)}, {int(player_pos.z)}\n"
             f"textures: {textures_enabled}\n"
             f"shading: {shading_mode}\n"
-            f"go_through: {go_through}"
+            f"go_through: {go_through}\n"
+            f"buffers: {gpu['live_buffers']} ({gpu['live_bytes'] / 1048576:.1f} MiB), "
+            f"pooled: {gpu['pooled_bytes'] / 1048576:.1f} MiB"
+        )
+        if MESHER_STATS:
+            text += "\n" + self.mesher_debug()
+        return text
+
+    def mesher_debug(self) -> str:
+        """Returns the mesher statistics of the last frame and since startup."""
+        mesher_stats = self.game.scene.world.mesher_stats
+        frame = mesher_stats.get_frame_stats()
+        total = mesher_stats.get_total_stats()
+        return (
+            f"meshed: {frame['chunks']} chunks, {frame['faces']} faces, "
+            f"{frame['bytes_output'] / 1024:.0f} KiB\n"
+            f"meshed total: {total['chunks']} chunks, {total['faces']} faces, "
+            f"{total['bytes_output'] / 1048576:.1f} MiB\n"
+            f"visited: {total['voxels_visited']}, solid: {total['solid_voxels']}, "
+            f"ao flips: {total['ao_flips']}, "
+            f"neighbor lookups: {total['neighbor_lookups']}"
         )
 
     def render(self):
-        # Render the info logging
-        info_text = self.debug()
-        self.game.textures.update_text(info_text)
+        # Lay out the info logging (only done again when the text changed)
+        self.text_layout.set_text(self.debug())
+
+        # The 2D quads are collected into the batch, then drawn with one call
+        quads = self.quad_batch
 
         # Render inventory slots
         inventory = self.game.inventory
@@ -47,25 +75,12 @@ class HUD:
         for i in range(10):
             x = x_start + i * (slot_size + spacing)
             # Render slot background (gray)
-            self.game.shader.render_2d_quad(
-                x, y, slot_size, slot_size, vec4(0.5, 0.5, 0.5, 1.0)
-            )
-            # Render item as a 3D cube if present
-            item = inventory.slots[i]
-            if item is not None:
-                self.game.shader.render_3d_item(
-                    x + 5,
-                    y + 5,
-                    slot_size - 10,
-                    slot_size - 10,
-                    item,
-                    self.hud_item_mesh,
-                )
+            quads.add_quad(x, y, slot_size, slot_size, vec4(0.5, 0.5, 0.5, 1.0))
             # Render selection indicator if this is the selected slot
             if i == inventory.selected_slot:
                 border_width = 2
                 # Top border
-                self.game.shader.render_2d_quad(
+                quads.add_quad(
                     x - border_width,
                     y + slot_size,
                     slot_size + 2 * border_width,
@@ -73,7 +88,7 @@ class HUD:
                     vec4(1.0, 1.0, 1.0, 1.0),
                 )
                 # Bottom border
-                self.game.shader.render_2d_quad(
+                quads.add_quad(
                     x - border_width,
                     y - border_width,
                     slot_size + 2 * border_width,
@@ -81,7 +96,7 @@ class HUD:
                     vec4(1.0, 1.0, 1.0, 1.0),
                 )
                 # Left border
-                self.game.shader.render_2d_quad(
+                quads.add_quad(
                     x - border_width,
                     y - border_width,
                     border_width,
@@ -89,7 +104,7 @@ class HUD:
                     vec4(1.0, 1.0, 1.0, 1.0),
                 )
                 # Right border
-                self.game.shader.render_2d_quad(
+                quads.add_quad(
                     x + slot_size,
                     y - border_width,
                     border_width,
@@ -106,7 +121,7 @@ class HUD:
         center_y = window_height / 2
 
         # Vertical line (taller, thin)
-        self.game.shader.render_2d_quad(
+        quads.add_quad(
             center_x - crosshair_thickness / 2,  # Center the line horizontally
             center_y - crosshair_size,  # Start below the center
             crosshair_thickness,  # Width of the line
@@ -115,7 +130,7 @@ class HUD:
         )
 
         # Horizontal line (wider, short)
-        self.game.shader.render_2d_quad(
+        quads.add_quad(
             center_x - crosshair_size,  # Start left of the center
             center_y - crosshair_thickness / 2,  # Center the line vertically
             crosshair_size * 2,  # Width of the line (left and right of center)
@@ -123,12 +138,31 @@ class HUD:
             crosshair_color,
         )
 
-        # Render the text (FPS, etc.) in the top-right corner
-        text_width, text_height = self.game.textures.text_surface.get_size()
-        self.game.shader.render_2d_quad(
+        # Render the text (FPS, etc.) in the top-right corner, one quad per glyph
+        text_width, text_height = self.text_layout.size
+        quads.add_text(
+            self.text_layout,
             window_width - text_width - 10,
             window_height - text_height - 10,
-            text_width,
-            text_height,
-            use_text=True,
         )
+
+        atlas_texture = self.game.textures.glyph_atlas.texture
+        self.game.shader.texture_units.use(atlas_texture, location=3)
+        quads.render()
+
+        # Render the items as 3D cubes over their slot, all in one draw
+        items = [
+            (
+                x_start + i * (slot_size + spacing) + 5,
+                y + 5,
+                slot_size - 10,
+                slot_size - 10,
+                item,
+            )
+            for i, item in enumerate(inventory.slots)
+            if item is not None
+        ]
+        self.hud_item_mesh.set_items(items)
+        self.game.shader.texture_units.use(self.game.textures.texture_array, location=1)
+        with self.game.framebuffer.linear_output():  # Shaded in linear space
+            self.hud_item_mesh.render()
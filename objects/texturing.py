@@ -1,7 +1,7 @@
 from enum import Enum
 from glm import vec3
 
-from settings import CHUNK_SIZE, WORLD_HEIGHT, WORLD_WIDTH
+from settings import CHUNK_SIZE, WORLD_HEIGHT
 
 
 # Color constants
@@ -53,13 +53,13 @@ BEEHIVE_PROBABILITY = 0.03
 
 # Water settings
 WATER_LINE = 5.8
-WATER_AREA = 5 * CHUNK_SIZE * WORLD_WIDTH
 
 
 # Cloud settings
 CLOUD_COLOR = vec3(1.0, 1.0, 1.0)
 CLOUD_SCALE = 25
 CLOUD_HEIGHT = WORLD_HEIGHT * CHUNK_SIZE * 2
+CLOUD_TEXTURE_SIZE = 256  # Cloud cells before the coverage repeats, on each axis
 
 # Cluster parameters
 CLUSTER_FREQUENCY = 0.05  # Frequency changes every 50 voxels (higher = more frequent)
@@ -37,8 +37,9 @@ class VoxelMarker:
         # Set shader uniforms before rendering:
         # 1. Pass the interaction mode (0 or 1) to control marker color
         # 2. Update the model matrix to match the marker's current position
-        self.mesh.shader["mode_id"] = self.handler.interaction_mode
-        self.mesh.shader["matrix_model"].write(self.get_model_matrix())
+        shader = self.game.shader.get_state(self.mesh.shader)
+        shader["mode_id"] = self.handler.interaction_mode
+        shader["matrix_model"] = self.get_model_matrix()
 
     def get_model_matrix(self) -> mat4x4:
         # Construct and return the model matrix using the marker's position
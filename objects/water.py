@@ -1,15 +1,88 @@
+from math import sqrt
 from typing import TYPE_CHECKING
+from numpy import empty, full, ndarray, zeros
 
-from meshes.water_mesh import WaterMesh
+from meshes.water_mesh import WaterMesh, get_column_heights, get_water_quads
+from objects.texturing import WATER_LINE
+from settings import (
+    CHUNK_SIZE,
+    H_CHUNK_SIZE,
+    RENDER_DISTANCE,
+    WORLD_AREA,
+    WORLD_WIDTH,
+)
 
 if TYPE_CHECKING:
-    from main import Engine
+    from srcs.world import World
+
+
+# Layer of chunks holding the water surface
+WATER_LAYER = int(WATER_LINE // CHUNK_SIZE)
+
+# Bits of `Water.flags`
+WATER_DRY = 1  # The column has no water surface
+
+# Bounding sphere of a column's surface, a flat square at the water line
+WATER_RADIUS = H_CHUNK_SIZE * sqrt(2.0)
 
 
 class Water:
-    def __init__(self, game: "Engine") -> None:
-        self.game = game
-        self.mesh = WaterMesh(game)
+    """
+    The water surface, built per chunk column from the terrain heights: only the
+    voxel columns below the water line get water, merged into rectangles. Columns
+    are culled against the frustum like the chunks, so the water under the terrain
+    and outside the view is never blended.
+    """
+
+    def __init__(self, world: "World") -> None:
+        self.game = world.game
+        self.world = world
+        self.mesh = WaterMesh(self.game, WORLD_AREA)
+
+        # Bounding sphere and flags of each column, indexed by `x + WORLD_WIDTH * z`
+        self.centers = zeros((WORLD_AREA, 3), dtype="float32")
+        self.radii = full(WORLD_AREA, WATER_RADIUS, dtype="float32")
+        self.flags = full(WORLD_AREA, WATER_DRY, dtype="uint8")
+
+        # Columns farther than this are not drawn, lowered by the quality governor
+        self.distance = RENDER_DISTANCE
+
+    def set_column(self, position: tuple, heights: ndarray) -> None:
+        """
+        Builds the water surface of a chunk column.
+
+        Args:
+            position (tuple): (x, z) position of the column, in chunks
+            heights (ndarray): (z, x) terrain height of each voxel column in it
+        """
+        x, z = position
+        column = x + WORLD_WIDTH * z
+        cx, cz = x * CHUNK_SIZE, z * CHUNK_SIZE
+
+        vertex_data = get_water_quads(heights, WATER_LINE, cx, cz)
+        self.mesh.set_column(column, vertex_data)
+
+        self.centers[column] = cx + H_CHUNK_SIZE, WATER_LINE, cz + H_CHUNK_SIZE
+        self.flags[column] = WATER_DRY if not len(vertex_data) else 0
+
+    def update_column(self, position: tuple) -> None:
+        """
+        Builds the water surface of a chunk column again after a voxel of one of
+        its chunks changed, from the current top solid voxel of each voxel column.
+        Edits below the layer of the water surface leave it as it is.
+
+        Args:
+            position (tuple): (x, y, z) position of the edited chunk, in chunks
+        """
+        x, y, z = position
+        if y < WATER_LAYER:
+            return
+        heights = empty((CHUNK_SIZE, CHUNK_SIZE), dtype="int32")
+        get_column_heights(self.world.voxels, heights, x, z)
+        self.set_column((x, z), heights)
 
     def render(self) -> None:
-        self.mesh.render()
+        visible = self.game.player.frustum.cull(
+            self.centers, self.radii, self.flags, WATER_DRY, self.distance
+        )
+        self.mesh.render(visible)
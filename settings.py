@@ -1,5 +1,5 @@
 from glm import radians, vec2, vec3
-from math import atan, tan, sqrt
+from math import atan, log2, tan, sqrt
 
 
 # GAME SETTINGS
@@ -8,6 +8,7 @@ WINDOW_RESOLUTION = vec2(1920, 1080)
 KEYBOARD_QWERTY = False  # Set to False for AZERTY keyboard layout
 SHOW_CHUNKS = False
 GO_THROUGH = False
+MESHER_STATS = False  # Collect mesher counters and show them in the HUD
 
 
 # CAMERA SETTINGS
@@ -16,7 +17,15 @@ FOV_DEGREES = 50.0
 VERTICAL_FOV = radians(FOV_DEGREES)
 HORIZONTAL_FOV = 2.0 * atan(tan(VERTICAL_FOV * 0.5) * ASPECT_RATIO)
 NEAR = 0.1
-FAR = 2000.0
+
+# Chunks blend into the sky color by 1 - exp2(-FOG_DENSITY * distance²)
+FOG_DENSITY = 0.00001
+# Share of the chunk color left where the fog is considered opaque (one 8-bit step)
+FOG_CUTOFF = 1.0 / 256.0
+# Distance (in voxels) past which chunks are pure sky color, and are not drawn
+RENDER_DISTANCE = sqrt(log2(1.0 / FOG_CUTOFF) / FOG_DENSITY)
+# Far clipping plane, never closer than the chunks (the clouds are drawn farther)
+FAR = max(2000.0, RENDER_DISTANCE)
 PITCH_LIMIT = radians(89.0)
 MAX_RAY_DISTANCE = 6.0
 
@@ -30,6 +39,13 @@ CHUNK_AREA = CHUNK_SIZE * CHUNK_SIZE
 CHUNK_VOLUME = CHUNK_SIZE * CHUNK_AREA
 CHUNK_SPHERE_RADIUS = H_CHUNK_SIZE * sqrt(3.0)
 
+# Voxel memory layout inside a chunk:
+#     "linear": x + CHUNK_SIZE * z + CHUNK_AREA * y
+#     "brick": BRICK_SIZE³ bricks stored one after another, Morton (Z-order) inside each brick
+# BRICK_SIZE must be a power of two that divides CHUNK_SIZE
+VOXEL_LAYOUT = "linear"
+BRICK_SIZE = 4
+
 WORLD_WIDTH, WORLD_HEIGHT = 100, 2
 WORLD_DEPTH = WORLD_WIDTH
 WORLD_AREA = WORLD_WIDTH * WORLD_DEPTH
@@ -38,6 +54,52 @@ WORLD_VOLUME = WORLD_HEIGHT * WORLD_AREA
 CENTER_XZ = WORLD_WIDTH * H_CHUNK_SIZE
 CENTER_Y = WORLD_HEIGHT * H_CHUNK_SIZE
 
+# Skip the chunks that cannot be seen through the air between chunk faces (caves)
+CAVE_CULLING = True
+
+# Skip the chunks hidden behind others, using last frame's occlusion queries
+OCCLUSION_CULLING = True
+
+# Chunks are drawn front to back, sorted by distance in buckets of this size (in voxels)
+DRAW_ORDER_BUCKET_SIZE = 24.0
+
+# Chunks farther than each of these distances (in voxels) are drawn from their voxels
+# downsampled 2, 4 and then 8 times (see srcs/level_of_detail.py)
+LOD_DISTANCES = (192.0, 384.0, 640.0)
+# Distance (in voxels) past a LOD distance before a chunk switches level,
+# so that chunks near it do not switch back and forth
+LOD_HYSTERESIS = 16.0
+
+# Draw the 3D scene at a lower resolution when the GPU takes longer than the target
+# time (in milliseconds) on it, down to a share of the window's resolution
+DYNAMIC_RESOLUTION = True
+RESOLUTION_TARGET_TIME = 12.0
+MIN_RESOLUTION_SCALE = 0.5
+
+# Time (in milliseconds) spent each frame meshing chunks that just became visible
+MESH_BUILD_BUDGET = 4.0
+
+# Lower the quality when the average frame time, over a window of frames, misses the
+# target frame rate, and try raising it back while it is held
+QUALITY_GOVERNOR = True
+TARGET_FPS = 60.0
+QUALITY_WINDOW = 120
+# Steps between the highest and lowest quality of each setting below
+QUALITY_STEPS = 4
+# Lowest quality the governor may go down to, the highest being the settings above
+MIN_MESH_BUILD_BUDGET = 1.0
+MIN_CLOUD_DISTANCE = 600.0
+MIN_WATER_DISTANCE = 300.0
+MIN_LOD_BIAS = 0.5  # Scale of LOD_DISTANCES
+MIN_SHADING_MODE = 1  # 0 = flat, 1 = directional, 2 = directional + AO
+MIN_RENDER_DISTANCE = 450.0
+
+# Size (in bytes) of each vertex buffer shared by the chunk meshes
+CHUNK_ARENA_PAGE_SIZE = 128 * 1024 * 1024
+
+# Released vertex buffers kept (in bytes) for reuse instead of freeing them
+GPU_BUFFER_POOL_SIZE = 256 * 1024 * 1024
+
 
 # PLAYER SETTINGS
 PLAYER_WIDTH = 0.6
@@ -50,3 +112,7 @@ PLAYER_POSITION = vec3(CENTER_XZ, WORLD_HEIGHT * CHUNK_SIZE, CENTER_XZ)
 MOUSE_SENSITIVITY = 0.002
 EYE_HEIGHT = 1.6
 COLLISION_OFFSET = 0.1
+# Height (in voxels) of the ledges the player walks up while on the ground
+STEP_HEIGHT = 1.0
+# Acceleration (in voxels per ms²) pulling the player down, 0 to fly freely
+GRAVITY = 0.0
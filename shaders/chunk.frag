@@ -3,21 +3,22 @@
 // Output color of the fragment
 layout(location = 0) out vec4 fragColor;
 
-// Gamma correction constants
-const vec3 gamma = vec3(2.2);          // Standard gamma correction value
-const vec3 inv_gamma = 1.0 / gamma;    // Inverse for linear-to-sRGB conversion
-
 // Texture sampler for blank voxel
 uniform sampler2D unit_no_texture;
 // Texture sampler for texture array
 uniform sampler2DArray unit_texture_array;
 // Skybox color for fog effect
 uniform vec3 skybox_color;
-// Water line height for water effect
-uniform float water_line;
+// Camera data shared by the 3D programs, written once per frame (see srcs/uniform_blocks.py)
+layout (std140) uniform Camera
+{
+    mat4 matrix_projection;  // Projection matrix (perspective)
+    mat4 matrix_view;        // View matrix (camera transformation)
+    float fog_density;       // Fog density of the chunks
+    float water_line;        // Height of the water surface
+};
 
-// Flag to enable/disable texture mapping
-uniform bool textures_enabled;
+// TEXTURES_ENABLED is defined at compile time (see srcs/shader_variants.py)
 
 // Interpolated values from the vertex shader
 in vec3 voxel_color;              // Color derived from voxel_id hashing
@@ -31,30 +32,21 @@ flat in int face_id;   // Face direction index (0–5)
 
 void main()
 {
+#if TEXTURES_ENABLED
     vec2 face_uv = uv;
     face_uv.x = uv.x / 3.0 - min(face_id, 2) / 3.0;
 
-    vec3 texture_color = vec3(0.0);
-
-    if (textures_enabled)
-    {
-        // Sample from the texture array using the voxel_id and face_uv
-        texture_color = texture(unit_texture_array, vec3(face_uv, voxel_id)).rgb;
+    // Sample from the texture array using the voxel_id and face_uv
+    // (the texture array holds linear colors, see srcs/textures.py)
+    vec3 texture_color = texture(unit_texture_array, vec3(face_uv, voxel_id)).rgb;
+#else
+    // Sample base color from the texture using interpolated UVs
+    // (only black and white, the same in sRGB and linear space)
+    vec3 texture_color = texture(unit_no_texture, uv).rgb;
 
-        // Apply gamma correction (sRGB to linear space)
-        texture_color = pow(texture_color, gamma);
-    }
-    else
-    {
-        // Sample base color from the texture using interpolated UVs
-        texture_color = texture(unit_no_texture, uv).rgb;
-
-        // Apply gamma correction (sRGB to linear space)
-        texture_color = pow(texture_color, gamma);
-
-        // Modulate with the voxel-specific color
-        texture_color.rgb *= voxel_color;
-    }
+    // Modulate with the voxel-specific color
+    texture_color *= voxel_color;
+#endif
 
     // Apply final shading (includes directional and/or AO)
     texture_color *= shading;
@@ -65,11 +57,9 @@ void main()
 
     // Apply fog effect based on distance from camera
     float fog_distance = gl_FragCoord.z / gl_FragCoord.w;
-    texture_color = mix(texture_color, skybox_color, (1.0 - exp2(-0.00001 * fog_distance * fog_distance)));
-
-    // Convert back to sRGB space (linear to sRGB)
-    texture_color = pow(texture_color, inv_gamma);
+    texture_color = mix(texture_color, skybox_color, (1.0 - exp2(-fog_density * fog_distance * fog_distance)));
 
-    // Output final color with full alpha
+    // Output final color with full alpha, encoded to sRGB by the framebuffer
+    // (see srcs/scene_framebuffer.py)
     fragColor = vec4(texture_color, 1.0);
 }
\ No newline at end of file
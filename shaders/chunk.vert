@@ -7,16 +7,30 @@ int x, y, z;           // Voxel position
 int ao_id;             // Ambient occlusion level (0–3)
 int flip_id;           // Indicates flipped face for UV mapping (0 or 1)
 
-// Transformation matrices for rendering
-uniform mat4 matrix_projection;
-uniform mat4 matrix_view;
-uniform mat4 matrix_model;
+// Camera data shared by the 3D programs, written once per frame (see srcs/uniform_blocks.py)
+layout (std140) uniform Camera
+{
+    mat4 matrix_projection;  // Projection matrix (perspective)
+    mat4 matrix_view;        // View matrix (camera transformation)
+    float fog_density;       // Fog density of the chunks
+    float water_line;        // Height of the water surface
+};
+
+// World position of the drawn chunk, bound per draw from a table of all chunk origins
+layout (std140) uniform ChunkOrigin
+{
+    vec3 chunk_origin;
+};
+
+// Size of a cell of the mesh, in voxels (larger than 1 for the downsampled levels of detail)
+uniform float lod_scale;
 
 flat out int voxel_id; // Unique identifier for voxel type (used for hashing color)
 flat out int face_id;  // Face direction index (0–5)
 
-// Shading mode (0 = flat, 1 = directional, 2 = directional + AO)
-uniform int shading_mode;
+// Compile-time features, defined by srcs/shader_variants.py:
+//     SHADING_MODE: 0 = flat, 1 = directional, 2 = directional + AO
+//     TEXTURES_ENABLED: 0 = color per voxel id, 1 = texture array
 
 // Outputs to the fragment shader
 out vec3 voxel_color;              // Final color for this voxel
@@ -106,7 +120,7 @@ void main()
     unpack(packed_data);
 
     // Construct the 3D position of this vertex
-    vec3 in_position = vec3(x, y, z);
+    vec3 in_position = vec3(x, y, z) * lod_scale;
 
     // Compute UV index:
     // - `gl_VertexID % 6`: gives the current vertex within a quad (0–5)
@@ -118,20 +132,23 @@ void main()
     // Get UV coordinate from lookup table
     uv = uv_coords[uv_indices[uv_index]];
 
+#if !TEXTURES_ENABLED
     // Determine voxel color using hashed voxel_id
     voxel_color = hash31(voxel_id);
+#endif
 
     // Determine shading based on selected mode
-    if (shading_mode == 0)
-        shading = 1.0;  // Flat shading
-    else if (shading_mode == 1)
-        shading = face_shading[face_id];  // Directional lighting
-    else if (shading_mode == 2)
-        shading = face_shading[face_id] * ao_values[ao_id];  // Directional + AO
-    
+#if SHADING_MODE == 0
+    shading = 1.0;  // Flat shading
+#elif SHADING_MODE == 1
+    shading = face_shading[face_id];  // Directional lighting
+#else
+    shading = face_shading[face_id] * ao_values[ao_id];  // Directional + AO
+#endif
+
     // Set fragment world position
     // This is the position in world space, used for effects like underwater rendering
-    fragment_world_position = (matrix_model * vec4(in_position, 1.0)).xyz;
+    fragment_world_position = in_position + chunk_origin;
 
     // Final position in clip space
     gl_Position = matrix_projection * matrix_view * vec4(fragment_world_position, 1.0);
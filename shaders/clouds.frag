@@ -7,9 +7,28 @@ layout (location = 0) out vec4 fragColor;
 uniform vec3 skybox_color;
 // Cloud color
 uniform vec3 cloud_color;
+// Cloud presence of each cloud cell, repeated over the sky
+uniform sampler2D unit_cloud_coverage;
+
+uniform int center;                    // Center of cloud movement (usually the world center)
+uniform float unit_time;               // Game time, used to animate clouds
+uniform float cloud_scale;             // Size of a cloud cell (in voxels)
+
+// World position of the fragment on the cloud layer
+in vec2 world_xz;
 
 void main(void)
 {
+    // Animate cloud position to simulate drifting over time
+    float time = 300 * sin(0.01 * unit_time);  // Oscillate position with time
+
+    // Cloud cell under the fragment: cells are scaled around the center
+    vec2 cell = (world_xz - time - center) / cloud_scale + center;
+    ivec2 size = textureSize(unit_cloud_coverage, 0);
+    ivec2 texel = ivec2(mod(floor(cell), vec2(size)));
+    if (texelFetch(unit_cloud_coverage, texel, 0).r < 0.5)
+        discard;
+
     // Estimate distance from camera to the fragment using depth
     float fog_distance = gl_FragCoord.z / gl_FragCoord.w;
 
@@ -23,4 +42,4 @@ void main(void)
 
     // Set the final fragment color with a constant alpha (transparency = 0.8)
     fragColor = vec4(color, 0.8);
-}
\ No newline at end of file
+}
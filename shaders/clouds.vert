@@ -1,29 +1,32 @@
 #version 330 core
 
-// Input vertex position from the vertex buffer
-layout (location = 0) in vec3 in_position;
+// Corner of the cloud square (0 or 1 on each axis, in the XZ plane)
+layout (location = 0) in vec2 in_position;
 
 // Uniforms (passed in from the CPU side)
-uniform mat4 matrix_projection;        // Projection matrix (camera lens)
-uniform mat4 matrix_view;              // View matrix (camera position and rotation)
-uniform int center;                    // Center of cloud movement (usually the world center)
-uniform float unit_time;               // Game time, used to animate clouds
-uniform float cloud_scale;             // Scale factor for cloud size/spacing
+// Camera data shared by the 3D programs, written once per frame (see srcs/uniform_blocks.py)
+layout (std140) uniform Camera
+{
+    mat4 matrix_projection;  // Projection matrix (perspective)
+    mat4 matrix_view;        // View matrix (camera transformation)
+    float fog_density;       // Fog density of the chunks
+    float water_line;        // Height of the water surface
+};
+
+uniform float cloud_height;            // Height of the cloud layer
+uniform float cloud_distance;          // Half size of the cloud square around the camera
+
+// World position of the fragment on the cloud layer
+out vec2 world_xz;
 
 void main(void)
 {
-    vec3 position = vec3(in_position);
-
-    // Scale the XZ plane of the cloud position around the center
-    // This controls the size and spacing of clouds
-    position.xz -= center;         // Move to origin
-    position.xz *= cloud_scale;    // Scale
-    position.xz += center;         // Move back to original center
+    // Camera position, from the inverse of the view matrix
+    vec3 eye = -(transpose(mat3(matrix_view)) * matrix_view[3].xyz);
 
-    // Animate cloud position to simulate drifting over time
-    float time = 300 * sin(0.01 * unit_time);  // Oscillate position with time
-    position.xz += time;                       // Offset position based on time
+    // Stretch the square around the camera
+    world_xz = eye.xz + (in_position * 2.0 - 1.0) * cloud_distance;
 
     // Final position in clip space (applies camera projection)
-    gl_Position = matrix_projection * matrix_view * vec4(position, 1.0);
-}
\ No newline at end of file
+    gl_Position = matrix_projection * matrix_view * vec4(world_xz.x, cloud_height, world_xz.y, 1.0);
+}
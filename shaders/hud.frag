@@ -1,28 +1,24 @@
 #version 330 core
 
 // Uniforms:
-// Color to use when no texture is applied
-uniform vec4 color;
-
-// Boolean flag to determine whether to use a texture or flat color
-uniform bool use_texture;
-
 // Sampler for the 2D texture
 uniform sampler2D tex;
 
-// Input texture coordinates from the vertex shader
+// Inputs from the vertex shader
 in vec2 v_texture_coords;
+in vec4 v_color;             // Color to use when no texture is applied
+flat in int v_use_texture;   // Whether to use the texture or the flat color
 
 // Output color of the fragment (pixel)
 layout(location = 0) out vec4 fragColor;
 
 void main() {
-    // If use_texture is true, sample the color from the texture using the provided coordinates
-    if (use_texture) {
+    // If the quad uses the texture, sample the color from it using the provided coordinates
+    if (v_use_texture != 0) {
         fragColor = texture(tex, v_texture_coords);
-    } 
-    // Otherwise, use the specified uniform color
+    }
+    // Otherwise, use the quad's color
     else {
-        fragColor = color;
+        fragColor = v_color;
     }
-}
\ No newline at end of file
+}
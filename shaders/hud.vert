@@ -1,32 +1,33 @@
 #version 330 core
 
 // Uniforms:
-// Projection matrix used to convert world coordinates to screen space
+// Projection matrix used to convert screen coordinates to clip space
 uniform mat4 projection;
 
-// Position of the object in 2D screen space
-uniform vec2 position;
-
-// Size (scale) of the object
-uniform vec2 size;
-
-// Input attributes:
-// 2D vertex position of the quad (typically from -0.5 to 0.5 or 0.0 to 1.0)
+// Input attributes (one quad of the HUD batch is 6 vertices):
+// 2D vertex position in screen space (pixels)
 layout(location = 0) in vec2 in_position;
 
 // Texture coordinates associated with the vertex
 layout(location = 1) in vec2 in_texture_coords;
 
-// Output texture coordinates to pass to the fragment shader
+// Color of the quad when no texture is applied
+layout(location = 2) in vec4 in_color;
+
+// 1.0 if the quad samples the texture, 0.0 if it uses its color
+layout(location = 3) in float in_use_texture;
+
+// Outputs to the fragment shader
 out vec2 v_texture_coords;
+out vec4 v_color;
+flat out int v_use_texture;
 
 void main() {
-    // Scale and translate the vertex position based on size and position
-    vec2 pos = position + in_position * size;
-
     // Compute final vertex position in clip space
-    gl_Position = projection * vec4(pos, 0.0, 1.0);
+    gl_Position = projection * vec4(in_position, 0.0, 1.0);
 
-    // Pass the texture coordinates to the fragment shader
+    // Pass the quad attributes to the fragment shader
     v_texture_coords = in_texture_coords;
-}
\ No newline at end of file
+    v_color = in_color;
+    v_use_texture = int(in_use_texture);
+}
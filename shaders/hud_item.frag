@@ -0,0 +1,26 @@
+#version 330 core
+
+// Output color of the fragment
+layout(location = 0) out vec4 fragColor;
+
+// Texture sampler for texture array
+uniform sampler2DArray unit_texture_array;
+
+// Interpolated values from the vertex shader
+in vec2 uv;          // UV coordinates for sampling the texture
+in float shading;    // Shading intensity based on face
+
+flat in int voxel_id;  // Texture layer of the item
+flat in int face_id;   // Face direction index (0–5)
+
+void main()
+{
+    vec2 face_uv = uv;
+    face_uv.x = uv.x / 3.0 - min(face_id, 2) / 3.0;
+
+    // The texture array holds linear colors, shaded as they are
+    vec3 texture_color = texture(unit_texture_array, vec3(face_uv, voxel_id)).rgb;
+
+    // Encoded to sRGB by the framebuffer (see srcs/scene_framebuffer.py)
+    fragColor = vec4(texture_color * shading, 1.0);
+}
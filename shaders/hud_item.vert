@@ -0,0 +1,74 @@
+#version 330 core
+
+// Cube vertex, packed like the chunk vertices (see shaders/chunk.vert), without a voxel_id
+layout (location = 0) in uint packed_data;
+
+// Per-instance attributes (one instance per inventory slot)
+layout (location = 1) in mat4 in_model;    // Transformation of the cube in the HUD (4 locations)
+layout (location = 5) in uint in_voxel_id; // Block id of the item
+
+// Unpacked attributes
+int x, y, z;           // Vertex position (0 or 1)
+int ao_id;             // Ambient occlusion level (unused, always the brightest)
+int flip_id;           // Indicates flipped face for UV mapping (0 or 1)
+
+// Orthographic projection of the HUD (screen space)
+uniform mat4 projection;
+
+flat out int voxel_id; // Texture layer of the item
+flat out int face_id;  // Face direction index (0–5)
+
+// Outputs to the fragment shader
+out vec2 uv;           // UV coordinate for this vertex
+out float shading;     // Shading intensity based on face direction
+
+// Base shading per face direction (top, bottom, right, left, front, back)
+const float face_shading[6] = float[6](
+    1.0, 0.5,  // top, bottom
+    0.5, 0.8,  // right, left
+    0.5, 0.8   // front, back
+);
+
+// 4 UV coordinates for a quad (2 triangles per face)
+const vec2 uv_coords[4] = vec2[4](
+    vec2(0.0, 0.0),
+    vec2(0.0, 1.0),
+    vec2(1.0, 0.0),
+    vec2(1.0, 1.0)
+);
+
+// Index map to assign UV coordinates per triangle and face orientation
+// Handles both normal and flipped triangle winding
+const int uv_indices[24] = int[24](
+    1, 0, 2, 1, 2, 3, // even faces
+    3, 0, 2, 3, 1, 0, // odd faces
+    3, 1, 0, 3, 0, 2, // even flipped faces
+    1, 2, 3, 1, 0, 2  // odd flipped faces
+);
+
+// Unpack the packed data into individual components (same layout as the chunks)
+void unpack(uint packed_data)
+{
+    x = int(packed_data >> 26u);
+    y = int((packed_data >> 20u) & 63u);
+    z = int((packed_data >> 14u) & 63u);
+    face_id = int((packed_data >> 3u) & 7u);
+    ao_id = int((packed_data >> 1u) & 3u);
+    flip_id = int(packed_data & 1u);
+}
+
+void main()
+{
+    // Decode packed data
+    unpack(packed_data);
+    voxel_id = int(in_voxel_id);
+
+    // Compute UV index (see shaders/chunk.vert)
+    int uv_index = gl_VertexID % 6 + ((face_id & 1) + flip_id * 2) * 6;
+    uv = uv_coords[uv_indices[uv_index]];
+
+    // Directional shading, for a 3D effect
+    shading = face_shading[face_id];
+
+    gl_Position = projection * in_model * vec4(x, y, z, 1.0);
+}
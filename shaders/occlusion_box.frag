@@ -0,0 +1,6 @@
+#version 330 core
+
+// Nothing is written: the box is only drawn to count the samples passing the depth test
+void main(void)
+{
+}
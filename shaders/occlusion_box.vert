@@ -0,0 +1,22 @@
+#version 330 core
+
+// Unit cube vertex position (0 to 1 on each axis)
+layout (location = 0) in vec3 in_position;
+
+// Camera data shared by the 3D programs, written once per frame (see srcs/uniform_blocks.py)
+layout (std140) uniform Camera
+{
+    mat4 matrix_projection;  // Projection matrix (perspective)
+    mat4 matrix_view;        // View matrix (camera transformation)
+    float fog_density;       // Fog density of the chunks
+    float water_line;        // Height of the water surface
+};
+
+uniform vec3 box_min;            // World position of the box's lowest corner
+uniform vec3 box_size;           // Size of the box on each axis
+
+void main(void)
+{
+    // Stretch the unit cube over the tested box
+    gl_Position = matrix_projection * matrix_view * vec4(box_min + in_position * box_size, 1.0);
+}
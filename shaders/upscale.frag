@@ -0,0 +1,21 @@
+#version 330 core
+
+// Output color of the fragment (pixel)
+layout (location = 0) out vec4 fragColor;
+
+// Uniforms:
+// Color of the 3D scene, an sRGB texture decoded to linear when sampled
+uniform sampler2D unit_scene;
+// Texture coordinates of the last texel centers drawn this frame
+uniform vec2 uv_max;
+
+// Input texture coordinates interpolated from the vertex shader
+in vec2 uv;
+
+void main() {
+    // Keep the bilinear filter from blending in texels outside of the scene
+    vec3 color = texture(unit_scene, min(uv, uv_max)).rgb;
+
+    // Opaque, the scene replaces whatever was in the framebuffer
+    fragColor = vec4(color, 1.0);
+}
@@ -0,0 +1,17 @@
+#version 330 core
+
+// Uniforms:
+// Share of the scene texture the 3D scene was drawn into (bottom-left corner)
+uniform vec2 uv_scale;
+
+// Output to the fragment shader
+out vec2 uv;
+
+void main() {
+    // One triangle covering the whole screen, from the vertex index:
+    // (-1, -1), (3, -1), (-1, 3)
+    vec2 position = vec2((gl_VertexID & 1) * 4 - 1, (gl_VertexID >> 1) * 4 - 1);
+    gl_Position = vec4(position, 0.0, 1.0);
+
+    uv = (position * 0.5 + 0.5) * uv_scale;
+}
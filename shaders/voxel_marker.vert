@@ -6,8 +6,15 @@ layout (location = 0) in vec2 in_texture_coords; // 2D texture coordinates
 layout (location = 1) in vec3 in_position;       // 3D vertex position
 
 // Uniforms: global variables set from the CPU side (your application)
-uniform mat4 matrix_projection;  // Projection matrix (e.g., perspective)
-uniform mat4 matrix_view;        // View matrix (camera transformation)
+// Camera data shared by the 3D programs, written once per frame (see srcs/uniform_blocks.py)
+layout (std140) uniform Camera
+{
+    mat4 matrix_projection;  // Projection matrix (perspective)
+    mat4 matrix_view;        // View matrix (camera transformation)
+    float fog_density;       // Fog density of the chunks
+    float water_line;        // Height of the water surface
+};
+
 uniform mat4 matrix_model;       // Model matrix (object transformation)
 uniform uint mode_id;            // Marker mode ID, used to pick a color (0 or 1)
 
@@ -1,28 +1,25 @@
 #version 330 core
 
-layout (location = 0) in vec2 in_texture_coords; // UV coordinates for the quad
-layout (location = 1) in vec3 in_position;       // Vertex position (local)
+layout (location = 0) in vec2 in_position;      // World XZ position of the vertex
 
-uniform mat4 matrix_projection;                 // Projection matrix (perspective)
-uniform mat4 matrix_view;                       // View matrix (camera)
-uniform int water_area;                         // Controls water size (scaling factor)
-uniform float water_line;                       // Vertical height of water surface
+// Camera data shared by the 3D programs, written once per frame (see srcs/uniform_blocks.py)
+layout (std140) uniform Camera
+{
+    mat4 matrix_projection;  // Projection matrix (perspective)
+    mat4 matrix_view;        // View matrix (camera transformation)
+    float fog_density;       // Fog density of the chunks
+    float water_line;        // Height of the water surface
+};
 
 out vec2 uv;                                    // Pass texture coordinates to fragment shader
 
 void main(void)
 {
-    vec3 position = in_position;
-
-    // Scale and center the XZ coordinates to form a water plane
-    position.xz *= water_area;                  // Scale to match desired size
-    position.xz -= 0.33 * water_area;           // Offset to center the water area
-
-    // Raise Y position to water height level
-    position.y += water_line;
+    // The surface lies flat at the water height
+    vec3 position = vec3(in_position.x, water_line, in_position.y);
 
-    // Scale UVs to tile the texture over the water plane
-    uv = in_texture_coords * water_area;
+    // Tile the texture once per voxel over the water surface
+    uv = in_position;
 
     // Compute the final vertex position in clip space
     gl_Position = matrix_projection * matrix_view * vec4(position, 1.0);
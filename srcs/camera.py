@@ -1,7 +1,6 @@
 from typing import TYPE_CHECKING
 from glm import (
     vec3,
-    ivec3,
     radians,
     perspective,
     mat4,
@@ -12,7 +11,6 @@ from glm import (
     lookAt,
     clamp,
 )
-from math import floor
 
 from settings import (
     GO_THROUGH,
@@ -21,12 +19,10 @@ from settings import (
     NEAR,
     FAR,
     PITCH_LIMIT,
-    PLAYER_WIDTH,
-    PLAYER_HEIGHT,
-    PLAYER_DEPTH,
     EYE_HEIGHT,
-    COLLISION_OFFSET,
+    STEP_HEIGHT,
 )
+from srcs.collision import move_box
 from srcs.frustum import Frustum
 
 if TYPE_CHECKING:
@@ -41,7 +37,7 @@ class Camera:
     and view/projection matrix computation for rendering.
 
     It maintains local axes (`forward`, `right`, `up`) and updates them based on rotation.
-    The camera also supports Axis-Aligned Bounding Box (AABB) collision.
+    The camera also supports swept Axis-Aligned Bounding Box (AABB) collision.
     """
 
     def __init__(self, position: float, yaw: float, pitch: float) -> None:
@@ -75,12 +71,17 @@ class Camera:
         self.update_vectors()
         self.update_view_matrix()
 
+    @property
+    def eye_position(self) -> vec3:
+        """Position the world is seen from, eye height above the player's feet."""
+        return self.position + vec3(0, EYE_HEIGHT, 0)
+
     def update_view_matrix(self) -> None:
         """
         Recalculate the view matrix using the current position and orientation.
         Eye height is added to simulate a player's viewpoint.
         """
-        eye_position = self.position + vec3(0, EYE_HEIGHT, 0)
+        eye_position = self.eye_position
         self.matrix_view = lookAt(eye_position, eye_position + self.forward, self.up)
 
     def update_vectors(self) -> None:
@@ -114,80 +115,45 @@ class Camera:
         """
         self.yaw += delta_x
 
-    def is_position_valid(self, position: vec3) -> bool:
-        """
-        Check whether a player's bounding box (AABB) at the given position
-        collides with any solid voxel in the world.
-
-        Args:
-            position (vec3): Proposed new position.
-
-        Returns:
-            bool: True if position is valid (no collision), False otherwise.
-        """
-        min_x = position.x - PLAYER_WIDTH / 2
-        max_x = position.x + PLAYER_WIDTH / 2
-        min_y = position.y + COLLISION_OFFSET
-        max_y = position.y + PLAYER_HEIGHT
-        min_z = position.z - PLAYER_DEPTH / 2
-        max_z = position.z + PLAYER_DEPTH / 2
-
-        i_min, i_max = floor(min_x), floor(max_x)
-        j_min, j_max = floor(min_y), floor(max_y)
-        k_min, k_max = floor(min_z), floor(max_z)
-
-        for i in range(i_min, i_max + 1):
-            for j in range(j_min, j_max + 1):
-                for k in range(k_min, k_max + 1):
-                    if self.world.voxel_handler.get_voxel_id(ivec3(i, j, k))[0] != 0:
-                        return False
-        return True
-
     def move(
-        self, forward_velocity: float, right_velocity: float, up_velocity: float
-    ) -> None:
+        self,
+        forward_velocity: float,
+        right_velocity: float,
+        up_velocity: float,
+        fall_distance: float = 0.0,
+    ) -> int:
         """
-        Attempt to move the camera, handling sliding on blocked axes.
+        Move the camera by the combined movement of a tick, sliding along the
+        voxels it hits and walking up the ledges (see srcs/collision.py).
 
         Args:
             forward_velocity (float): Movement in the forward/backward direction.
             right_velocity (float): Movement in the right/left direction.
             up_velocity (float): Movement in the up/down direction.
+            fall_distance (float): Movement straight down, from the gravity.
+
+        Returns:
+            int: Contacts of the player's box after the move (CONTACT_* bits).
         """
         desired_movement = (
             self.forward * forward_velocity
             + self.right * right_velocity
             + self.up * up_velocity
         )
+        desired_movement.y -= fall_distance
 
-        new_position = self.position + desired_movement
-
-        if self.is_position_valid(new_position) or GO_THROUGH:
-            self.position = new_position
-            return
-
-        movement = vec3(0, 0, 0)
-
-        # Try X-axis
-        if desired_movement.x != 0:
-            x_position = self.position + vec3(desired_movement.x, 0, 0)
-            if self.is_position_valid(x_position):
-                movement.x = desired_movement.x
+        if GO_THROUGH:
+            self.position += desired_movement
+            return 0
 
-        # Try Y-axis
-        if desired_movement.y != 0:
-            y_position = self.position + vec3(0, desired_movement.y, 0)
-            if self.is_position_valid(y_position):
-                movement.y = desired_movement.y
-
-        # Try Z-axis
-        if desired_movement.z != 0:
-            z_position = self.position + vec3(0, 0, desired_movement.z)
-            if self.is_position_valid(z_position):
-                movement.z = desired_movement.z
-
-        # Apply allowed movement
-        self.position += movement
+        position, contacts = move_box(
+            self.world.voxels,
+            tuple(self.position),
+            tuple(desired_movement),
+            STEP_HEIGHT,
+        )
+        self.position = vec3(position)
+        return contacts
 
     # Movement convenience methods
     def move_forward(self, velocity: float) -> None:
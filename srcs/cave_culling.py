@@ -0,0 +1,194 @@
+from typing import TYPE_CHECKING
+from glm import ivec3
+from numba import njit
+from numpy import empty, ndarray, zeros
+
+from meshes.chunk_mesh_builder import get_chunk_index
+from settings import (
+    CHUNK_SIZE,
+    CHUNK_VOLUME,
+    WORLD_AREA,
+    WORLD_DEPTH,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+from srcs.chunk_table import CHUNK_FACES, get_chunk_position, get_pairs
+from srcs.voxel_layout import get_index
+
+if TYPE_CHECKING:
+    from srcs.chunk_table import ChunkTable
+    from srcs.frustum import Frustum
+
+
+@njit
+def get_face_connectivity(voxels: ndarray) -> int:
+    """
+    Flood fills the air of a chunk to find which of its faces are connected.
+
+    Only fills starting on the boundary of the chunk are needed, air pockets
+    that touch no face connect nothing.
+
+    Args:
+        voxels (ndarray): Voxels of the chunk
+
+    Returns:
+        int: Connectivity bits of the chunk
+    """
+    visited = zeros(CHUNK_VOLUME, dtype="bool")
+    stack = empty(CHUNK_VOLUME, dtype="int32")  # Packed x | y << 6 | z << 12
+    last = CHUNK_SIZE - 1
+    connectivity = 0
+
+    for x in range(CHUNK_SIZE):
+        for y in range(CHUNK_SIZE):
+            for z in range(CHUNK_SIZE):
+                if 0 < x < last and 0 < y < last and 0 < z < last:
+                    continue  # Not on the boundary
+
+                start = get_index(x, y, z)
+                if voxels[start] or visited[start]:
+                    continue
+
+                # Fill the air region and collect the faces it touches
+                visited[start] = True
+                stack[0] = x | y << 6 | z << 12
+                size = 1
+                faces = 0
+
+                while size:
+                    size -= 1
+                    packed = stack[size]
+                    vx, vy, vz = packed & 63, (packed >> 6) & 63, packed >> 12
+
+                    if vy == last:
+                        faces |= 1  # Top
+                    elif vy == 0:
+                        faces |= 2  # Bottom
+                    if vx == last:
+                        faces |= 4  # Right
+                    elif vx == 0:
+                        faces |= 8  # Left
+                    if vz == 0:
+                        faces |= 16  # Back
+                    elif vz == last:
+                        faces |= 32  # Front
+
+                    for face in range(6):
+                        dx, dy, dz = CHUNK_FACES[face][2]
+                        nx, ny, nz = vx + dx, vy + dy, vz + dz
+                        if not (
+                            0 <= nx < CHUNK_SIZE
+                            and 0 <= ny < CHUNK_SIZE
+                            and 0 <= nz < CHUNK_SIZE
+                        ):
+                            continue
+
+                        neighbor = get_index(nx, ny, nz)
+                        if voxels[neighbor] or visited[neighbor]:
+                            continue
+                        visited[neighbor] = True
+                        stack[size] = nx | ny << 6 | nz << 12
+                        size += 1
+
+                connectivity |= get_pairs(faces)
+
+    return connectivity
+
+
+@njit
+def traverse_chunks(in_frustum: ndarray, connectivity: ndarray, start: int) -> ndarray:
+    """
+    Breadth-first search through the chunks, from the camera's chunk.
+
+    A chunk is left through one of its faces only if that face is connected to the
+    face it was entered from, and the search never steps back towards the camera
+    (a direction is never followed after its opposite).
+
+    Args:
+        in_frustum (ndarray): (N,) True for the chunks inside the frustum
+        connectivity (ndarray): (N,) connectivity bits of the chunks
+        start (int): Index of the camera's chunk
+
+    Returns:
+        ndarray: (N,) True for the chunks reached by the search
+    """
+    reached = zeros(in_frustum.shape[0], dtype="bool")
+    queue = empty(in_frustum.shape[0], dtype="int32")
+    entries = empty(in_frustum.shape[0], dtype="int8")  # Face entered from, -1: start
+    directions = empty(in_frustum.shape[0], dtype="uint8")  # Faces stepped through
+    head, tail = 0, 1
+
+    reached[start] = True
+    queue[0], entries[0], directions[0] = start, -1, 0
+
+    while head < tail:
+        index, entry, steps = queue[head], entries[head], directions[head]
+        head += 1
+        x, y, z = get_chunk_position(index)
+
+        for face in range(6):
+            # Faces come in pairs (top/bottom, right/left, back/front)
+            if steps & (1 << (face ^ 1)):
+                continue
+            if entry != -1 and not connectivity[index] & (1 << (entry * 6 + face)):
+                continue
+
+            dx, dy, dz = CHUNK_FACES[face][2]
+            nx, ny, nz = x + dx, y + dy, z + dz
+            if not (
+                0 <= nx < WORLD_WIDTH
+                and 0 <= ny < WORLD_HEIGHT
+                and 0 <= nz < WORLD_DEPTH
+            ):
+                continue
+
+            neighbor = nx + WORLD_WIDTH * nz + WORLD_AREA * ny
+            if reached[neighbor] or not in_frustum[neighbor]:
+                continue
+
+            reached[neighbor] = True
+            queue[tail], entries[tail] = neighbor, face ^ 1
+            directions[tail] = steps | (1 << face)
+            tail += 1
+
+    return reached
+
+
+class CaveCulling:
+    """
+    Hides the chunks that cannot be seen through the air connecting their faces,
+    such as caves that never reach the surface.
+
+    Each chunk's face connectivity is computed by flood fill when its mesh is built
+    (until then all its faces with air are assumed connected), and the visible set
+    is found each frame by a search through that graph from the camera's chunk.
+    """
+
+    def __init__(self, table: "ChunkTable") -> None:
+        self.table = table
+
+    def get_reachable_chunks(self, frustum: "Frustum") -> ndarray:
+        """
+        Returns:
+            ndarray: (N,) True for the chunks that may be seen, or None when the
+                camera is outside the world
+        """
+        start = get_chunk_index(tuple(ivec3(frustum.camera.eye_position)))
+        if start == -1:
+            return None
+
+        # The search goes through the air of the chunks, test whole chunks
+        table = self.table
+        in_frustum = zeros(table.flags.shape[0], dtype="bool")
+        in_frustum[
+            frustum.cull(table.chunk_centers, table.chunk_radii, table.flags, 0)
+        ] = True
+
+        return traverse_chunks(in_frustum, table.connectivity, start)
+
+    def filter(self, visible_chunks: ndarray, frustum: "Frustum") -> ndarray:
+        """Keeps the visible chunks that can be reached from the camera's chunk."""
+        reachable = self.get_reachable_chunks(frustum)
+        if reachable is None:
+            return visible_chunks
+        return visible_chunks[reachable[visible_chunks]]
@@ -0,0 +1,346 @@
+from math import sqrt
+from numba import njit
+from numpy import full, maximum, minimum, ndarray, zeros
+
+from settings import (
+    CHUNK_SIZE,
+    CHUNK_SPHERE_RADIUS,
+    CHUNK_VOLUME,
+    WORLD_AREA,
+    WORLD_DEPTH,
+    WORLD_HEIGHT,
+    WORLD_VOLUME,
+    WORLD_WIDTH,
+)
+from srcs.voxel_layout import get_index
+
+# Bits of `ChunkTable.flags`
+CHUNK_EMPTY = 1  # The chunk has no solid voxel
+CHUNK_MESHED = 2  # The chunk's mesh has been built
+CHUNK_UNIFORM = 4  # Every voxel of the chunk has the same id (air included)
+CHUNK_ENCLOSED = 8  # Hidden by solid boundary layers (see `is_enclosed`)
+
+# Boundary layers of a chunk, in the face order of the mesher
+# (top, bottom, right, left, back, front): axis, layer and neighbor offset
+CHUNK_FACES = (
+    (1, CHUNK_SIZE - 1, (0, 1, 0)),
+    (1, 0, (0, -1, 0)),
+    (0, CHUNK_SIZE - 1, (1, 0, 0)),
+    (0, 0, (-1, 0, 0)),
+    (2, 0, (0, 0, -1)),
+    (2, CHUNK_SIZE - 1, (0, 0, 1)),
+)
+ALL_FACES = (1 << len(CHUNK_FACES)) - 1
+
+# Connectivity of a chunk: bit `a * 6 + b` is set when faces a and b are connected
+# through air inside the chunk (see `srcs/cave_culling.py`)
+ALL_CONNECTED = (1 << 36) - 1
+
+
+@njit
+def get_pairs(faces: int) -> int:
+    """Returns the connectivity where every pair of the given faces is connected."""
+    connectivity = 0
+    for a in range(6):
+        if not faces & (1 << a):
+            continue
+        for b in range(6):
+            if faces & (1 << b):
+                connectivity |= 1 << (a * 6 + b)
+    return connectivity
+
+
+@njit
+def get_open_connectivity(solid_faces: int) -> int:
+    """
+    Conservative connectivity of a chunk whose air was not flood filled yet:
+    all faces with an air voxel are assumed to be connected.
+    """
+    return get_pairs(ALL_FACES ^ solid_faces)
+
+
+@njit
+def is_layer_solid(voxels: ndarray, axis: int, layer: int) -> bool:
+    """
+    Checks if every voxel of a boundary layer of the chunk is solid.
+
+    Args:
+        voxels (ndarray): Voxels of the chunk
+        axis (int): Axis orthogonal to the layer (0: x, 1: y, 2: z)
+        layer (int): Coordinate of the layer along that axis
+
+    Returns:
+        bool: True if the layer has no air voxel
+    """
+    for u in range(CHUNK_SIZE):
+        for v in range(CHUNK_SIZE):
+            if axis == 0:
+                voxel_id = voxels[get_index(layer, u, v)]
+            elif axis == 1:
+                voxel_id = voxels[get_index(u, layer, v)]
+            else:
+                voxel_id = voxels[get_index(u, v, layer)]
+            if not voxel_id:
+                return False
+    return True
+
+
+@njit
+def get_solid_faces(voxels: ndarray) -> int:
+    """Returns the bit mask of the chunk's boundary layers that are fully solid."""
+    mask = 0
+    for face in range(len(CHUNK_FACES)):
+        axis, layer, _ = CHUNK_FACES[face]
+        if is_layer_solid(voxels, axis, layer):
+            mask |= 1 << face
+    return mask
+
+
+@njit
+def summarize_voxels(voxels: ndarray) -> tuple:
+    """
+    Scans the voxels of a chunk once.
+
+    Args:
+        voxels (ndarray): Voxels of the chunk
+
+    Returns:
+        tuple: Solid voxel count, min (x, y, z) and max (x, y, z) of the solid voxels
+            (CHUNK_SIZE and -1 for an empty chunk), and whether all voxels are equal
+    """
+    count = 0
+    min_x = min_y = min_z = CHUNK_SIZE
+    max_x = max_y = max_z = -1
+    first_id = voxels[0]
+    is_uniform = True
+
+    for x in range(CHUNK_SIZE):
+        for y in range(CHUNK_SIZE):
+            for z in range(CHUNK_SIZE):
+                voxel_id = voxels[get_index(x, y, z)]
+                if voxel_id != first_id:
+                    is_uniform = False
+                if not voxel_id:
+                    continue
+
+                count += 1
+                min_x, max_x = min(min_x, x), max(max_x, x)
+                min_y, max_y = min(min_y, y), max(max_y, y)
+                min_z, max_z = min(min_z, z), max(max_z, z)
+
+    return count, (min_x, min_y, min_z), (max_x, max_y, max_z), is_uniform
+
+
+@njit
+def get_chunk_position(index: int) -> tuple:
+    """Inverse of the chunk index `x + WORLD_WIDTH * z + WORLD_AREA * y`."""
+    y, rest = divmod(index, WORLD_AREA)
+    z, x = divmod(rest, WORLD_WIDTH)
+    return x, y, z
+
+
+@njit
+def is_enclosed(solid_faces: ndarray, index: int) -> bool:
+    """
+    Checks if a chunk is hidden by its neighbors: its six boundary layers are solid
+    and so is the facing layer of each neighbor (the world's edge counts as solid).
+    The chunk may still have caves inside, they can only be seen from within.
+    """
+    if solid_faces[index] != ALL_FACES:
+        return False
+
+    x, y, z = get_chunk_position(index)
+    for face in range(len(CHUNK_FACES)):
+        dx, dy, dz = CHUNK_FACES[face][2]
+        nx, ny, nz = x + dx, y + dy, z + dz
+        if not (
+            0 <= nx < WORLD_WIDTH and 0 <= ny < WORLD_HEIGHT and 0 <= nz < WORLD_DEPTH
+        ):
+            continue
+
+        # Faces come in pairs (top/bottom, right/left, back/front)
+        opposite = face ^ 1
+        neighbor = nx + WORLD_WIDTH * nz + WORLD_AREA * ny
+        if not solid_faces[neighbor] & (1 << opposite):
+            return False
+    return True
+
+
+class ChunkTable:
+    """
+    Structure-of-arrays view of the world's chunks, indexed like `World.chunks`.
+
+    Per-frame passes over every chunk (such as frustum culling) read these
+    contiguous arrays in compiled kernels instead of walking the `Chunk` objects.
+
+    It also holds a summary of each chunk's voxels (solid count, bounds of the solid
+    voxels, solid boundary layers), computed when the chunk is generated and kept up
+    to date on every voxel edit.
+    """
+
+    def __init__(self) -> None:
+        # Position of each chunk's first voxel in the world
+        self.origins = zeros((WORLD_VOLUME, 3), dtype="float32")
+
+        # Bounding sphere of each whole chunk, air included
+        self.chunk_centers = zeros((WORLD_VOLUME, 3), dtype="float32")
+        self.chunk_radii = full(WORLD_VOLUME, CHUNK_SPHERE_RADIUS, dtype="float32")
+
+        # Bounding sphere of each chunk, fitted to its solid voxels
+        self.centers = zeros((WORLD_VOLUME, 3), dtype="float32")
+        self.radii = full(WORLD_VOLUME, CHUNK_SPHERE_RADIUS, dtype="float32")
+
+        self.flags = full(WORLD_VOLUME, CHUNK_EMPTY | CHUNK_UNIFORM, dtype="uint8")
+
+        # Summary of the voxels of each chunk
+        self.solid_counts = zeros(WORLD_VOLUME, dtype="int32")
+        self.bounds_min = full((WORLD_VOLUME, 3), CHUNK_SIZE, dtype="int32")
+        self.bounds_max = full((WORLD_VOLUME, 3), -1, dtype="int32")
+        self.solid_faces = zeros(WORLD_VOLUME, dtype="uint8")  # Bit per CHUNK_FACES
+
+        # Faces connected through air
+        self.connectivity = full(WORLD_VOLUME, ALL_CONNECTED, dtype="int64")
+
+        # Number of voxel edits of each chunk, to tell if cached results are stale
+        self.versions = zeros(WORLD_VOLUME, dtype="uint32")
+
+    def set_flag(self, index: int, flag: int, value: bool) -> None:
+        if value:
+            self.flags[index] |= flag
+        else:
+            self.flags[index] &= 0xFF ^ flag
+
+    def has_flag(self, index: int, flag: int) -> bool:
+        return bool(self.flags[index] & flag)
+
+    def set_origin(self, index: int, origin: tuple) -> None:
+        self.origins[index] = origin
+        self.chunk_centers[index] = self.origins[index] + CHUNK_SIZE * 0.5
+        self.update_sphere(index)
+
+    def get_bounds(self, index: int) -> tuple:
+        """
+        Returns:
+            tuple: Min (x, y, z) and max (x, y, z) local coordinates of the solid
+                voxels of the chunk, both inclusive
+        """
+        return tuple(self.bounds_min[index]), tuple(self.bounds_max[index])
+
+    def update_sphere(self, index: int) -> None:
+        """Fits the chunk's bounding sphere to the bounds of its solid voxels."""
+        if not self.solid_counts[index]:
+            # Never tested while the chunk is empty, keep the whole chunk
+            self.centers[index] = self.chunk_centers[index]
+            self.radii[index] = CHUNK_SPHERE_RADIUS
+            return
+
+        low = self.bounds_min[index]
+        size = self.bounds_max[index] + 1 - low
+        self.centers[index] = self.origins[index] + low + size * 0.5
+        self.radii[index] = 0.5 * sqrt(float((size * size).sum()))
+
+    def set_summary(self, index: int, voxels: ndarray) -> None:
+        """
+        Computes the summary of a chunk from all its voxels.
+        `update_enclosed` must be called once the neighbors are summarized too.
+        """
+        count, low, high, is_uniform = summarize_voxels(voxels)
+        self.solid_counts[index] = count
+        self.bounds_min[index] = low
+        self.bounds_max[index] = high
+        self.solid_faces[index] = get_solid_faces(voxels)
+        self.reset_connectivity(index)
+
+        self.set_flag(index, CHUNK_EMPTY, count == 0)
+        self.set_flag(index, CHUNK_UNIFORM, is_uniform)
+        self.update_sphere(index)
+
+    def set_voxel(
+        self, index: int, voxels: ndarray, position: tuple, old_id: int, new_id: int
+    ) -> None:
+        """
+        Updates the summary of a chunk after one of its voxels changed.
+        `voxels` must already hold the new voxel id.
+
+        Args:
+            index (int): Index of the chunk
+            voxels (ndarray): Voxels of the chunk
+            position (tuple): Local position of the voxel
+            old_id (int): Previous voxel id
+            new_id (int): New voxel id
+        """
+        self.versions[index] += 1
+
+        if bool(old_id) == bool(new_id):
+            # The occupancy stays the same, only a filled chunk can change uniformity
+            if self.solid_counts[index] == CHUNK_VOLUME:
+                self.set_flag(index, CHUNK_UNIFORM, summarize_voxels(voxels)[3])
+            return
+
+        # Boundary layers of the chunk holding the voxel
+        x, y, z = position
+        faces = [
+            face
+            for face, (axis, layer, _) in enumerate(CHUNK_FACES)
+            if (x, y, z)[axis] == layer
+        ]
+
+        if new_id:
+            count = self.solid_counts[index] = self.solid_counts[index] + 1
+            self.bounds_min[index] = minimum(self.bounds_min[index], (x, y, z))
+            self.bounds_max[index] = maximum(self.bounds_max[index], (x, y, z))
+
+            # Only the layers holding the voxel can become solid
+            for face in faces:
+                axis, layer, _ = CHUNK_FACES[face]
+                if is_layer_solid(voxels, axis, layer):
+                    self.solid_faces[index] |= 1 << face
+
+            # A filled chunk is uniform only if all its voxels have the same id
+            is_uniform = count == CHUNK_VOLUME and summarize_voxels(voxels)[3]
+        else:
+            count = self.solid_counts[index] = self.solid_counts[index] - 1
+
+            # The bounds can only shrink if the voxel was on one of their sides
+            min_x, min_y, min_z = self.bounds_min[index]
+            max_x, max_y, max_z = self.bounds_max[index]
+            if x in (min_x, max_x) or y in (min_y, max_y) or z in (min_z, max_z):
+                _, low, high, _ = summarize_voxels(voxels)
+                self.bounds_min[index] = low
+                self.bounds_max[index] = high
+
+            for face in faces:
+                self.solid_faces[index] &= 0xFF ^ (1 << face)
+
+            is_uniform = count == 0
+
+        self.set_flag(index, CHUNK_EMPTY, count == 0)
+        self.set_flag(index, CHUNK_UNIFORM, is_uniform)
+        self.update_sphere(index)
+
+        # Exact again once the chunk's mesh is rebuilt
+        self.reset_connectivity(index)
+
+        # A change of the boundary layers also affects the neighbors
+        if faces:
+            self.update_enclosed(index)
+            cx, cy, cz = get_chunk_position(index)
+            for face in faces:
+                dx, dy, dz = CHUNK_FACES[face][2]
+                nx, ny, nz = cx + dx, cy + dy, cz + dz
+                if (
+                    0 <= nx < WORLD_WIDTH
+                    and 0 <= ny < WORLD_HEIGHT
+                    and 0 <= nz < WORLD_DEPTH
+                ):
+                    self.update_enclosed(nx + WORLD_WIDTH * nz + WORLD_AREA * ny)
+
+    def reset_connectivity(self, index: int) -> None:
+        """Assumes that all the faces of the chunk with air are connected."""
+        self.connectivity[index] = get_open_connectivity(self.solid_faces[index])
+
+    def update_enclosed(self, index: int = None) -> None:
+        """Updates the CHUNK_ENCLOSED flag of one chunk, or of all chunks."""
+        indices = range(WORLD_VOLUME) if index is None else (index,)
+        for i in indices:
+            self.set_flag(i, CHUNK_ENCLOSED, is_enclosed(self.solid_faces, i))
@@ -0,0 +1,203 @@
+from math import ceil, floor
+from numba import njit
+from numpy import array, ndarray
+
+from settings import (
+    CHUNK_SIZE,
+    COLLISION_OFFSET,
+    PLAYER_DEPTH,
+    PLAYER_HEIGHT,
+    PLAYER_WIDTH,
+    WORLD_AREA,
+    WORLD_DEPTH,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+from srcs.voxel_layout import get_index
+
+# Bits of the contacts returned by `move_box`
+CONTACT_GROUND = 1  # Standing on a solid voxel
+CONTACT_CEILING = 2  # Stopped by a solid voxel above
+CONTACT_WALL_X = 4  # Stopped by a solid voxel along X
+CONTACT_WALL_Z = 8  # Stopped by a solid voxel along Z
+
+# Gap (in voxels) kept between the box and the voxels it is stopped by, so that
+# rounding never puts it inside them
+SKIN = 0.001
+
+# Distance (in voxels) under the box where a solid voxel counts as ground
+GROUND_PROBE = 0.01
+
+
+@njit
+def get_voxel(world_voxels: ndarray, x: int, y: int, z: int) -> int:
+    """Returns the id of a voxel from its world position, 0 outside the world."""
+    cx, cy, cz = x // CHUNK_SIZE, y // CHUNK_SIZE, z // CHUNK_SIZE
+    if not (0 <= cx < WORLD_WIDTH and 0 <= cy < WORLD_HEIGHT and 0 <= cz < WORLD_DEPTH):
+        return 0
+    chunk_index = cx + WORLD_WIDTH * cz + WORLD_AREA * cy
+    return world_voxels[
+        chunk_index,
+        get_index(x - cx * CHUNK_SIZE, y - cy * CHUNK_SIZE, z - cz * CHUNK_SIZE),
+    ]
+
+
+@njit
+def is_layer_blocked(
+    world_voxels: ndarray,
+    box_min: ndarray,
+    box_max: ndarray,
+    axis: int,
+    layer: int,
+) -> bool:
+    """
+    Checks if a layer of voxels has a solid one under the box's cross-section.
+
+    Args:
+        world_voxels (ndarray): Voxels of every chunk of the world
+        box_min (ndarray): Min corner of the box
+        box_max (ndarray): Max corner of the box
+        axis (int): Axis orthogonal to the layer (0: x, 1: y, 2: z)
+        layer (int): Coordinate of the layer along that axis
+    """
+    # The two other axes, and the voxels the box overlaps on them
+    u, v = (axis + 1) % 3, (axis + 2) % 3
+    position = [0, 0, 0]
+    position[axis] = layer
+    for i in range(floor(box_min[u]), ceil(box_max[u])):
+        position[u] = i
+        for j in range(floor(box_min[v]), ceil(box_max[v])):
+            position[v] = j
+            if get_voxel(world_voxels, position[0], position[1], position[2]):
+                return True
+    return False
+
+
+@njit
+def sweep_axis(
+    world_voxels: ndarray,
+    box_min: ndarray,
+    box_max: ndarray,
+    axis: int,
+    distance: float,
+) -> float:
+    """
+    Moves a box along one axis, up to the first solid voxel in its way.
+    Every layer of voxels crossed is tested, so no move is long enough to go
+    through a voxel. The voxels the box already overlaps are ignored, so that a
+    box stuck in them can still get out.
+
+    Args:
+        world_voxels (ndarray): Voxels of every chunk of the world
+        box_min (ndarray): Min corner of the box, moved in place
+        box_max (ndarray): Max corner of the box, moved in place
+        axis (int): Axis of the move (0: x, 1: y, 2: z)
+        distance (float): Length of the move, signed
+
+    Returns:
+        float: Length of the move done, of the sign of `distance` (or 0)
+    """
+    if distance > 0.0:
+        for layer in range(ceil(box_max[axis]), ceil(box_max[axis] + distance)):
+            if is_layer_blocked(world_voxels, box_min, box_max, axis, layer):
+                distance = max(layer - SKIN - box_max[axis], 0.0)
+                break
+    elif distance < 0.0:
+        for layer in range(
+            floor(box_min[axis]) - 1, floor(box_min[axis] + distance) - 1, -1
+        ):
+            if is_layer_blocked(world_voxels, box_min, box_max, axis, layer):
+                distance = min(layer + 1 + SKIN - box_min[axis], 0.0)
+                break
+
+    box_min[axis] += distance
+    box_max[axis] += distance
+    return distance
+
+
+@njit
+def sweep_horizontal(
+    world_voxels: ndarray, box_min: ndarray, box_max: ndarray, dx: float, dz: float
+) -> tuple:
+    """
+    Moves a box along X then along Z, sliding along the walls.
+
+    Returns:
+        tuple: Length of the move done along X and along Z, and the wall contacts
+    """
+    contacts = 0
+    moved_x = sweep_axis(world_voxels, box_min, box_max, 0, dx)
+    if moved_x != dx:
+        contacts |= CONTACT_WALL_X
+    moved_z = sweep_axis(world_voxels, box_min, box_max, 2, dz)
+    if moved_z != dz:
+        contacts |= CONTACT_WALL_Z
+    return moved_x, moved_z, contacts
+
+
+@njit
+def move_box(
+    world_voxels: ndarray, position: tuple, movement: tuple, step_height: float
+) -> tuple:
+    """
+    Moves the player's box by the movement of a whole tick, against the voxels of
+    the world: it slides along the voxels it hits, and walks up the ledges up to
+    `step_height` high while on the ground.
+
+    Args:
+        world_voxels (ndarray): Voxels of every chunk of the world
+        position (tuple): Position of the player's feet
+        movement (tuple): Movement of the tick, gravity included
+        step_height (float): Height of the highest ledge walked up, 0 to disable
+
+    Returns:
+        tuple: New position of the player's feet, and its contacts (CONTACT_*)
+    """
+    x, y, z = position
+    dx, dy, dz = movement
+    half_width, half_depth = PLAYER_WIDTH * 0.5, PLAYER_DEPTH * 0.5
+    box_min = array([x - half_width, y + COLLISION_OFFSET, z - half_depth])
+    box_max = array([x + half_width, y + PLAYER_HEIGHT, z + half_depth])
+
+    # On the ground before moving: the ledges can be walked up
+    probe_min, probe_max = box_min.copy(), box_max.copy()
+    grounded = sweep_axis(world_voxels, probe_min, probe_max, 1, -GROUND_PROBE) != (
+        -GROUND_PROBE
+    )
+
+    contacts = 0
+    moved_y = sweep_axis(world_voxels, box_min, box_max, 1, dy)
+    if moved_y != dy and dy > 0.0:
+        contacts |= CONTACT_CEILING
+    elif moved_y != dy:
+        grounded = True
+
+    start_min, start_max = box_min.copy(), box_max.copy()
+    moved_x, moved_z, walls = sweep_horizontal(world_voxels, box_min, box_max, dx, dz)
+
+    if walls and grounded and step_height > 0.0:
+        # Try the move again from `step_height` higher, then back down on the ledge
+        step_min, step_max = start_min, start_max
+        raised = sweep_axis(world_voxels, step_min, step_max, 1, step_height)
+        step_x, step_z, step_walls = sweep_horizontal(
+            world_voxels, step_min, step_max, dx, dz
+        )
+        sweep_axis(world_voxels, step_min, step_max, 1, -raised)
+
+        if step_x * step_x + step_z * step_z > moved_x * moved_x + moved_z * moved_z:
+            box_min, box_max, walls = step_min, step_max, step_walls
+    contacts |= walls
+
+    # On the ground after moving
+    probe_min, probe_max = box_min.copy(), box_max.copy()
+    if sweep_axis(world_voxels, probe_min, probe_max, 1, -GROUND_PROBE) != (
+        -GROUND_PROBE
+    ):
+        contacts |= CONTACT_GROUND
+
+    new_position = (
+        (box_min[0] + box_max[0]) * 0.5,
+        box_min[1] - COLLISION_OFFSET,
+        (box_min[2] + box_max[2]) * 0.5,
+    )
+    return new_position, contacts
@@ -0,0 +1,95 @@
+from typing import TYPE_CHECKING
+from glm import distance2, vec3
+from numba import njit
+from numpy import empty, ndarray, sqrt, zeros
+
+from settings import DRAW_ORDER_BUCKET_SIZE
+
+if TYPE_CHECKING:
+    from srcs.chunk_table import ChunkTable
+
+
+@njit
+def get_distance_keys(centers: ndarray, eye: tuple, bucket_size: float) -> ndarray:
+    """
+    Returns the distance bucket of every chunk: the distance from the eye
+    to the chunk's center, divided by the bucket size and rounded down.
+    """
+    ex, ey, ez = eye
+    keys = empty(centers.shape[0], dtype="int32")
+    for i in range(centers.shape[0]):
+        dx = centers[i, 0] - ex
+        dy = centers[i, 1] - ey
+        dz = centers[i, 2] - ez
+        keys[i] = int(sqrt(dx * dx + dy * dy + dz * dz) / bucket_size)
+    return keys
+
+
+@njit
+def bucket_sort(indices: ndarray, keys: ndarray, bucket_count: int) -> ndarray:
+    """
+    Sorts chunk indices by their distance bucket (counting sort).
+    Chunks of the same bucket keep their relative order.
+
+    Args:
+        indices (ndarray): Indices of the chunks to sort
+        keys (ndarray): Distance bucket of every chunk of the world
+        bucket_count (int): Number of buckets (greater than every key)
+
+    Returns:
+        ndarray: The indices, nearest bucket first
+    """
+    starts = zeros(bucket_count + 1, dtype="int32")
+    for index in indices:
+        starts[keys[index] + 1] += 1
+    for bucket in range(bucket_count):
+        starts[bucket + 1] += starts[bucket]
+
+    ordered = empty(indices.shape[0], dtype=indices.dtype)
+    for index in indices:
+        key = keys[index]
+        ordered[starts[key]] = index
+        starts[key] += 1
+    return ordered
+
+
+class DrawOrder:
+    """
+    Sorts the visible chunks coarsely front to back, so that the depth test
+    rejects the fragments hidden by nearer chunks before they are shaded.
+
+    The distance buckets of all chunks are only recomputed when the eye moved by
+    more than half a bucket since the last time; every other frame only runs
+    the counting sort of the visible chunks over the cached buckets.
+    """
+
+    def __init__(self, table: "ChunkTable") -> None:
+        self.table = table
+
+        self.keys: ndarray = None  # Distance bucket of every chunk
+        self.bucket_count = 0
+        self.keys_eye: vec3 = None  # Eye position the buckets were computed from
+
+    def update_keys(self, eye: vec3) -> None:
+        """Recomputes the distance buckets if the eye moved too far."""
+        threshold = DRAW_ORDER_BUCKET_SIZE * 0.5
+        if self.keys_eye is not None and distance2(eye, self.keys_eye) < threshold**2:
+            return
+
+        self.keys = get_distance_keys(
+            self.table.centers, tuple(eye), DRAW_ORDER_BUCKET_SIZE
+        )
+        self.bucket_count = int(self.keys.max()) + 1
+        self.keys_eye = vec3(eye)
+
+    def sort(self, visible_chunks: ndarray, eye: vec3) -> ndarray:
+        """
+        Args:
+            visible_chunks (ndarray): Indices of the chunks to draw
+            eye (vec3): Position of the camera
+
+        Returns:
+            ndarray: The same indices, nearest first
+        """
+        self.update_keys(eye)
+        return bucket_sort(visible_chunks, self.keys, self.bucket_count)
@@ -0,0 +1,78 @@
+from contextlib import contextmanager
+from math import sqrt
+from typing import TYPE_CHECKING, Iterator
+from moderngl import Query
+
+from settings import (
+    DYNAMIC_RESOLUTION,
+    MIN_RESOLUTION_SCALE,
+    RESOLUTION_TARGET_TIME,
+)
+
+if TYPE_CHECKING:
+    from srcs.engine import Engine
+
+
+# Frames a timer query is given before its result is read, so that reading it
+# never waits for the GPU to catch up
+QUERY_LATENCY = 3
+
+# Weight of the newest measure in the smoothed GPU time
+SMOOTHING = 0.1
+
+# The scale is only lowered above the target time, and raised below this share of it
+HEADROOM = 0.8
+
+# Largest change of the scale in one frame
+MAX_SCALE_STEP = 0.02
+
+
+class DynamicResolution:
+    """
+    Picks the resolution the 3D scene is drawn at from the time the GPU spends on
+    it, so that fill-rate bound views (water, fog in the distance) keep the frame
+    rate instead of the resolution.
+
+    The time is measured with timer queries rather than the frame time: with vsync
+    the CPU waits on the swap the same time whatever the GPU load. Each query is
+    read QUERY_LATENCY frames later, once the GPU is done with it.
+    """
+
+    def __init__(self, game: "Engine") -> None:
+        self.game = game
+        self.context = game.context
+        self.framebuffer = game.framebuffer
+
+        self.queries: list[Query] = [
+            self.context.query(time=True) for _ in range(QUERY_LATENCY)
+        ]
+        self.frame = 0  # Frames measured so far
+        self.gpu_time = RESOLUTION_TARGET_TIME  # Smoothed, in milliseconds
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """Measures the GPU time of the passes drawn inside the `with` block."""
+        with self.queries[self.frame % QUERY_LATENCY]:
+            yield
+        self.frame += 1
+
+    def update(self) -> None:
+        """Reads the oldest measure and updates the scale of the scene."""
+        if not DYNAMIC_RESOLUTION or self.frame < QUERY_LATENCY:
+            return
+
+        # The oldest query, ended QUERY_LATENCY - 1 frames ago
+        elapsed = self.queries[self.frame % QUERY_LATENCY].elapsed * 1e-6
+        self.gpu_time += (elapsed - self.gpu_time) * SMOOTHING
+
+        # The time is about proportional to the pixel count, the square of the scale
+        if self.gpu_time > RESOLUTION_TARGET_TIME:
+            target = RESOLUTION_TARGET_TIME
+        elif self.gpu_time < RESOLUTION_TARGET_TIME * HEADROOM:
+            target = RESOLUTION_TARGET_TIME * HEADROOM
+        else:
+            return
+        scale = self.framebuffer.scale
+        wanted = scale * sqrt(target / max(self.gpu_time, 1e-3))
+        wanted = min(max(wanted, scale - MAX_SCALE_STEP), scale + MAX_SCALE_STEP)
+        self.framebuffer.scale = min(max(wanted, MIN_RESOLUTION_SCALE), 1.0)
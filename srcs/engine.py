@@ -37,9 +37,13 @@ from sys import exit
 from objects.inventory import Inventory
 from objects.texturing import SKYBOX_COLOR
 from settings import WINDOW_RESOLUTION, WINDOW_TITLE
+from srcs.dynamic_resolution import DynamicResolution
+from srcs.gpu_resources import GPUResources
 from srcs.mixer import Mixer
 from srcs.player import Player
+from srcs.quality_governor import QualityGovernor
 from srcs.scene import Scene
+from srcs.scene_framebuffer import SceneFramebuffer
 from srcs.shader import Shader
 from srcs.textures import Textures
 from srcs.utils import hide_cursor, show_cursor
@@ -77,9 +81,9 @@ class Engine:
         self.context.enable(
             flags=DEPTH_TEST | CULL_FACE | BLEND
         )  # correctly (depth), efficiently (culling), beautifully (blending)
-        self.context.gc_mode = (
-            "auto"  # automatic garbage collection to prevent memory leaks
-        )
+        # Explicit owner of the vertex buffers and vertex arrays of the meshes, they
+        # are released by it instead of by moderngl's garbage collection
+        self.gpu_resources = GPUResources(self.context)
 
         self.clock = time.Clock()
         self.delta_time = 0.0
@@ -87,6 +91,7 @@ class Engine:
         self.is_running = True
 
         self.shading_mode = 2
+        self.max_shading_mode = 2  # Lowered by the quality governor
         self.textures_enabled = True
 
         self.on_init()
@@ -110,13 +115,28 @@ class Engine:
         self.player = Player(self)
         self.inventory = Inventory(self)
         self.shader = Shader(self)
+        # The frame is rendered offscreen into sRGB, then copied to the window
+        self.framebuffer = SceneFramebuffer(self)
+        self.dynamic_resolution = DynamicResolution(self)
         self.scene = Scene(self)
         self.mixer = Mixer()
+        self.quality_governor = QualityGovernor(self)
 
         self.player.on_init()
 
-        self.shader.chunk["shading_mode"].value = self.shading_mode
-        self.shader.chunk["textures_enabled"].value = self.textures_enabled
+    def get_shading_mode(self) -> int:
+        """Returns the shading mode in use, capped by the quality governor."""
+        return min(self.shading_mode, self.max_shading_mode)
+
+    def update_chunk_variant(self) -> None:
+        """Switches the chunk program to the shading mode and texturing in use."""
+        current = self.shader.chunk
+        program = self.shader.use_chunk_variant(
+            self.get_shading_mode(), self.textures_enabled
+        )
+        # The vertex arrays of the arena are only created again for a new program
+        if program is not current:
+            self.scene.world.mesh_arena.set_shader(program)
 
     def update(self) -> None:
         self.player.update()
@@ -124,13 +144,23 @@ class Engine:
         self.scene.update()
 
         self.delta_time = self.clock.tick()
+        self.quality_governor.update(self.delta_time)
         self.time = time.get_ticks() * 0.001
         display.set_caption(f"{WINDOW_TITLE} - {self.clock.get_fps():.0f}fps")
 
     def render(self) -> None:
-        self.context.clear(color=SKYBOX_COLOR)
-        self.scene.render()
+        # The 3D scene at the resolution picked by the dynamic resolution
+        self.framebuffer.use(color=SKYBOX_COLOR)
+        with self.dynamic_resolution.measure():
+            self.scene.render()
+
+        # Then the HUD over it, at the window's resolution
+        self.framebuffer.upscale()
+        self.scene.render_hud()
+
+        self.framebuffer.present()
         display.flip()
+        self.dynamic_resolution.update()
 
     def handle_events(self) -> None:
         for e in event.get():
@@ -146,10 +176,10 @@ class Engine:
             if e.type == KEYDOWN:
                 if e.key == K_h:
                     self.shading_mode = (self.shading_mode - 1) % 3
-                    self.shader.chunk["shading_mode"].value = self.shading_mode
+                    self.update_chunk_variant()
                 elif e.key == K_t:
                     self.textures_enabled = not self.textures_enabled
-                    self.shader.chunk["textures_enabled"].value = self.textures_enabled
+                    self.update_chunk_variant()
                 if e.key == K_1:
                     self.inventory.select_slot(0)
                 elif e.key == K_2:
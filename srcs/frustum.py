@@ -1,13 +1,93 @@
 from typing import TYPE_CHECKING
-from glm import dot
+from glm import ivec3
 from math import cos, tan
+from numba import njit
+from numpy import append, empty, ndarray
 
-from objects.chunk import Chunk
-from settings import CHUNK_SPHERE_RADIUS, FAR, HORIZONTAL_FOV, NEAR, VERTICAL_FOV
+from meshes.chunk_mesh_builder import get_chunk_index
+from settings import (
+    HORIZONTAL_FOV,
+    NEAR,
+    RENDER_DISTANCE,
+    VERTICAL_FOV,
+)
+from srcs.chunk_table import CHUNK_EMPTY, CHUNK_ENCLOSED
 
 
 if TYPE_CHECKING:
     from srcs.camera import Camera
+    from srcs.chunk_table import ChunkTable
+
+
+@njit
+def cull_spheres(
+    centers: ndarray,
+    radii: ndarray,
+    flags: ndarray,
+    skip_flags: int,
+    position: tuple,
+    forward: tuple,
+    up: tuple,
+    right: tuple,
+    planes: tuple,
+) -> ndarray:
+    """
+    Tests every bounding sphere against the view frustum in one pass.
+
+    Args:
+        centers (ndarray): (N, 3) sphere centers
+        radii (ndarray): (N,) sphere radii
+        flags (ndarray): (N,) flags of each sphere
+        skip_flags (int): Spheres with any of these flags set are skipped
+        position (tuple): Camera position
+        forward (tuple): Camera forward vector
+        up (tuple): Camera up vector
+        right (tuple): Camera right vector
+        planes (tuple): (near, far, factor_x, tan_x, factor_y, tan_y)
+
+    Returns:
+        ndarray: Indices of the spheres inside the frustum, in increasing order
+    """
+    near, far, factor_x, tan_x, factor_y, tan_y = planes
+    px, py, pz = position
+    fx, fy, fz = forward
+    ux, uy, uz = up
+    rx, ry, rz = right
+
+    visible = empty(centers.shape[0], dtype="int32")
+    count = 0
+
+    for i in range(centers.shape[0]):
+        if flags[i] & skip_flags:
+            continue
+
+        # Vector from camera to sphere center
+        vx = centers[i, 0] - px
+        vy = centers[i, 1] - py
+        vz = centers[i, 2] - pz
+        radius = radii[i]
+
+        # Between the NEAR plane and the distance where the fog becomes opaque
+        sz = vx * fx + vy * fy + vz * fz
+        if not (near - radius <= sz <= far + radius):
+            continue
+
+        # Between the TOP and BOTTOM planes
+        sy = vx * ux + vy * uy + vz * uz
+        distance = factor_y * radius + sz * tan_y
+        if not (-distance <= sy <= distance):
+            continue
+
+        # Between the LEFT and RIGHT planes
+        sx = vx * rx + vy * ry + vz * rz
+        distance = factor_x * radius + sz * tan_x
+        if not (-distance <= sx <= distance):
+            continue
+
+        visible[count] = i
+        count += 1
+
+    return visible[:count]
 
 
 class Frustum:
@@ -21,25 +101,49 @@ class Frustum:
         self.factor_y = 1.0 / cos(half_y := VERTICAL_FOV * 0.5)
         self.tan_y = tan(half_y)
 
-    def is_on_frustum(self, chunk: "Chunk") -> bool:
-        # Vector from camera to chunk center
-        sphere_vector = chunk.center - self.camera.position
-
-        # Check if the chunk's bounding sphere is between the NEAR and FAR clipping planes
-        sz = dot(sphere_vector, self.camera.forward)
-        if not (NEAR - CHUNK_SPHERE_RADIUS <= sz <= FAR + CHUNK_SPHERE_RADIUS):
-            return False  # Too close or too far
+        # Where the fog becomes opaque, lowered by the quality governor
+        self.render_distance = RENDER_DISTANCE
 
-        # Check against TOP and BOTTOM planes
-        sy = dot(sphere_vector, self.camera.up)
-        distance = self.factor_y * CHUNK_SPHERE_RADIUS + sz * self.tan_y
-        if not (-distance <= sy <= distance):
-            return False  # Outside vertical field of view
+    def cull(
+        self,
+        centers: ndarray,
+        radii: ndarray,
+        flags: ndarray,
+        skip_flags: int,
+        distance: float = None,
+    ) -> ndarray:
+        """
+        Returns the indices of the bounding spheres inside the frustum,
+        skipping those with any of `skip_flags` set.
+        `distance` brings the far plane closer than the render distance.
+        """
+        camera = self.camera
+        far = self.render_distance
+        if distance is not None:
+            far = min(far, distance)
+        return cull_spheres(
+            centers,
+            radii,
+            flags,
+            skip_flags,
+            tuple(camera.position),
+            tuple(camera.forward),
+            tuple(camera.up),
+            tuple(camera.right),
+            (NEAR, far, self.factor_x, self.tan_x, self.factor_y, self.tan_y),
+        )
 
-        # Check against LEFT and RIGHT planes
-        sx = dot(sphere_vector, self.camera.right)
-        distance = self.factor_x * CHUNK_SPHERE_RADIUS + sz * self.tan_x
-        if not (-distance <= sx <= distance):
-            return False  # Outside horizontal field of view
+    def get_visible_chunks(self, table: "ChunkTable") -> ndarray:
+        """
+        Returns the indices of the chunks inside the frustum,
+        skipping the empty chunks and those hidden by their neighbors.
+        """
+        visible = self.cull(
+            table.centers, table.radii, table.flags, CHUNK_EMPTY | CHUNK_ENCLOSED
+        )
 
-        return True  # The chunk is inside the frustum
+        # An enclosed chunk can still be seen from its inside
+        index = get_chunk_index(tuple(ivec3(self.camera.eye_position)))
+        if index != -1 and table.flags[index] & CHUNK_ENCLOSED:
+            visible = append(visible, index)
+        return visible
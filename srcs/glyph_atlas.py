@@ -0,0 +1,96 @@
+from typing import TYPE_CHECKING, NamedTuple
+from moderngl import NEAREST, Texture
+from pygame import SRCALPHA, Surface, image, transform
+
+if TYPE_CHECKING:
+    from moderngl import Context
+    from pygame.font import Font
+
+
+# Characters rendered into the atlas (printable ASCII)
+GLYPHS = "".join(chr(code) for code in range(32, 127))
+GLYPH_PADDING = 1  # Empty pixels between two glyphs of the atlas
+
+
+class Glyph(NamedTuple):
+    uv: tuple  # (u0, v0, u1, v1) of the glyph in the atlas
+    width: int  # In pixels, also the advance to the next glyph
+    height: int
+
+
+class GlyphAtlas:
+    """
+    Every printable ASCII character of a font, rendered once into a single texture.
+    Text is drawn as one quad per character, sampling its glyph from the atlas.
+    """
+
+    def __init__(self, context: "Context", font: "Font") -> None:
+        self.line_height = font.get_linesize()
+
+        # White glyphs with a transparent background, side by side on one row
+        surfaces = [font.render(char, True, (255, 255, 255)) for char in GLYPHS]
+        width = sum(surface.get_width() + GLYPH_PADDING for surface in surfaces)
+        height = max(surface.get_height() for surface in surfaces)
+
+        atlas = Surface((width, height), flags=SRCALPHA)
+        atlas.fill((0, 0, 0, 0))
+
+        self.glyphs: dict[str, Glyph] = {}
+        x = 0
+        for char, surface in zip(GLYPHS, surfaces):
+            w, h = surface.get_size()
+            atlas.blit(surface, (x, 0))
+            # The atlas is flipped vertically below, v goes up from the bottom row
+            uv = (x / width, 1 - h / height, (x + w) / width, 1.0)
+            self.glyphs[char] = Glyph(uv, w, h)
+            x += w + GLYPH_PADDING
+
+        # Flip the surface vertically to match OpenGL's texture coordinate system
+        atlas = transform.flip(atlas, False, True)
+        self.texture: Texture = context.texture(
+            size=(width, height),
+            components=4,
+            data=image.tostring(atlas, "RGBA", False),
+        )
+        self.texture.filter = (NEAREST, NEAREST)
+
+
+class TextLayout:
+    """
+    The glyph quads of a text, laid out again only when the text changes.
+    Characters missing from the atlas are drawn as spaces.
+    """
+
+    def __init__(self, atlas: GlyphAtlas) -> None:
+        self.atlas = atlas
+        self.text: str = None
+        self.quads: list[tuple] = []  # (x, y, w, h, uv), from the box's bottom-left
+        self.size = (0, 0)  # Width and height of the text box, in pixels
+
+    def set_text(self, text: str) -> None:
+        if text == self.text:
+            return
+        self.text = text
+
+        glyphs = self.atlas.glyphs
+        space = glyphs[" "]
+        line_height = self.atlas.line_height
+        lines = text.split("\n")
+        height = line_height * len(lines)
+
+        self.quads = []
+        width = 0
+        for i, line in enumerate(lines):
+            x = 0
+            y = height - (i + 1) * line_height  # The first line is at the top
+            for char in line:
+                glyph = glyphs.get(char)
+                if glyph is None or char == " ":
+                    x += space.width
+                    continue
+                top = y + line_height - glyph.height
+                self.quads.append((x, top, glyph.width, glyph.height, glyph.uv))
+                x += glyph.width
+            width = max(width, x)
+
+        self.size = (width, height)
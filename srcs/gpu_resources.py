@@ -0,0 +1,108 @@
+from collections import defaultdict
+from typing import TYPE_CHECKING
+from moderngl import Buffer, Program, VertexArray
+from numpy import ndarray
+
+from settings import GPU_BUFFER_POOL_SIZE
+
+if TYPE_CHECKING:
+    from moderngl import Context
+
+
+MIN_BUFFER_SIZE = 256  # Smallest size class, in bytes
+
+
+class GPUResources:
+    """
+    Owns the vertex buffers and vertex arrays created by the meshes.
+
+    Buffers are allocated in power-of-two size classes. A released buffer goes back
+    to a pool (up to GPU_BUFFER_POOL_SIZE bytes) and is handed out again for the next
+    request of the same class, so rebuilding a mesh reuses GPU memory instead of
+    waiting for the garbage collector to free it.
+    """
+
+    def __init__(self, context: "Context") -> None:
+        self.context = context
+
+        # Released buffers waiting to be reused, by size class
+        self.pool: dict[int, list[Buffer]] = defaultdict(list)
+
+        # Counters
+        self.live_buffers = 0  # Buffers handed out and not released yet
+        self.live_bytes = 0
+        self.pooled_buffers = 0
+        self.pooled_bytes = 0
+        self.live_vertex_arrays = 0
+
+    @staticmethod
+    def get_size_class(size: int) -> int:
+        """Rounds a size in bytes up to its power-of-two size class."""
+        return max(MIN_BUFFER_SIZE, 1 << (size - 1).bit_length())
+
+    def acquire_buffer(self, size: int) -> Buffer:
+        """
+        Returns a buffer of at least `size` bytes, reused from the pool if possible.
+        The content of a reused buffer is undefined until it is written.
+
+        Args:
+            size (int): Minimum size of the buffer in bytes
+
+        Returns:
+            Buffer: A buffer owned by the caller until `release_buffer`
+        """
+        size_class = self.get_size_class(size)
+
+        if self.pool[size_class]:
+            buffer = self.pool[size_class].pop()
+            self.pooled_buffers -= 1
+            self.pooled_bytes -= size_class
+        else:
+            buffer = self.context.buffer(reserve=size_class)
+
+        self.live_buffers += 1
+        self.live_bytes += size_class
+        return buffer
+
+    def create_buffer(self, data: ndarray) -> Buffer:
+        """Acquires a buffer large enough for `data` and uploads it."""
+        buffer = self.acquire_buffer(data.nbytes)
+        buffer.write(data)
+        return buffer
+
+    def release_buffer(self, buffer: Buffer) -> None:
+        """
+        Gives a buffer back. It is pooled for reuse, or released to the driver
+        when the pool is full.
+        """
+        self.live_buffers -= 1
+        self.live_bytes -= buffer.size
+
+        if self.pooled_bytes + buffer.size > GPU_BUFFER_POOL_SIZE:
+            buffer.release()
+            return
+
+        self.pool[buffer.size].append(buffer)
+        self.pooled_buffers += 1
+        self.pooled_bytes += buffer.size
+
+    def create_vertex_array(
+        self, program: Program, content: list, **kwargs
+    ) -> VertexArray:
+        """Creates a vertex array owned by the caller until `release_vertex_array`."""
+        self.live_vertex_arrays += 1
+        return self.context.vertex_array(program, content, **kwargs)
+
+    def release_vertex_array(self, vao: VertexArray) -> None:
+        self.live_vertex_arrays -= 1
+        vao.release()
+
+    def get_stats(self) -> dict[str, int]:
+        """Returns the resource counters."""
+        return {
+            "live_buffers": self.live_buffers,
+            "live_bytes": self.live_bytes,
+            "pooled_buffers": self.pooled_buffers,
+            "pooled_bytes": self.pooled_bytes,
+            "live_vertex_arrays": self.live_vertex_arrays,
+        }
@@ -0,0 +1,88 @@
+from typing import TYPE_CHECKING
+from glm import vec3
+from numba import njit
+from numpy import array, ndarray, sqrt, zeros
+
+from settings import LOD_DISTANCES, LOD_HYSTERESIS, WORLD_VOLUME
+
+if TYPE_CHECKING:
+    from srcs.chunk_table import ChunkTable
+
+
+# Number of levels, the full resolution included
+LOD_LEVELS = len(LOD_DISTANCES) + 1
+
+
+def get_lod_factor(level: int) -> int:
+    """Returns the edge, in voxels, of the blocks a level is downsampled by."""
+    return 1 << level
+
+
+@njit
+def select_levels(
+    centers: ndarray,
+    indices: ndarray,
+    eye: tuple,
+    levels: ndarray,
+    distances: ndarray,
+    hysteresis: float,
+) -> None:
+    """
+    Updates the level of detail of some chunks from their distance to the eye.
+    A chunk only moves to the next level once it is `hysteresis` past its distance.
+
+    Args:
+        centers (ndarray): (N, 3) center of every chunk of the world
+        indices (ndarray): Indices of the chunks to update
+        eye (tuple): Position of the camera
+        levels (ndarray): Level of every chunk of the world, updated in place
+        distances (ndarray): Distance where each level ends
+        hysteresis (float): Distance to go past a level's bounds to leave it
+    """
+    ex, ey, ez = eye
+    for index in indices:
+        dx = centers[index, 0] - ex
+        dy = centers[index, 1] - ey
+        dz = centers[index, 2] - ez
+        distance = sqrt(dx * dx + dy * dy + dz * dz)
+
+        level = levels[index]
+        while level < len(distances) and distance > distances[level] + hysteresis:
+            level += 1
+        while level > 0 and distance < distances[level - 1] - hysteresis:
+            level -= 1
+        levels[index] = level
+
+
+class LevelOfDetail:
+    """
+    Picks the level of detail each chunk is drawn at: level 0 is the chunk's own
+    mesh, level n is the mesh of its voxels downsampled by blocks of (2^n)³.
+    Levels are only updated for the chunks about to be drawn.
+    """
+
+    def __init__(self, table: "ChunkTable") -> None:
+        self.table = table
+        self.distances = array(LOD_DISTANCES, dtype="float32")
+        self.bias = 1.0  # Scale of the distances, lowered by the quality governor
+        self.levels = zeros(WORLD_VOLUME, dtype="uint8")  # Level of every chunk
+
+    def set_bias(self, bias: float) -> None:
+        """Scales the distances of the levels, below 1 coarser levels come closer."""
+        self.bias = bias
+        self.distances = array(LOD_DISTANCES, dtype="float32") * bias
+
+    def update(self, visible_chunks: ndarray, eye: vec3) -> None:
+        """
+        Args:
+            visible_chunks (ndarray): Indices of the chunks to draw
+            eye (vec3): Position of the camera
+        """
+        select_levels(
+            self.table.chunk_centers,
+            visible_chunks,
+            tuple(eye),
+            self.levels,
+            self.distances,
+            LOD_HYSTERESIS * self.bias,
+        )
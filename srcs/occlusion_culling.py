@@ -0,0 +1,111 @@
+from typing import TYPE_CHECKING
+from moderngl import CULL_FACE, Query
+from numpy import ndarray
+
+from meshes.occlusion_box_mesh import OcclusionBoxMesh
+from settings import NEAR
+
+if TYPE_CHECKING:
+    from srcs.world import World
+
+
+# Distance (in voxels) the tested boxes are grown by, so that the chunk's own
+# faces, drawn at the same depth as the box, never hide its box
+BOX_MARGIN = 1.0
+
+
+class OcclusionCulling:
+    """
+    Skips the chunks hidden behind others, using hardware occlusion queries.
+
+    After the chunks are drawn, the bounding box of the solid voxels of each drawn
+    chunk is rendered (without writing color or depth) inside an occlusion query.
+    The next frame, each chunk is drawn conditionally on its query: the GPU drops
+    the draw when no sample of the box passed the depth test, without the CPU
+    waiting for the result.
+
+    Chunks whose query was not issued on the previous frame (they just entered the
+    frustum, or the camera was inside their box) are drawn unconditionally.
+    """
+
+    def __init__(self, world: "World") -> None:
+        self.game = world.game
+        self.context = self.game.context
+        self.chunks = world.chunks
+        self.table = world.table
+        self.levels = world.level_of_detail.levels
+
+        self.mesh = OcclusionBoxMesh(self.game)
+        self.shader = self.game.shader.get_state(self.mesh.shader)
+
+        self.queries: dict[int, Query] = {}  # Query issued last frame, by chunk index
+        self.pool: list[Query] = []  # Queries of chunks that were not tested
+
+    def get_query(self, index: int) -> Query:
+        """Returns the chunk's query, taking one from the pool if it has none."""
+        query = self.queries.get(index)
+        if query is None:
+            query = (
+                self.pool.pop() if self.pool else self.context.query(any_samples=True)
+            )
+            self.queries[index] = query
+        return query
+
+    def render(self, visible_chunks: ndarray) -> None:
+        """
+        Draws the chunks conditionally on last frame's queries,
+        then issues this frame's queries.
+
+        Args:
+            visible_chunks (ndarray): Indices of the chunks to draw
+        """
+        for index in visible_chunks:
+            query = self.queries.get(index)
+            if query is None:
+                self.chunks[index].render()
+                continue
+            with query.crender:
+                self.chunks[index].render()
+
+        self.issue_queries(visible_chunks)
+
+    def issue_queries(self, visible_chunks: ndarray) -> None:
+        """Renders the boxes of the chunks into occlusion queries, depth test only."""
+        table = self.table
+        # Downsampled meshes fill whole blocks, the bounds are rounded out to them
+        factor = 2 ** self.levels[visible_chunks].astype("int32")[:, None]
+        low = table.bounds_min[visible_chunks] // factor * factor
+        high = (table.bounds_max[visible_chunks] // factor + 1) * factor
+        low = table.origins[visible_chunks] + low
+        high = table.origins[visible_chunks] + high
+        low = (low - BOX_MARGIN).astype("f4")
+        high = (high + BOX_MARGIN).astype("f4")
+
+        # A box around the camera would be clipped by the near plane
+        eye = tuple(self.game.player.eye_position)
+        around_camera = ((low - NEAR <= eye) & (eye <= high + NEAR)).all(axis=1)
+
+        # Give back the queries of the chunks that are not tested this frame
+        tested = {
+            int(index) for index, skip in zip(visible_chunks, around_camera) if not skip
+        }
+        for index in self.queries.keys() - tested:
+            self.pool.append(self.queries.pop(index))
+
+        framebuffer = self.context.fbo
+        color_mask, depth_mask = framebuffer.color_mask, framebuffer.depth_mask
+        framebuffer.color_mask = False, False, False, False
+        framebuffer.depth_mask = False
+        self.context.disable(CULL_FACE)  # The box faces are seen from both sides
+
+        for n, index in enumerate(visible_chunks):
+            if around_camera[n]:
+                continue
+            self.shader["box_min"] = low[n]
+            self.shader["box_size"] = high[n] - low[n]
+            with self.get_query(int(index)):
+                self.mesh.render()
+
+        self.context.enable(CULL_FACE)
+        framebuffer.color_mask = color_mask
+        framebuffer.depth_mask = depth_mask
@@ -15,6 +15,8 @@ from pygame import (
 )
 from glm import vec3
 from settings import (
+    GO_THROUGH,
+    GRAVITY,
     KEYBOARD_QWERTY,
     MOUSE_SENSITIVITY,
     PLAYER_POSITION,
@@ -23,6 +25,7 @@ from settings import (
 )
 
 from srcs.camera import Camera
+from srcs.collision import CONTACT_GROUND
 
 if TYPE_CHECKING:
     from srcs.engine import Engine
@@ -58,6 +61,8 @@ class Player(Camera):
         """
         self.game = game
         self.window_x, self.window_y = game.get_window_resolution()
+        self.fall_speed = 0.0  # Voxels per millisecond, from the gravity
+        self.on_ground = False
         super().__init__(position, yaw, pitch)
 
     def on_init(self) -> None:
@@ -116,26 +121,42 @@ class Player(Camera):
         speed_multiplier = 2.0 if key_state[K_LSHIFT] or key_state[K_RSHIFT] else 1.0
         velocity = self.game.delta_time * PLAYER_SPEED * speed_multiplier
 
+        forward_velocity = right_velocity = up_velocity = 0.0
+
         # Forward movement (W or Z depending on layout)
         if key_state[K_w if KEYBOARD_QWERTY else K_z]:
-            self.move_forward(velocity)
+            forward_velocity += velocity
 
         # Backward movement (S)
         if key_state[K_s]:
-            self.move_backward(velocity)
+            forward_velocity -= velocity
 
         # Right strafe (D)
         if key_state[K_d]:
-            self.move_right(velocity)
+            right_velocity += velocity
 
         # Left strafe (A or Q depending on layout)
         if key_state[K_a if KEYBOARD_QWERTY else K_q]:
-            self.move_left(velocity)
+            right_velocity -= velocity
 
         # Upward movement (E)
         if key_state[K_e]:
-            self.move_up(velocity)
+            up_velocity += velocity
 
         # Downward movement (Q or A depending on layout)
         if key_state[K_q if KEYBOARD_QWERTY else K_a]:
-            self.move_down(velocity)
+            up_velocity -= velocity
+
+        # Falling speed builds up until the player lands
+        fall_distance = 0.0
+        if GRAVITY and not GO_THROUGH:
+            self.fall_speed += GRAVITY * self.game.delta_time
+            fall_distance = self.fall_speed * self.game.delta_time
+
+        # All the keys are resolved against the voxels at once
+        contacts = self.move(
+            forward_velocity, right_velocity, up_velocity, fall_distance
+        )
+        self.on_ground = bool(contacts & CONTACT_GROUND)
+        if self.on_ground:
+            self.fall_speed = 0.0
@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+from typing import Any, Iterator
+from moderngl import Program, Texture
+from numpy import generic
+
+
+# Value of a uniform that was never written through its program state
+UNKNOWN = object()
+
+
+def to_key(value: Any) -> Any:
+    """
+    Returns the comparable form of a uniform value, which can also be written back:
+    the value itself for scalars and tuples, the raw bytes for matrices, vectors and
+    arrays (glm and numpy types).
+    """
+    if isinstance(value, generic):
+        return value.item()
+    if isinstance(value, (bool, int, float, tuple)):
+        return value
+    # In memory order: glm matrices are column-major, `bytes()` would transpose them
+    return memoryview(value).tobytes("A")
+
+
+class ProgramState:
+    """
+    CPU copy of the uniform values of a program.
+
+    Writing a value the uniform already holds is skipped. `scope` restores the
+    uniforms changed inside it from this copy, without reading them back from the
+    driver (a synchronous round trip). The copy is only exact if every write to the
+    program's uniforms goes through its state.
+    """
+
+    def __init__(self, program: Program) -> None:
+        self.program = program
+        self.values: dict[str, Any] = {}  # By uniform name, in `to_key` form
+        self.scopes: list[dict[str, Any]] = []  # Values to restore, per open scope
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        key = to_key(value)
+        previous = self.values.get(name, UNKNOWN)
+        if previous == key:
+            return
+
+        # Only the value from before the innermost scope is restored by it
+        if self.scopes and name not in self.scopes[-1]:
+            self.scopes[-1][name] = previous
+        self.write(name, key)
+
+    def get(self, name: str) -> Any:
+        """Returns the value of a uniform in `to_key` form, or UNKNOWN."""
+        return self.values.get(name, UNKNOWN)
+
+    def write(self, name: str, key: Any) -> None:
+        if isinstance(key, bytes):
+            self.program[name].write(key)
+        else:
+            self.program[name].value = key
+        self.values[name] = key
+
+    @contextmanager
+    def scope(self) -> Iterator["ProgramState"]:
+        """
+        Restores the uniforms written inside the `with` block when it exits.
+        A uniform that was never written before the scope keeps its new value.
+        """
+        self.scopes.append({})
+        try:
+            yield self
+        finally:
+            for name, key in self.scopes.pop().items():
+                if key is not UNKNOWN:
+                    self.write(name, key)
+
+
+class TextureUnits:
+    """
+    CPU copy of the texture bound to each texture unit, shared by all the programs.
+    Binding the texture a unit already holds is skipped.
+    """
+
+    def __init__(self) -> None:
+        self.bound: dict[int, Texture] = {}
+
+    def use(self, texture: Texture, location: int) -> None:
+        if self.bound.get(location) is texture:
+            return
+        texture.use(location=location)
+        self.bound[location] = texture
@@ -0,0 +1,229 @@
+from collections import deque
+from logging import getLogger
+from math import log2
+from typing import TYPE_CHECKING, Callable
+
+from settings import (
+    FAR,
+    FOG_CUTOFF,
+    MESH_BUILD_BUDGET,
+    MIN_CLOUD_DISTANCE,
+    MIN_LOD_BIAS,
+    MIN_MESH_BUILD_BUDGET,
+    MIN_RENDER_DISTANCE,
+    MIN_SHADING_MODE,
+    MIN_WATER_DISTANCE,
+    QUALITY_GOVERNOR,
+    QUALITY_STEPS,
+    QUALITY_WINDOW,
+    RENDER_DISTANCE,
+    TARGET_FPS,
+)
+
+if TYPE_CHECKING:
+    from srcs.engine import Engine
+
+
+logger = getLogger(__name__)
+
+# The quality is lowered when the average frame time is this much over the target
+TOLERANCE = 1.1
+
+# Windows the target must be held before trying a higher quality. It doubles each
+# time a higher quality misses the target right away, up to MAX_PROBE_DELAY
+PROBE_DELAY = 2
+MAX_PROBE_DELAY = 32
+
+# Frames not measured after startup, slowed by the loading and the first meshes
+WARMUP_FRAMES = 60
+
+
+def get_steps(high: float, low: float) -> tuple[float, ...]:
+    """Returns QUALITY_STEPS values from the highest quality to the lowest."""
+    return tuple(
+        high + (low - high) * i / (QUALITY_STEPS - 1) for i in range(QUALITY_STEPS)
+    )
+
+
+def get_fog_density(distance: float) -> float:
+    """Returns the fog density that makes the fog opaque at a distance."""
+    return log2(1.0 / FOG_CUTOFF) / (distance * distance)
+
+
+class QualityKnob:
+    """A setting the governor steps through, from its highest quality value down."""
+
+    def __init__(
+        self, name: str, values: tuple, apply: Callable[[float], None]
+    ) -> None:
+        """
+        Args:
+            name (str): Name of the setting in the logs
+            values (tuple): Values of the setting, the highest quality first
+            apply (Callable): Puts a value of the setting in use
+        """
+        self.name = name
+        self.values = values
+        self.apply = apply
+        self.step = 0  # Index of the value in use
+
+    @property
+    def value(self) -> float:
+        return self.values[self.step]
+
+    def move(self, offset: int) -> str:
+        """
+        Moves by some steps and applies the new value.
+
+        Returns:
+            str: The change, for the logs
+        """
+        old = self.value
+        self.step += offset
+        self.apply(self.value)
+        return f"{self.name} {old:g} -> {self.value:g}"
+
+
+class QualityGovernor:
+    """
+    Holds the target frame rate by trading quality for time: it watches the
+    average frame time over a window of frames, and lowers one setting by one step
+    when it misses the target. Settings are lowered in the order the least visible
+    ones first (meshing budget, clouds, water, levels of detail, shading, render
+    distance), and raised back in the reverse order.
+
+    With vsync on, the frame time never drops below the target, so a higher
+    quality is tried once the target was held for a few windows, and kept only if
+    the target is still held with it. Each decision is logged with its reason.
+    """
+
+    def __init__(self, game: "Engine") -> None:
+        self.game = game
+        scene = game.scene
+        world = scene.world
+        frustum = game.player.frustum
+
+        self.target_time = 1000.0 / TARGET_FPS  # In milliseconds
+        self.frame_times: deque[float] = deque(maxlen=QUALITY_WINDOW)
+        self.warmup = WARMUP_FRAMES  # Frames left to skip
+
+        def set_cloud_distance(distance: float) -> None:
+            scene.clouds.distance = distance
+
+        def set_water_distance(distance: float) -> None:
+            scene.water.distance = distance
+
+        def set_mesh_build_budget(budget: float) -> None:
+            world.mesh_build_budget = budget
+
+        def set_shading_mode(shading_mode: float) -> None:
+            game.max_shading_mode = int(shading_mode)
+            game.update_chunk_variant()
+
+        def set_render_distance(distance: float) -> None:
+            # The fog must become opaque where the chunks stop being drawn
+            frustum.render_distance = distance
+            game.shader.camera_block.write_fog_density(get_fog_density(distance))
+
+        # In the order they are lowered
+        self.knobs = [
+            QualityKnob(
+                "mesh build budget",
+                get_steps(MESH_BUILD_BUDGET, MIN_MESH_BUILD_BUDGET),
+                set_mesh_build_budget,
+            ),
+            QualityKnob(
+                "cloud distance",
+                get_steps(FAR, MIN_CLOUD_DISTANCE),
+                set_cloud_distance,
+            ),
+            QualityKnob(
+                "water distance",
+                get_steps(RENDER_DISTANCE, MIN_WATER_DISTANCE),
+                set_water_distance,
+            ),
+            QualityKnob(
+                "lod bias",
+                get_steps(1.0, MIN_LOD_BIAS),
+                world.level_of_detail.set_bias,
+            ),
+            QualityKnob(
+                "shading mode",
+                tuple(range(2, MIN_SHADING_MODE - 1, -1)),
+                set_shading_mode,
+            ),
+            QualityKnob(
+                "render distance",
+                get_steps(RENDER_DISTANCE, MIN_RENDER_DISTANCE),
+                set_render_distance,
+            ),
+        ]
+
+        self.held_windows = 0  # Windows the target was held since the last change
+        self.probe_delay = PROBE_DELAY
+        self.probed = False  # The last change raised the quality
+
+    def update(self, frame_time: float) -> None:
+        """
+        Args:
+            frame_time (float): Time of the last frame, in milliseconds
+        """
+        if not QUALITY_GOVERNOR:
+            return
+        if self.warmup:
+            self.warmup -= 1
+            return
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) < QUALITY_WINDOW:
+            return
+
+        average = sum(self.frame_times) / QUALITY_WINDOW
+        # Each window is judged on its own, the next one starts empty
+        self.frame_times.clear()
+
+        if average > self.target_time * TOLERANCE:
+            self.lower(average)
+        else:
+            self.held_windows += 1
+            self.probed = False
+            if self.held_windows >= self.probe_delay:
+                self.raise_quality(average)
+
+    def lower(self, average: float) -> None:
+        """Lowers the first setting that can still be lowered."""
+        self.held_windows = 0
+        if self.probed:
+            # The quality just raised cannot hold the target, wait longer next time
+            self.probe_delay = min(self.probe_delay * 2, MAX_PROBE_DELAY)
+            self.probed = False
+
+        knob = next((k for k in self.knobs if k.step < len(k.values) - 1), None)
+        if knob is None:
+            logger.info(
+                "frame time %.1f ms over the %.1f ms target, "
+                "every setting is at its lowest quality",
+                average,
+                self.target_time,
+            )
+            return
+        logger.info(
+            "frame time %.1f ms over the %.1f ms target, lowered %s",
+            average,
+            self.target_time,
+            knob.move(1),
+        )
+
+    def raise_quality(self, average: float) -> None:
+        """Raises the last lowered setting back by one step."""
+        self.held_windows = 0
+        knob = next((k for k in reversed(self.knobs) if k.step > 0), None)
+        if knob is None:
+            return
+        self.probed = True
+        logger.info(
+            "frame time %.1f ms held the %.1f ms target for %d windows, raised %s",
+            average,
+            self.target_time,
+            self.probe_delay,
+            knob.move(-1),
+        )
@@ -5,7 +5,6 @@ from moderngl import CULL_FACE, DEPTH_TEST
 from objects.hud import HUD
 from objects.clouds import Clouds
 from objects.voxel_marker import VoxelMarker
-from objects.water import Water
 from srcs.world import World
 
 if TYPE_CHECKING:
@@ -30,8 +29,8 @@ class Scene:
         # Create the voxel marker (e.g., for block highlighting/placement)
         self.voxel_marker = VoxelMarker(self.world.voxel_handler)
 
-        # Create water system (water surface rendering)
-        self.water = Water(self.game)
+        # The water surface is built by the world, along with the chunks
+        self.water = self.world.water
 
         # Create cloud system (procedural sky clouds)
         self.clouds = Clouds(self.game)
@@ -51,7 +50,9 @@ class Scene:
         """
 
         # Render world terrain/chunks (opaque geometry first)
-        self.world.render()
+        # The chunk shader works in linear space, the framebuffer encodes it to sRGB
+        with self.game.framebuffer.linear_output():
+            self.world.render()
 
         # Disable back-face culling so clouds and water render fully
         self.game.context.disable(CULL_FACE)
@@ -67,6 +68,10 @@ class Scene:
         # Render voxel marker (e.g., highlighted block under the cursor)
         self.voxel_marker.render()
 
+    def render_hud(self) -> None:
+        """
+        Render the HUD, over the 3D scene upscaled to the window's resolution.
+        """
         self.game.context.disable(DEPTH_TEST)  # Disable depth test for 2D HUD rendering
         # Render the HUD (heads-up display) on top of everything else
         self.hud.render()
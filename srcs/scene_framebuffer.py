@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+from moderngl import LINEAR
+
+if TYPE_CHECKING:
+    from srcs.engine import Engine
+
+
+# OpenGL enums missing from moderngl
+GL_SRGB8_ALPHA8 = 0x8C43
+GL_FRAMEBUFFER_SRGB = 0x8DB9
+
+# Texture unit of the 3D scene's color, read when it is upscaled
+SCENE_TEXTURE_UNIT = 5
+
+
+class SceneFramebuffer:
+    """
+    Offscreen framebuffers the frame is rendered into, with sRGB color textures.
+
+    The 3D scene is drawn into the bottom-left corner of its own framebuffer, at a
+    share of the window's resolution (`scale`, see srcs/dynamic_resolution.py). It
+    is then upscaled with bilinear filtering into the window-sized framebuffer,
+    where the HUD is drawn at full resolution. That one is copied to the window
+    once the frame is done. Both framebuffers are allocated once, at the window's
+    size: changing the scale only changes the viewport.
+
+    Inside `linear_output`, fragments are written in linear space and the hardware
+    encodes them to sRGB (blending in linear space too), so the shaders working in
+    linear space need no `pow` at the end. Outside of it, fragments are stored as
+    they are: already sRGB colors (HUD, clouds, etc.) are drawn unchanged.
+    """
+
+    def __init__(self, game: "Engine") -> None:
+        self.game = game
+        self.context = game.context
+        self.size = game.get_window_resolution()
+        self.scale = 1.0  # Share of the window's resolution the scene is drawn at
+
+        # The 3D scene, with its depth buffer
+        self.scene_color = self.context.texture(
+            self.size, 4, internal_format=GL_SRGB8_ALPHA8
+        )
+        self.scene_color.filter = (LINEAR, LINEAR)
+        self.scene_color.repeat_x = self.scene_color.repeat_y = False
+        self.scene_depth = self.context.depth_renderbuffer(self.size)
+        self.scene = self.context.framebuffer(
+            color_attachments=[self.scene_color], depth_attachment=self.scene_depth
+        )
+
+        # The upscaled scene and the HUD, at the window's resolution
+        self.color = self.context.texture(self.size, 4, internal_format=GL_SRGB8_ALPHA8)
+        self.framebuffer = self.context.framebuffer(color_attachments=[self.color])
+
+        # Full screen triangle, its corners are computed from the vertex index
+        self.upscale_shader = game.shader.get_state(game.shader.upscale)
+        self.upscale_vao = game.gpu_resources.create_vertex_array(
+            game.shader.upscale, []
+        )
+
+    def get_scene_size(self) -> tuple[int, int]:
+        """Returns the resolution the 3D scene is drawn at."""
+        w, h = self.size
+        return max(1, round(w * self.scale)), max(1, round(h * self.scale))
+
+    def use(self, color: tuple) -> None:
+        """Binds the framebuffer of the 3D scene and clears it to an sRGB color."""
+        self.scene.viewport = (0, 0, *self.get_scene_size())
+        self.scene.use()
+        self.scene.clear(color=color)
+
+    def upscale(self) -> None:
+        """
+        Stretches the 3D scene over the window-sized framebuffer, and binds it
+        for the HUD.
+        """
+        self.framebuffer.use()
+
+        w, h = self.size
+        scene_w, scene_h = self.get_scene_size()
+        self.upscale_shader["uv_scale"] = (scene_w / w, scene_h / h)
+        # The last texel centers drawn, the texels past them are from older frames
+        self.upscale_shader["uv_max"] = ((scene_w - 0.5) / w, (scene_h - 0.5) / h)
+        self.game.shader.texture_units.use(self.scene_color, SCENE_TEXTURE_UNIT)
+
+        # Filtered in linear space, the texture is decoded and the output encoded
+        with self.linear_output():
+            self.upscale_vao.render(vertices=3)
+
+    @contextmanager
+    def linear_output(self) -> Iterator[None]:
+        """Encodes the linear colors written inside the `with` block to sRGB."""
+        self.context.enable_direct(GL_FRAMEBUFFER_SRGB)
+        try:
+            yield
+        finally:
+            self.context.disable_direct(GL_FRAMEBUFFER_SRGB)
+
+    def present(self) -> None:
+        """Copies the frame to the window, without converting the sRGB colors."""
+        self.context.copy_framebuffer(self.context.screen, self.framebuffer)
@@ -0,0 +1,81 @@
+from itertools import product
+from typing import TYPE_CHECKING, Any
+from moderngl import Program
+
+if TYPE_CHECKING:
+    from srcs.shader import Shader
+
+
+class ShaderVariants:
+    """
+    The permutations of a shader's compile-time features, each compiled with its
+    values injected as `#define`s (e.g. `#define SHADING_MODE 2`), so that the
+    shader keeps only the code of the selected features.
+
+    Variants are compiled the first time they are used and cached. `compile_next`
+    compiles the remaining ones one at a time, between frames, so switching
+    features never waits for the compiler once they are all cached.
+
+    Uniforms written through the variants are shared: a variant gets the current
+    values when it becomes the active one.
+    """
+
+    def __init__(
+        self, shader: "Shader", shader_name: str, features: dict[str, tuple]
+    ) -> None:
+        """
+        Args:
+            shader (Shader): Compiles the programs and holds their states
+            shader_name (str): Name of the shader files in `shaders/`
+            features (dict): Possible values of each feature, by define name
+        """
+        self.shader = shader
+        self.shader_name = shader_name
+        self.features = features
+
+        self.programs: dict[tuple, Program] = {}  # By feature values
+        self.uniforms: dict[str, Any] = {}  # Shared by all variants
+        self.program: Program = None  # Active variant
+
+        # Permutations not compiled yet
+        self.pending = list(product(*features.values()))
+
+    def get_key(self, values: dict[str, int]) -> tuple:
+        return tuple(values[name] for name in self.features)
+
+    def get(self, key: tuple) -> Program:
+        """Returns the variant for some feature values, compiling it if needed."""
+        program = self.programs.get(key)
+        if program is None:
+            defines = dict(zip(self.features, key))
+            program = self.shader.get_program(self.shader_name, defines)
+            self.programs[key] = program
+            self.pending.remove(key)
+        return program
+
+    def use(self, **values: int) -> Program:
+        """
+        Makes the variant for some feature values the active one.
+
+        Returns:
+            Program: The active variant
+        """
+        self.program = self.get(self.get_key(values))
+
+        # Uniforms unused by this variant's code are optimized out of it
+        state = self.shader.get_state(self.program)
+        for name, value in self.uniforms.items():
+            if self.program.get(name, None) is not None:
+                state[name] = value
+        return self.program
+
+    def compile_next(self) -> None:
+        """Compiles one of the variants that were never used yet, if any."""
+        if self.pending:
+            self.get(self.pending[0])
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        """Writes a uniform of the active variant, and of the next ones."""
+        self.uniforms[name] = value
+        if self.program.get(name, None) is not None:
+            self.shader.get_state(self.program)[name] = value
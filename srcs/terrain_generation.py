@@ -15,7 +15,8 @@ from objects.texturing import (
     Texture,
 )
 from srcs.noise import noise2, noise3
-from settings import CENTER_XZ, CENTER_Y, CHUNK_AREA, CHUNK_SIZE
+from srcs.voxel_layout import get_index
+from settings import CENTER_XZ, CENTER_Y, CHUNK_SIZE
 
 
 @njit
@@ -47,11 +48,6 @@ def get_height(x: int, z: int) -> int:
     return int(max(height, 1) * island)
 
 
-@njit
-def get_index(x: int, y: int, z: int) -> int:
-    return x + CHUNK_SIZE * z + CHUNK_AREA * y
-
-
 @njit
 def set_voxel_id(
     voxels: ndarray,
@@ -0,0 +1,96 @@
+from typing import TYPE_CHECKING
+from glm import mat4
+from numpy import arange, array, zeros
+
+from settings import CHUNK_SIZE, WORLD_AREA, WORLD_VOLUME, WORLD_WIDTH
+
+if TYPE_CHECKING:
+    from moderngl import Program
+    from srcs.gpu_resources import GPUResources
+
+
+# Binding points of the uniform blocks, set on every program declaring them
+CAMERA_BINDING = 0
+CHUNK_ORIGIN_BINDING = 1
+
+
+def bind_uniform_blocks(program: "Program") -> None:
+    """Attaches the blocks declared by a program to their binding points."""
+    for name, binding in (
+        ("Camera", CAMERA_BINDING),
+        ("ChunkOrigin", CHUNK_ORIGIN_BINDING),
+    ):
+        block = program.get(name, None)
+        if block is not None:
+            block.binding = binding
+
+
+class CameraBlock:
+    """
+    Buffer of the `Camera` uniform block shared by the 3D programs:
+
+        layout (std140) uniform Camera {
+            mat4 matrix_projection;  // Offset 0
+            mat4 matrix_view;        // Offset 64
+            float fog_density;       // Offset 128
+            float water_line;        // Offset 132
+        };
+
+    The view matrix is written once per frame for every program at once.
+    """
+
+    SIZE = 144  # std140 size, rounded up to a multiple of 16 bytes
+
+    def __init__(
+        self,
+        resources: "GPUResources",
+        matrix_projection: mat4,
+        fog_density: float,
+        water_line: float,
+    ) -> None:
+        self.buffer = resources.acquire_buffer(self.SIZE)
+        self.buffer.write(matrix_projection, offset=0)
+        self.buffer.write(mat4(), offset=64)
+        self.buffer.write(array([fog_density, water_line], dtype="f4"), offset=128)
+
+    def write_view(self, matrix_view: mat4) -> None:
+        self.buffer.write(matrix_view, offset=64)
+
+    def write_fog_density(self, fog_density: float) -> None:
+        self.buffer.write(array([fog_density], dtype="f4"), offset=128)
+
+    def use(self) -> None:
+        """Makes the programs read this camera."""
+        self.buffer.bind_to_uniform_block(CAMERA_BINDING)
+
+
+class ChunkOriginTable:
+    """
+    Buffer of the `ChunkOrigin` uniform block (`vec3 chunk_origin`), holding the
+    world position of every chunk, each in its own slot.
+
+    Chunks never move, so the table is written once. Drawing a chunk binds the range
+    of its slot to the block, instead of uploading a model matrix uniform.
+    """
+
+    def __init__(self, resources: "GPUResources") -> None:
+        # Slots must start at a multiple of the driver's offset alignment
+        alignment = resources.context.info["GL_UNIFORM_BUFFER_OFFSET_ALIGNMENT"]
+        self.stride = -(-16 // alignment) * alignment
+
+        # Inverse of the chunk index `x + WORLD_WIDTH * z + WORLD_AREA * y`
+        y, rest = divmod(arange(WORLD_VOLUME), WORLD_AREA)
+        z, x = divmod(rest, WORLD_WIDTH)
+
+        data = zeros((WORLD_VOLUME, self.stride // 4), dtype="f4")
+        data[:, 0] = x * CHUNK_SIZE
+        data[:, 1] = y * CHUNK_SIZE
+        data[:, 2] = z * CHUNK_SIZE
+
+        self.buffer = resources.create_buffer(data)
+
+    def use(self, index: int) -> None:
+        """Makes the chunk program draw at the origin of a chunk."""
+        self.buffer.bind_to_uniform_block(
+            CHUNK_ORIGIN_BINDING, offset=index * self.stride, size=16
+        )
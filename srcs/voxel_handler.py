@@ -1,11 +1,13 @@
 from typing import TYPE_CHECKING
 
-from glm import fract, ivec3, sign, vec3
+from glm import ivec3, vec3
+from math import floor
+from numba import njit
+from numpy import ndarray
 
 from meshes.chunk_mesh_builder import get_chunk_index
 from objects.chunk import Chunk
 from settings import (
-    CHUNK_AREA,
     CHUNK_SIZE,
     EYE_HEIGHT,
     MAX_RAY_DISTANCE,
@@ -14,16 +16,136 @@ from settings import (
     WORLD_HEIGHT,
     WORLD_WIDTH,
 )
-
+from srcs.voxel_layout import get_index
 
 if TYPE_CHECKING:
     from srcs.world import World
 
 
+@njit
+def get_edit_count(versions: ndarray, start: tuple, end: tuple) -> int:
+    """
+    Returns the number of voxel edits of the chunks a segment may cross (those
+    overlapping its bounding box). It changes whenever one of them is edited.
+
+    Args:
+        versions (ndarray): Edit count of every chunk of the world
+        start (tuple): First end of the segment, in world space
+        end (tuple): Second end of the segment, in world space
+    """
+    sizes = (WORLD_WIDTH, WORLD_HEIGHT, WORLD_DEPTH)
+    low = [0, 0, 0]
+    high = [0, 0, 0]
+    for axis in range(3):
+        low[axis] = max(int(floor(min(start[axis], end[axis]) / CHUNK_SIZE)), 0)
+        high[axis] = min(
+            int(floor(max(start[axis], end[axis]) / CHUNK_SIZE)), sizes[axis] - 1
+        )
+
+    count = 0
+    for cx in range(low[0], high[0] + 1):
+        for cy in range(low[1], high[1] + 1):
+            for cz in range(low[2], high[2] + 1):
+                count += versions[cx + WORLD_WIDTH * cz + WORLD_AREA * cy]
+    return count
+
+
+@njit
+def get_step(a: float, b: float) -> tuple:
+    """
+    Returns the direction of a segment from a to b along one axis, the fraction of
+    the segment between two voxel boundaries, and the fraction before the first one.
+    """
+    if b > a:
+        delta = min(1.0 / (b - a), 10000000.0)
+        return 1, delta, delta * (1.0 - (a - floor(a)))
+    if b < a:
+        delta = min(1.0 / (a - b), 10000000.0)
+        return -1, delta, delta * (a - floor(a))
+    return 0, 10000000.0, 0.0
+
+
+@njit
+def cast_ray(
+    world_voxels: ndarray,
+    bounds_min: ndarray,
+    bounds_max: ndarray,
+    start: tuple,
+    end: tuple,
+) -> tuple:
+    """
+    Walks the voxels crossed by a segment, in order (DDA), until a solid one.
+
+    Args:
+        world_voxels (ndarray): Voxels of every chunk of the world
+        bounds_min (ndarray): (N, 3) min local position of each chunk's solid voxels
+        bounds_max (ndarray): (N, 3) max local position of each chunk's solid voxels
+        start (tuple): Start of the ray, in world space
+        end (tuple): End of the ray, in world space
+
+    Returns:
+        tuple: Id of the voxel hit (0 if none), its world position, the normal of
+            the face the ray entered through, the index of its chunk and its index
+            in the chunk
+    """
+    x, y, z = int(start[0]), int(start[1]), int(start[2])
+    dx, delta_x, max_x = get_step(start[0], end[0])
+    dy, delta_y, max_y = get_step(start[1], end[1])
+    dz, delta_z, max_z = get_step(start[2], end[2])
+    step_direction = -1
+
+    while not (max_x > 1.0 and max_y > 1.0 and max_z > 1.0):
+        cx, cy, cz = x // CHUNK_SIZE, y // CHUNK_SIZE, z // CHUNK_SIZE
+        if 0 <= cx < WORLD_WIDTH and 0 <= cy < WORLD_HEIGHT and 0 <= cz < WORLD_DEPTH:
+            chunk_index = cx + WORLD_WIDTH * cz + WORLD_AREA * cy
+            lx, ly, lz = x - cx * CHUNK_SIZE, y - cy * CHUNK_SIZE, z - cz * CHUNK_SIZE
+
+            # The voxels outside the bounds of their chunk's solid voxels are air
+            if (
+                bounds_min[chunk_index, 0] <= lx <= bounds_max[chunk_index, 0]
+                and bounds_min[chunk_index, 1] <= ly <= bounds_max[chunk_index, 1]
+                and bounds_min[chunk_index, 2] <= lz <= bounds_max[chunk_index, 2]
+            ):
+                voxel_index = get_index(lx, ly, lz)
+                voxel_id = world_voxels[chunk_index, voxel_index]
+                if voxel_id:
+                    if step_direction == 0:
+                        normal = (-dx, 0, 0)
+                    elif step_direction == 1:
+                        normal = (0, -dy, 0)
+                    else:
+                        normal = (0, 0, -dz)
+                    return voxel_id, (x, y, z), normal, chunk_index, voxel_index
+
+        if max_x < max_y:
+            if max_x < max_z:
+                x += dx
+                max_x += delta_x
+                step_direction = 0
+            else:
+                z += dz
+                max_z += delta_z
+                step_direction = 2
+        else:
+            if max_y < max_z:
+                y += dy
+                max_y += delta_y
+                step_direction = 1
+            else:
+                z += dz
+                max_z += delta_z
+                step_direction = 2
+
+    return 0, (x, y, z), (0, 0, 0), -1, 0
+
+
 class VoxelHandler:
     def __init__(self, world: "World") -> None:
         self.game = world.game
         self.chunks = world.chunks
+        self.table = world.table
+        self.voxels = world.voxels
+        self.water = world.water
         self.inventory = self.game.inventory
 
         # Ray casting related attributes
@@ -33,6 +155,7 @@ class VoxelHandler:
         self.voxel_local_position = None
         self.voxel_world_position = None
         self.voxel_normal = None
+        self.cache_key = None  # Ray and edit count of the last cast
 
         # 0: Remove voxel, 1: Add voxel
         self.interaction_mode = 0
@@ -43,72 +166,43 @@ class VoxelHandler:
         self.new_voxel_id = self.inventory.get_selected_item()
 
     def ray_cast(self) -> bool:
+        """
+        Finds the first solid voxel in front of the camera, up to MAX_RAY_DISTANCE.
+        The last result is kept while the ray and the voxels of the chunks it
+        crosses stay the same.
+
+        Returns:
+            bool: True if a voxel was hit
+        """
         eye_position = self.game.player.position + vec3(0, EYE_HEIGHT, 0)
-        x1, y1, z1 = eye_position
-        x2, y2, z2 = eye_position + self.game.player.forward * MAX_RAY_DISTANCE
-
-        current_voxel_position = ivec3(x1, y1, z1)
-        self.voxel_id = 0
-        self.voxel_normal = ivec3(0)
-        step_direction = -1
-
-        dx = sign(x2 - x1)
-        delta_x = min(dx / (x2 - x1), 10000000.0) if dx != 0 else 10000000.0
-        max_x = delta_x * (1.0 - fract(x1)) if dx > 0 else delta_x * fract(x1)
-        dy = sign(y2 - y1)
-        delta_y = min(dy / (y2 - y1), 10000000.0) if dy != 0 else 10000000.0
-        max_y = delta_y * (1.0 - fract(y1)) if dy > 0 else delta_y * fract(y1)
-        dz = sign(z2 - z1)
-        delta_z = min(dz / (z2 - z1), 10000000.0) if dz != 0 else 10000000.0
-        max_z = delta_z * (1.0 - fract(z1)) if dz > 0 else delta_z * fract(z1)
-
-        while not (max_x > 1.0 and max_y > 1.0 and max_z > 1.0):
-            result = self.get_voxel_id(voxel_world_position=current_voxel_position)
-
-            if result[0]:
-                (
-                    self.voxel_id,
-                    self.voxel_index,
-                    self.voxel_local_position,
-                    self.chunk,
-                ) = result
-                self.voxel_world_position = current_voxel_position
-
-                if step_direction == 0:
-                    self.voxel_normal.x = -dx
-                elif step_direction == 1:
-                    self.voxel_normal.y = -dy
-                else:
-                    self.voxel_normal.z = -dz
-
-                return True
-
-            if max_x < max_y:
-                if max_x < max_z:
-                    current_voxel_position.x += dx
-                    max_x += delta_x
-                    step_direction = 0
-                else:
-                    current_voxel_position.z += dz
-                    max_z += delta_z
-                    step_direction = 2
-
-            else:
-                if max_y < max_z:
-                    current_voxel_position.y += dy
-                    max_y += delta_y
-                    step_direction = 1
-                else:
-                    current_voxel_position.z += dz
-                    max_z += delta_z
-                    step_direction = 2
-
-        return False
+        start = tuple(eye_position)
+        end = tuple(eye_position + self.game.player.forward * MAX_RAY_DISTANCE)
+
+        cache_key = start, end, get_edit_count(self.table.versions, start, end)
+        if cache_key == self.cache_key:
+            return bool(self.voxel_id)
+        self.cache_key = cache_key
+
+        voxel_id, position, normal, chunk_index, voxel_index = cast_ray(
+            self.voxels, self.table.bounds_min, self.table.bounds_max, start, end
+        )
+        self.voxel_id = voxel_id
+        self.voxel_normal = ivec3(normal)
+        if not voxel_id:
+            return False
+
+        self.chunk = self.chunks[chunk_index]
+        self.voxel_index = voxel_index
+        self.voxel_world_position = ivec3(position)
+        self.voxel_local_position = (
+            self.voxel_world_position - ivec3(self.chunk.position) * CHUNK_SIZE
+        )
+        return True
 
     def rebuild_adjacent_chunk(self, adjacent_voxel_position) -> None:
         index = get_chunk_index(adjacent_voxel_position)
         if index != -1:
-            self.chunks[index].mesh.rebuild()
+            self.chunks[index].rebuild_mesh()
 
     def rebuild_adjacent_chunks(self) -> None:
         lx, ly, lz = self.voxel_local_position
@@ -136,21 +230,20 @@ class VoxelHandler:
                     return
                 self.game.mixer.put_sound.play()
 
-                _, voxel_index, _, chunk = result
-                chunk.voxels[voxel_index] = self.new_voxel_id
-                chunk.mesh.rebuild()
-
-                if chunk.is_empty:
-                    chunk.is_empty = False
+                _, voxel_index, voxel_local_position, chunk = result
+                chunk.set_voxel(voxel_index, voxel_local_position, self.new_voxel_id)
+                chunk.rebuild_mesh()
+                self.water.update_column(chunk.position)
 
     def remove_voxel(self) -> None:
         if self.voxel_id:
             self.game.mixer.harvest_sound.play()
 
-            self.chunk.voxels[self.voxel_index] = 0
+            self.chunk.set_voxel(self.voxel_index, self.voxel_local_position, 0)
 
-            self.chunk.mesh.rebuild()
+            self.chunk.rebuild_mesh()
             self.rebuild_adjacent_chunks()
+            self.water.update_column(self.chunk.position)
 
     def get_voxel_id(self, voxel_world_position: ivec3) -> tuple:
         cx, cy, cz = chunk_position = voxel_world_position / CHUNK_SIZE
@@ -160,7 +253,7 @@ class VoxelHandler:
             lx, ly, lz = voxel_local_position = (
                 voxel_world_position - chunk_position * CHUNK_SIZE
             )
-            voxel_index = lx + CHUNK_SIZE * lz + CHUNK_AREA * ly
+            voxel_index = get_index(lx, ly, lz)
             voxel_id = chunk.voxels[voxel_index]
             return voxel_id, voxel_index, voxel_local_position, chunk
         return 0, 0, 0, 0
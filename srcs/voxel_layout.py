@@ -0,0 +1,91 @@
+from numba import njit
+from numpy import arange, ndarray, zeros
+
+from settings import BRICK_SIZE, CHUNK_AREA, CHUNK_SIZE, VOXEL_LAYOUT
+
+
+def spread_bits(value: int, bits: int) -> int:
+    """
+    Spreads the bits of `value` so that two zero bits sit between each of them.
+    Interleaving three spread coordinates gives their Morton (Z-order) code.
+
+    Args:
+        value (int): Value to spread
+        bits (int): Number of low bits of `value` to spread
+
+    Returns:
+        int: The spread value
+    """
+    return sum(((value >> i) & 1) << (3 * i) for i in range(bits))
+
+
+def get_layout_tables(layout: str, brick_size: int) -> tuple[ndarray, ndarray, ndarray]:
+    """
+    Builds the per-axis offset tables of a chunk voxel layout.
+
+    Both supported layouts are separable: the index of a voxel is the sum of one
+    offset per axis, so a single lookup table per axis describes the whole layout.
+
+    Args:
+        layout (str): "linear" or "brick"
+        brick_size (int): Edge of a brick, only used by the "brick" layout
+
+    Returns:
+        tuple: Offset tables for the x, y and z axes (CHUNK_SIZE entries each)
+    """
+    if layout == "linear":
+        coordinates = arange(CHUNK_SIZE, dtype="int64")
+        return coordinates, coordinates * CHUNK_AREA, coordinates * CHUNK_SIZE
+
+    if layout != "brick":
+        raise ValueError(f"Unknown voxel layout: {layout}")
+    if brick_size & (brick_size - 1) or CHUNK_SIZE % brick_size:
+        raise ValueError(
+            f"BRICK_SIZE must be a power of two dividing {CHUNK_SIZE}, got {brick_size}"
+        )
+
+    brick_bits = brick_size.bit_length() - 1
+    brick_volume = brick_size**3
+    bricks_per_axis = CHUNK_SIZE // brick_size
+
+    # Bricks are ordered like the linear layout (x, then z, then y),
+    # voxels inside a brick interleave their bits as ...zyxzyx
+    tables = []
+    for brick_stride, bit_offset in (
+        (1, 0),  # x
+        (bricks_per_axis * bricks_per_axis, 1),  # y
+        (bricks_per_axis, 2),  # z
+    ):
+        table = zeros(CHUNK_SIZE, dtype="int64")
+        for coordinate in range(CHUNK_SIZE):
+            brick, local = divmod(coordinate, brick_size)
+            table[coordinate] = brick * brick_stride * brick_volume + (
+                spread_bits(local, brick_bits) << bit_offset
+            )
+        tables.append(table)
+
+    return tables[0], tables[1], tables[2]
+
+
+# Offset tables of the configured layout, frozen into the compiled kernels
+VOXEL_INDEX_X, VOXEL_INDEX_Y, VOXEL_INDEX_Z = get_layout_tables(
+    VOXEL_LAYOUT, BRICK_SIZE
+)
+
+
+@njit
+def get_index(x: int, y: int, z: int) -> int:
+    """
+    Converts a position inside a chunk to its index in the chunk's voxel array.
+    Every access to chunk voxels goes through this function, so the memory layout
+    only depends on VOXEL_LAYOUT.
+
+    Args:
+        x (int): X position in the chunk (0 to CHUNK_SIZE - 1)
+        y (int): Y position in the chunk (0 to CHUNK_SIZE - 1)
+        z (int): Z position in the chunk (0 to CHUNK_SIZE - 1)
+
+    Returns:
+        int: Index of the voxel in the chunk's voxel array
+    """
+    return VOXEL_INDEX_X[x] + VOXEL_INDEX_Y[y] + VOXEL_INDEX_Z[z]
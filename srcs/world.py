@@ -1,15 +1,29 @@
+from collections import deque
+from time import perf_counter
 from typing import TYPE_CHECKING
 from numpy import empty
 
+from meshes.chunk_mesh_arena import ChunkMeshArena
+from meshes.mesher_stats import MesherStats
 from objects.chunk import Chunk
+from objects.water import WATER_LAYER, Water
+from srcs.cave_culling import CaveCulling
+from srcs.chunk_table import ChunkTable
+from srcs.draw_order import DrawOrder
+from srcs.level_of_detail import LevelOfDetail
 from settings import (
+    CAVE_CULLING,
+    CHUNK_SIZE,
     CHUNK_VOLUME,
+    MESH_BUILD_BUDGET,
+    OCCLUSION_CULLING,
     WORLD_AREA,
     WORLD_DEPTH,
     WORLD_HEIGHT,
     WORLD_VOLUME,
     WORLD_WIDTH,
 )
+from srcs.occlusion_culling import OcclusionCulling
 from srcs.voxel_handler import VoxelHandler
 
 if TYPE_CHECKING:
@@ -21,12 +35,35 @@ class World:
         self.game = game
         self.chunks = [None for _ in range(WORLD_VOLUME)]
         self.voxels = empty([WORLD_VOLUME, CHUNK_VOLUME], dtype="uint8")
+        self.table = ChunkTable()
+        self.cave_culling = CaveCulling(self.table)
+        self.draw_order = DrawOrder(self.table)
+        self.level_of_detail = LevelOfDetail(self.table)
+
+        # Shared vertex buffers holding every chunk mesh
+        self.mesh_arena = ChunkMeshArena(
+            self.game.gpu_resources, self.game.shader.chunk
+        )
+
+        # Chunks that were seen on the frustum but have no mesh yet
+        self.mesh_queue: deque[Chunk] = deque()
+        # Milliseconds spent on it each frame, lowered by the quality governor
+        self.mesh_build_budget = MESH_BUILD_BUDGET
+
+        # Counters collected by the mesher (see MESHER_STATS)
+        self.mesher_stats = MesherStats()
+
+        # Water surface of each chunk column, built along with the chunks
+        self.water = Water(self)
 
         self.build_chunks()
-        self.build_chunk_mesh()
         self.voxel_handler = VoxelHandler(self)
+        self.occlusion_culling = OcclusionCulling(self)
 
     def build_chunks(self) -> None:
+        # Terrain height of each voxel column of the chunk being generated
+        heights = empty((CHUNK_SIZE, CHUNK_SIZE), dtype="int32")
+
         for x in range(WORLD_WIDTH):
             for y in range(WORLD_HEIGHT):
                 for z in range(WORLD_DEPTH):
@@ -34,18 +71,64 @@ class World:
 
                     chunk_index = x + WORLD_WIDTH * z + WORLD_AREA * y
                     self.chunks[chunk_index] = chunk
-                    self.voxels[chunk_index] = chunk.build_voxels()
+                    self.voxels[chunk_index] = chunk.build_voxels(heights)
 
                     # Save the pointer to voxels in the chunk
                     chunk.voxels = self.voxels[chunk_index]
 
-    def build_chunk_mesh(self) -> None:
-        for chunk in self.chunks:
-            chunk.build_mesh()
+                    if y == WATER_LAYER:
+                        self.water.set_column((x, z), heights)
+
+        # Needs the solid layers of every chunk's neighbors
+        self.table.update_enclosed()
+
+    def queue_mesh_build(self, chunk: Chunk, level: int) -> None:
+        """
+        Schedules a mesh build for a chunk that just became visible, or that is
+        drawn at a level of detail it has no mesh for.
+        Chunks already waiting in the queue are not added twice, the last level
+        asked for is built.
+        """
+        chunk.queued_level = level
+        if chunk.is_mesh_queued:
+            return
+        chunk.is_mesh_queued = True
+        self.mesh_queue.append(chunk)
+
+    def build_queued_meshes(self) -> None:
+        """
+        Builds meshes for queued chunks until the per-frame budget is spent.
+        At least one mesh is built each frame so the queue always drains.
+        """
+        deadline = perf_counter() + self.mesh_build_budget * 0.001
+
+        while self.mesh_queue:
+            chunk = self.mesh_queue.popleft()
+            chunk.is_mesh_queued = False
+            chunk.build_mesh(chunk.queued_level)
+
+            if perf_counter() >= deadline:
+                break
 
     def update(self) -> None:
+        self.build_queued_meshes()
         self.voxel_handler.update()
 
     def render(self) -> None:
-        for chunk in self.chunks:
-            chunk.render()
+        frustum = self.game.player.frustum
+        visible_chunks = frustum.get_visible_chunks(self.table)
+        if CAVE_CULLING:
+            visible_chunks = self.cave_culling.filter(visible_chunks, frustum)
+
+        # Nearest chunks first, so that they hide the farther ones from the depth test
+        eye = self.game.player.eye_position
+        visible_chunks = self.draw_order.sort(visible_chunks, eye)
+        self.level_of_detail.update(visible_chunks, eye)
+
+        if OCCLUSION_CULLING:
+            self.occlusion_culling.render(visible_chunks)
+        else:
+            for index in visible_chunks:
+                self.chunks[index].render()
+
+        self.mesher_stats.end_frame()